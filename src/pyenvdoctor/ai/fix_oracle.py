@@ -1,102 +1,112 @@
+import hashlib
+import json
 import platform
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Optional
 
-# Create local stubs for models since we don't have the proper imports
-class FixSuggestion:
-    def __init__(self, description, command, explanation, risk_level="low", confidence=1.0, safety_rating=1.0):
-        self.description = description
-        self.command = command
-        self.explanation = explanation
-        self.risk_level = risk_level
-        self.confidence = confidence
-        self.safety_rating = safety_rating
-        
-    def to_dict(self):
-        return {
-            "description": self.description,
-            "command": self.command,
-            "explanation": self.explanation,
-            "risk_level": self.risk_level,
-            "confidence": self.confidence,
-            "safety_rating": self.safety_rating
-        }
+from ..core.config import config
+from ..core.models import FixSuggestion
+from ..utils.storage import Storage
+from .fix_rules import RuleIndex
+
+@lru_cache(maxsize=None)
+def _platform_info() -> str:
+    return json.dumps({
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "processor": platform.processor(),
+        "distro": _distro_id()
+    })
+
+def _distro_id() -> str:
+    try:
+        import distro
+        return distro.id()
+    except ImportError:
+        pass
+    try:
+        with open("/etc/os-release", encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.strip().partition("=")
+                if key == "ID":
+                    return value.strip('"')
+    except OSError:
+        pass
+    return ""
 
 class FixOracle:
-    def __init__(self, api_key=None):
+    """Fix suggestions for issues, computed once per distinct issue.
+
+    Issues are fingerprinted by type, details and platform; identical
+    issues (the same problem on many installations or hosts) share one
+    computation. Results live in a bounded LRU cache that can be persisted
+    between runs.
+    """
+
+    def __init__(self, api_key=None, cache_size: Optional[int] = None, persist: Optional[bool] = None,
+                 cache_path: Optional[Path] = None, rules: Optional[RuleIndex] = None):
         self.api_key = api_key
+        self.rules = rules or RuleIndex.load()
         self.platform_info = self._gather_platform_info()
+        self.cache_size = cache_size or int(config.get("ai.fix_cache_size", 4096))
+        self.persist = config.get("ai.persist_fix_cache", False) if persist is None else persist
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "fix_suggestions.json")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._dirty = False
+        if self.persist:
+            data = self.storage.load() or {}
+            if data.get("version") == self.rules.version:
+                self._cache.update(data.get("entries", [])[-self.cache_size:])
         
     def suggest_fixes(self, issue) -> List[FixSuggestion]:
         """Generate fix suggestions for an issue"""
-        # For now, return mock suggestions based on issue type
-        if issue.type == "missing_dependency":
-            return self._suggest_dependency_fix(issue)
-        elif issue.type == "permission_error":
-            return self._suggest_permission_fix(issue)
-        else:
-            return self._suggest_generic_fix(issue)
-            
-    def _suggest_dependency_fix(self, issue) -> List[FixSuggestion]:
-        """Suggest fixes for missing dependencies"""
-        suggestions = []
-        dep_name = issue.details.get("dependency_name", "unknown")
-        
-        if self.platform_info["system"] == "Darwin":
-            suggestions.append(FixSuggestion(
-                description=f"Install {dep_name} using Homebrew",
-                command=["brew", "install", dep_name],
-                explanation=f"Installs {dep_name} package using Homebrew",
-                risk_level="low",
-                confidence=0.9,
-                safety_rating=0.95
-            ))
-        elif self.platform_info["system"] == "Linux":
-            suggestions.append(FixSuggestion(
-                description=f"Install {dep_name} using apt",
-                command=["sudo", "apt", "install", "-y", dep_name],
-                explanation=f"Installs {dep_name} package using apt",
-                risk_level="medium",
-                confidence=0.85,
-                safety_rating=0.8
-            ))
-            
-        return suggestions
+        return self.suggest_fixes_batch([issue])[0]
         
-    def _suggest_permission_fix(self, issue) -> List[FixSuggestion]:
-        """Suggest fixes for permission issues"""
-        suggestions = []
-        path = issue.details.get("path", "")
+    def suggest_fixes_batch(self, issues) -> List[List[FixSuggestion]]:
+        """Suggestions for many issues, in order; each distinct fingerprint is computed once"""
+        fingerprints = [self.fingerprint(issue) for issue in issues]
+        computed: Dict[str, List[Dict]] = {}
+        for issue, fingerprint in zip(issues, fingerprints):
+            if fingerprint in computed:
+                continue
+            with self._lock:
+                cached = self._cache.get(fingerprint)
+                if cached is not None:
+                    self._cache.move_to_end(fingerprint)
+            if cached is None:
+                cached = [suggestion.to_dict() for suggestion in self._compute_fixes(issue)]
+                with self._lock:
+                    self._cache[fingerprint] = cached
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+                    self._dirty = True
+            computed[fingerprint] = cached
+        # Fresh objects per issue so callers can edit them without touching the cache
+        return [[FixSuggestion(**dict(suggestion, command=list(suggestion["command"])))
+                 for suggestion in computed[fingerprint]] for fingerprint in fingerprints]
         
-        suggestions.append(FixSuggestion(
-            description=f"Fix permissions for {path}",
-            command=["chmod", "755", path],
-            explanation="Sets proper permissions for the directory",
-            risk_level="medium",
-            confidence=0.9,
-            safety_rating=0.9
-        ))
+    def fingerprint(self, issue) -> str:
+        """Stable key of everything a suggestion depends on"""
+        key = json.dumps([issue.type, issue.details, self.platform_info], sort_keys=True, default=str)
+        return hashlib.sha1(key.encode()).hexdigest()
         
-        return suggestions
+    def flush(self):
+        """Persist the suggestion cache when persistence is enabled"""
+        with self._lock:
+            if self._dirty and self.persist:
+                self.storage.save({"version": self.rules.version, "entries": list(self._cache.items())})
+            self._dirty = False
         
-    def _suggest_generic_fix(self, issue) -> List[FixSuggestion]:
-        """Suggest generic fixes"""
-        return [
-            FixSuggestion(
-                description="Manual investigation required",
-                command=["echo", "Please investigate manually"],
-                explanation="This issue requires manual investigation",
-                risk_level="low",
-                confidence=0.5,
-                safety_rating=1.0
-            )
-        ]
+    def _compute_fixes(self, issue) -> List[FixSuggestion]:
+        return self.rules.suggest(issue, self.platform_info)
         
     def _gather_platform_info(self) -> Dict:
-        """Gather platform information"""
-        return {
-            "system": platform.system(),
-            "release": platform.release(),
-            "machine": platform.machine(),
-            "python_version": platform.python_version(),
-            "processor": platform.processor()
-        }
+        """Gather platform information, looked up once per process"""
+        return json.loads(_platform_info())
@@ -0,0 +1,131 @@
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import config
+from ..core.models import FixSuggestion
+
+BUNDLED_RULES = Path(__file__).with_name("fix_rules.json")
+
+ANY = "*"
+
+class _Defaults(dict):
+    def __missing__(self, key):
+        return ""
+
+def _compile_patterns(patterns: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """field -> compiled glob (or list of globs, any of which may match)"""
+    compiled = []
+    for name, pattern in (patterns or {}).items():
+        globs = pattern if isinstance(pattern, list) else [pattern]
+        compiled.append((name, re.compile("|".join(fnmatch.translate(str(glob)) for glob in globs))))
+    return tuple(compiled)
+
+class FixRule:
+    """One remediation rule loaded from JSON.
+
+    `type`, `os` and `distro` place the rule in the dispatch index ("*"
+    matches anything). `details` and `platform` map fields of the issue's
+    details and of the platform info to glob patterns that must all match.
+    `description`, `command` and `explanation` are templates formatted with
+    the issue details, the rule's `defaults` and the platform info.
+    """
+
+    __slots__ = ("id", "type", "os", "distro", "details", "platform", "defaults", "description", "command",
+                 "explanation", "risk_level", "confidence", "safety_rating", "priority")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.id = data.get("id", "")
+        self.type = data.get("type", ANY)
+        self.os = data.get("os", ANY)
+        self.distro = data.get("distro", ANY)
+        self.details = _compile_patterns(data.get("details"))
+        self.platform = _compile_patterns(data.get("platform"))
+        self.defaults = dict(data.get("defaults") or {})
+        self.description = data["description"]
+        self.command = list(data.get("command") or [])
+        self.explanation = data.get("explanation", "")
+        self.risk_level = data.get("risk_level", "low")
+        self.confidence = float(data.get("confidence", 1.0))
+        self.safety_rating = float(data.get("safety_rating", 1.0))
+        self.priority = int(data.get("priority", 0))
+
+    def matches(self, details: Dict[str, Any], platform_info: Dict[str, Any]) -> bool:
+        for values, patterns in ((details, self.details), (platform_info, self.platform)):
+            for name, pattern in patterns:
+                if name not in values or not pattern.match(str(values[name])):
+                    return False
+        return True
+
+    def render(self, details: Dict[str, Any], platform_info: Dict[str, Any]) -> FixSuggestion:
+        fields = _Defaults(platform_info)
+        fields.update(self.defaults)
+        fields.update(details)
+        return FixSuggestion(
+            description=self.description.format_map(fields),
+            command=[part.format_map(fields) for part in self.command],
+            explanation=self.explanation.format_map(fields),
+            risk_level=self.risk_level,
+            confidence=self.confidence,
+            safety_rating=self.safety_rating
+        )
+
+class RuleIndex:
+    """Fix rules compiled into a dispatch index keyed by (issue type, OS, distro).
+
+    Rules of type "*" are fallbacks, used only for issue types no rule
+    names. The rules for a (type, os, distro) triple are merged from the
+    index once and memoized, so matching an issue is a dictionary lookup
+    plus the rules' own predicates.
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, Any]]):
+        rules = list(rules)
+        self.version = hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
+        self._index: Dict[Tuple[str, str, str], List[Tuple[int, int, FixRule]]] = {}
+        for position, data in enumerate(rules):
+            rule = FixRule(data)
+            self._index.setdefault((rule.type, rule.os, rule.distro), []).append((-rule.priority, position, rule))
+        self.types = {rule_type for rule_type, _, _ in self._index if rule_type != ANY}
+        self._memo: Dict[Tuple[str, str, str], List[FixRule]] = {}
+
+    @classmethod
+    def load(cls, paths: Optional[Iterable[str]] = None) -> 'RuleIndex':
+        """The bundled rules plus rule files (or directories of them) from `ai.fix_rules`"""
+        sources = [str(BUNDLED_RULES)]
+        for path in (config.get("ai.fix_rules") or []) if paths is None else paths:
+            path = os.path.expanduser(path)
+            if os.path.isdir(path):
+                sources.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json"))
+            else:
+                sources.append(path)
+        rules = []
+        for source in sources:
+            with open(source, encoding="utf-8") as f:
+                data = json.load(f)
+            rules.extend(data["rules"] if isinstance(data, dict) else data)
+        return cls(rules)
+
+    def candidates(self, issue_type: str, system: str, distro: str) -> List[FixRule]:
+        """Rules that may apply to an issue type on a platform, best first"""
+        key = (issue_type, system, distro)
+        rules = self._memo.get(key)
+        if rules is None:
+            if issue_type not in self.types:
+                issue_type = ANY
+            merged = []
+            for os_key in {system, ANY}:
+                for distro_key in {distro, ANY}:
+                    merged.extend(self._index.get((issue_type, os_key, distro_key), ()))
+            rules = self._memo[key] = [rule for _, _, rule in sorted(merged, key=lambda item: item[:2])]
+        return rules
+
+    def suggest(self, issue, platform_info: Dict[str, Any]) -> List[FixSuggestion]:
+        details = issue.details or {}
+        return [rule.render(details, platform_info)
+                for rule in self.candidates(issue.type, platform_info.get("system", ""), platform_info.get("distro", ""))
+                if rule.matches(details, platform_info)]
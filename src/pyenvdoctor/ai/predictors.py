@@ -1,18 +1,138 @@
-import numpy as np
-from sklearn.ensemble import IsolationForest
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.config import config
 from ..core.models import PythonInstallation
 
+# Bump when the features or the model change so persisted models are refit
+MODEL_VERSION = 1
+
+FEATURES = ("packages", "size_mb")
+
+def installation_columns(installations: List[PythonInstallation]) -> Dict[str, list]:
+    """The scored host's features, in the fleet store's column layout"""
+    return {
+        "packages": [len(install.packages) for install in installations],
+        "size_mb": [install.size_mb if install.size_mb is not None else float("nan") for install in installations],
+    }
+
+def feature_matrix(columns: Dict[str, list], fill: Optional[list] = None):
+    """(rows, features) float array; missing values take the per-feature fill"""
+    import numpy as np
+
+    matrix = np.column_stack([np.asarray(columns[name], dtype=float) for name in FEATURES])
+    if fill is not None:
+        missing = np.isnan(matrix)
+        if missing.any():
+            matrix[missing] = np.take(np.asarray(fill, dtype=float), np.nonzero(missing)[1])
+    return matrix
+
 class InstallationPredictor:
-    def __init__(self, installations):
+    """Flags installations that look unlike the fleet baseline.
+
+    The IsolationForest is fitted on the fleet's columnar installation
+    table (FleetStore.installation_columns) and persisted together with
+    the feature statistics it was trained on. Scoring a host only loads
+    that model and never changes it; `update` refits it when the fleet
+    table's feature means move more than `drift_threshold` baseline
+    standard deviations. Without a stored model or fleet, the host's own
+    installations serve as an in-memory baseline. numpy and scikit-learn
+    (the `ai` extra) are imported only when a prediction is requested.
+    """
+
+    def __init__(self, installations: List[PythonInstallation], model_path: Optional[Path] = None,
+                 drift_threshold: Optional[float] = None, contamination: float = 0.1, fleet=None):
         self.installations = installations
-        self.model = IsolationForest(contamination=0.1)
+        self.model_path = Path(model_path or Path.home() / ".pyenvdoctor" / "models" / "installation_anomaly.pkl")
+        self.drift_threshold = float(drift_threshold if drift_threshold is not None
+                                     else config.get("ai.drift_threshold", 0.5))
+        self.contamination = contamination
+        self.fleet = fleet
+        self.model = None
+        self.baseline: Optional[Dict[str, list]] = None
 
     def predict_anomalies(self):
-        features = self._extract_features()
-        return self.model.fit_predict(features)
-
-    def _extract_features(self):
-        return np.array([
-            [len(install.packages), install.size_mb] 
-            for install in self.installations
-        ])
+        """1 for normal installations, -1 for anomalies"""
+        model, features = self._scoring()
+        return model.predict(features)
+
+    def score(self):
+        """Anomaly scores; the lower, the more abnormal"""
+        model, features = self._scoring()
+        return model.decision_function(features)
+
+    def update(self, columns: Optional[Dict[str, list]] = None) -> bool:
+        """Refit from the fleet table when it drifted from the stored baseline; True if refit"""
+        if columns is None:
+            columns = self.fleet.installation_columns(FEATURES)
+        if not columns[FEATURES[0]]:
+            return False
+        if self.model is None:
+            self._load()
+        if self.model is not None and self.drift(feature_matrix(columns, fill=self.baseline["fill"])) \
+                <= self.drift_threshold:
+            return False
+        self.fit(feature_matrix(columns))
+        return True
+
+    def fit(self, features):
+        """Fit on a fleet feature matrix and persist the model"""
+        self.model, self.baseline = self._train(features)
+        self._save()
+
+    def drift(self, features) -> float:
+        """Largest shift of a feature mean, in baseline standard deviations"""
+        import numpy as np
+
+        mean = np.asarray(self.baseline["mean"])
+        std = np.maximum(np.asarray(self.baseline["std"]), 1e-9)
+        return float(np.max(np.abs(features.mean(axis=0) - mean) / std))
+
+    def _train(self, features):
+        import numpy as np
+        from sklearn.ensemble import IsolationForest
+
+        median = np.nanmedian(features, axis=0)
+        median = np.where(np.isnan(median), 0.0, median)
+        features = np.where(np.isnan(features), median, features)
+        model = IsolationForest(contamination=self.contamination, random_state=0).fit(features)
+        return model, {"mean": features.mean(axis=0).tolist(), "std": features.std(axis=0).tolist(),
+                       "fill": median.tolist(), "rows": len(features)}
+
+    def _scoring(self):
+        """The model to score with and the installations' feature matrix"""
+        if self.model is None:
+            self._load()
+        if self.model is None and self.fleet is not None:
+            self.update()
+        columns = installation_columns(self.installations)
+        if self.model is not None:
+            return self.model, feature_matrix(columns, fill=self.baseline["fill"])
+        # No fleet baseline: compare the installations with each other, persisting nothing
+        model, baseline = self._train(feature_matrix(columns))
+        return model, feature_matrix(columns, fill=baseline["fill"])
+
+    def _load(self):
+        import sklearn
+
+        try:
+            with open(self.model_path, "rb") as f:
+                saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return
+        # Pickled estimators are only reliable with the scikit-learn that wrote them
+        if (saved.get("version") == MODEL_VERSION and tuple(saved.get("features", ())) == FEATURES
+                and saved.get("sklearn_version") == sklearn.__version__):
+            self.model = saved["model"]
+            self.baseline = saved["baseline"]
+
+    def _save(self):
+        import sklearn
+
+        self.model_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.model_path.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump({"version": MODEL_VERSION, "features": FEATURES, "sklearn_version": sklearn.__version__,
+                         "model": self.model, "baseline": self.baseline}, f)
+        temp_path.replace(self.model_path)
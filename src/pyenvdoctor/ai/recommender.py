@@ -1,23 +1,32 @@
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from ..core.models import PythonInstallation
+from .usage import UsageTracker
 
 class OptimizationRecommender:
-    def __init__(self, max_inactive_days=90):
+    def __init__(self, max_inactive_days=90, tracker: Optional[UsageTracker] = None):
         self.max_inactive = max_inactive_days
+        self.tracker = tracker
 
     def generate_recommendations(self, installations: List[PythonInstallation]):
+        unknown = [install for install in installations if install.last_used is None]
+        if unknown:
+            tracker = self.tracker or UsageTracker()
+            tracker.annotate(unknown)
+            tracker.flush()
         recommendations = []
         for install in installations:
             if self._is_unused(install):
                 recommendations.append({
                     'type': 'UNUSED_INSTALLATION',
                     'target': install.path,
+                    'last_used': install.last_used.isoformat(),
                     'reason': f'Non utilisée depuis {self.max_inactive} jours'
                 })
         return recommendations
 
     def _is_unused(self, install):
-        if not install.last_used:
-            return True
+        # Without any usage signal we cannot tell, so never suggest a removal
+        if install.is_active or not install.last_used:
+            return False
         return (datetime.now() - install.last_used) > timedelta(days=self.max_inactive)
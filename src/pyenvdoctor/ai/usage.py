@@ -0,0 +1,387 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from packaging.version import InvalidVersion, Version
+
+from ..core.config import config, parse_duration
+from ..core.models import PythonInstallation
+from ..scanner.cache import ProbeCache, stdlib_dir
+from ..utils.fswalk import DEFAULT_PRUNE, ParallelWalker
+from ..utils.storage import Storage
+
+CACHE_VERSION = 1
+
+# Stdlib modules imported by every interpreter start. From 3.11 on they
+# are frozen into the interpreter and their bytecode is never read.
+STARTUP_MODULES = ("os", "site", "codecs", "abc")
+FROZEN_STARTUP = (3, 11)
+
+# Reads this soon after a file was written are the installer's own
+INSTALL_GRACE = 600
+# Reads this close to a pyenvdoctor probe of the interpreter are the probe's
+PROBE_WINDOW = 120
+
+VERSION_FILE = ".python-version"
+
+SHIM = re.compile(r"python(\d+\.\d+)$")
+
+# usercustomize.py written by UsageTracker.install_hook to feed the usage
+# log; it only needs the stdlib and runs on every interpreter pyenv ships.
+USAGE_HOOK = """\
+# -*- coding: utf-8 -*-
+# pyenvdoctor usage hook
+import sys, time
+try:
+    with open({log_path!r}, "a") as f:
+        f.write("%d %s\\n" % (time.time(), sys.executable))
+except Exception:
+    pass
+"""
+
+def read_atime(path: str) -> Optional[float]:
+    """When the file was last read after being written, if the mount records it"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    # noatime mounts never move atime past the write; relatime moves it on
+    # the first read after a write and then at most once a day
+    if st.st_atime - max(st.st_mtime, st.st_ctime) < INSTALL_GRACE:
+        return None
+    return st.st_atime
+
+def marker_files(install: PythonInstallation) -> List[str]:
+    """Files every start of the installation reads.
+
+    The interpreter and, before 3.11, the bytecode of the startup modules
+    for a base installation; pyvenv.cfg for a venv, whose interpreter and
+    stdlib belong to its base.
+    """
+    if install.prefix and install.base_prefix and install.prefix != install.base_prefix:
+        return [os.path.join(install.prefix, "pyvenv.cfg")]
+    files = [os.path.realpath(install.path)]
+    version = tuple((install.probe or {}).get("version_info") or []) or tuple(
+        int(part) for part in re.findall(r"\d+", install.version)[:2])
+    if version[:2] >= FROZEN_STARTUP:
+        return files
+    lib_dir = stdlib_dir(install.probe)
+    if lib_dir is None:
+        prefix = install.base_prefix or install.prefix
+        parts = install.version.split(".")
+        if prefix and len(parts) >= 2:
+            lib_dir = os.path.join(prefix, "lib", f"python{parts[0]}.{parts[1]}")
+    if lib_dir is None:
+        return files
+    cache_dir = os.path.join(lib_dir, "__pycache__")
+    try:
+        names = sorted(os.listdir(cache_dir))
+    except OSError:
+        names = []
+    files.extend(os.path.join(cache_dir, name) for name in names
+                 if name.endswith(".pyc") and ".opt-" not in name and name.split(".", 1)[0] in STARTUP_MODULES)
+    # Python 2 keeps bytecode next to the sources
+    files.extend(path for path in (os.path.join(lib_dir, module + ".pyc") for module in STARTUP_MODULES)
+                 if os.path.exists(path))
+    return files
+
+def pyenv_version_name(path: str, versions_dir: str) -> Optional[str]:
+    """The name pyenv selects an installation by, e.g. 3.12.1 or a virtualenv name"""
+    parts = os.path.relpath(os.path.abspath(path), versions_dir).split(os.sep)
+    if parts[0] == os.pardir or len(parts) < 2:
+        return None
+    if len(parts) > 3 and parts[1] == "envs":
+        return parts[2]
+    return parts[0]
+
+def version_references(path: str) -> List[str]:
+    """Version names selected by a .python-version or pyenv global version file"""
+    # Our own read must not look like a pyenv one, so leave atime alone
+    # where the platform allows it (O_NOATIME needs the file's owner)
+    flags = os.O_RDONLY | getattr(os, "O_NOATIME", 0)
+    try:
+        try:
+            fd = os.open(path, flags)
+        except PermissionError:
+            fd = os.open(path, os.O_RDONLY)
+        with open(fd, encoding="utf-8", errors="replace") as f:
+            text = f.read(4096)
+    except OSError:
+        return []
+    names = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        names.extend(name for name in line.split() if name != "system")
+    return names
+
+def _version_key(name: str):
+    try:
+        return (1, Version(name), name)
+    except InvalidVersion:
+        return (0, Version("0"), name)
+
+def resolve_version(name: str, names: Iterable[str]) -> Optional[str]:
+    """The installed version pyenv runs for `name`: an exact match or the latest with that prefix"""
+    names = list(names)
+    if name in names:
+        return name
+    matches = [candidate for candidate in names if candidate.startswith(name + ".")]
+    return max(matches, key=_version_key) if matches else None
+
+class UsageTracker:
+    """Estimates when each installation was last used, from cheap signals.
+
+    - the atime of the interpreter and of the startup modules' bytecode
+      (pyvenv.cfg for venvs), ignoring reads by the installer and by
+      pyenvdoctor's own probes. relatime mounts update it at most daily,
+      noatime mounts never;
+    - pyenv selections: the global version file, $PYENV_VERSION,
+      .python-version files under `ai.project_roots` and version-specific
+      shims such as python3.12;
+    - an optional usage log of "<epoch seconds> <interpreter>" lines, fed
+      for instance by the hook `install_hook` adds, read incrementally.
+
+    Each installation keeps a compact record: its marker files and the
+    latest time every signal reported. Only those few files are stat'ed
+    on each run; project roots are walked again once per
+    `ai.project_rescan_interval`. Installations with no signal at all
+    have an unknown last use (None).
+    """
+
+    def __init__(self, pyenv_root: Optional[Path] = None, cache_path: Optional[Path] = None,
+                 enabled: Optional[bool] = None, log_path: Optional[str] = None,
+                 project_roots: Optional[List[str]] = None, probe_cache: Optional[ProbeCache] = None,
+                 environ: Optional[Mapping[str, str]] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.environ = os.environ if environ is None else environ
+        self.pyenv_root = Path(pyenv_root or self.environ.get("PYENV_ROOT") or "~/.pyenv").expanduser()
+        self.log_path = os.path.expanduser(log_path or config.get(
+            "ai.usage_log", str(Path.home() / ".pyenvdoctor" / "usage.log")))
+        self.project_roots = [os.path.abspath(os.path.expanduser(root)) for root in (
+            config.get("ai.project_roots", ["~"]) if project_roots is None else project_roots)]
+        self.project_depth = int(config.get("ai.project_depth", 3))
+        self.rescan_interval = parse_duration(config.get("ai.project_rescan_interval", "7d"))
+        self.probe_cache = probe_cache or ProbeCache(enabled=self.enabled)
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "usage.json")
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    def install_hook(self, install: PythonInstallation) -> str:
+        """Write a usercustomize.py logging every start of the installation to the usage log.
+
+        Python runs it only while the user site is enabled, so not in venvs
+        (their pyvenv.cfg atime covers them). Returns the file written; an
+        existing usercustomize.py that is not ours is left alone.
+        """
+        if not install.site_packages:
+            raise ValueError(f"{install.path} has no site-packages directory")
+        path = os.path.join(install.site_packages[0], "usercustomize.py")
+        try:
+            with open(path, encoding="utf-8") as f:
+                if "pyenvdoctor usage hook" not in f.read():
+                    raise FileExistsError(f"{path} already exists")
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(USAGE_HOOK.format(log_path=self.log_path))
+        return path
+
+    def annotate(self, installations: List[PythonInstallation]) -> List[PythonInstallation]:
+        """Set `last_used` on every installation"""
+        last_used = self.last_used(installations)
+        for install in installations:
+            install.last_used = last_used[install.path]
+        return installations
+
+    def last_used(self, installations: List[PythonInstallation]) -> Dict[str, Optional[datetime]]:
+        """Latest use of every installation by path, None when no signal is available"""
+        return {path: datetime.fromtimestamp(max(seen.values())) if seen else None
+                for path, seen in self.signals(installations).items()}
+
+    def signals(self, installations: List[PythonInstallation]) -> Dict[str, Dict[str, float]]:
+        """Latest time each signal saw every installation used, by path then signal"""
+        with self._lock:
+            data = self._load()
+            records = data["installations"]
+            for install in installations:
+                record = records.get(install.path)
+                fingerprint = self._fingerprint(install.path)
+                if record is None or record["fingerprint"] != fingerprint:
+                    # New or reinstalled: what an older build reported no longer applies
+                    record = records[install.path] = {"fingerprint": fingerprint, "files": marker_files(install),
+                                                      "seen": {}}
+                    self._dirty = True
+                self._see(record, "atime", self._atime(install.path, record["files"]))
+            for path, when in self._selections(installations).items():
+                self._see(records[path], "pyenv", when)
+            for path, when in self._logged(installations).items():
+                self._see(records[path], "log", when)
+            seen = {install.path: dict(records[install.path]["seen"]) for install in installations}
+            for path in [path for path in records if path not in seen and not os.path.exists(path)]:
+                del records[path]
+                self._dirty = True
+            return seen
+
+    def flush(self):
+        """Persist the usage records"""
+        with self._lock:
+            if self._dirty and self.enabled:
+                self.storage.save(self._data)
+            self._dirty = False
+
+    def _see(self, record: Dict[str, Any], signal: str, when: Optional[float]):
+        if when is not None and when > record["seen"].get(signal, 0):
+            record["seen"][signal] = when
+            self._dirty = True
+
+    def _atime(self, path: str, files: List[str]) -> Optional[float]:
+        probes = self.probe_cache.probe_times(path)
+        latest = None
+        for name in files:
+            atime = read_atime(name)
+            if atime is None or any(abs(atime - probed) < PROBE_WINDOW for probed in probes):
+                continue
+            latest = atime if latest is None else max(latest, atime)
+        return latest
+
+    def _selections(self, installations: List[PythonInstallation]) -> Dict[str, float]:
+        """Latest time pyenv selected each installation"""
+        versions_dir = str(self.pyenv_root / "versions")
+        by_name: Dict[str, List[str]] = {}
+        for install in installations:
+            name = pyenv_version_name(install.path, versions_dir)
+            if name:
+                by_name.setdefault(name, []).append(install.path)
+        if not by_name:
+            return {}
+        selected: Dict[str, float] = {}
+
+        def credit(name, when):
+            version = resolve_version(name, by_name)
+            if version is None or when is None:
+                return
+            for path in by_name[version]:
+                selected[path] = max(selected.get(path, 0), when)
+
+        # pyenv reads the version files on every shim call, and `pyenv local`
+        # or `pyenv global` writes them
+        references = self._data["references"]
+        version_files = [str(self.pyenv_root / "version")] + self._version_files()
+        for path in set(references) - set(version_files):
+            del references[path]
+            self._dirty = True
+        for path in version_files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = references.get(path)
+            if cached is None or cached["mtime_ns"] != st.st_mtime_ns:
+                cached = references[path] = {"mtime_ns": st.st_mtime_ns, "names": version_references(path),
+                                             "read_at": time.time()}
+                self._dirty = True
+            # Where O_NOATIME was refused, the atime may be our own read
+            atime = st.st_atime if abs(st.st_atime - cached["read_at"]) >= PROBE_WINDOW else 0
+            for name in cached["names"]:
+                credit(name, max(atime, st.st_mtime))
+        for name in self.environ.get("PYENV_VERSION", "").split(":"):
+            if name and name != "system":
+                credit(name, time.time())
+        try:
+            with os.scandir(self.pyenv_root / "shims") as it:
+                shims = [(entry.path, SHIM.match(entry.name)) for entry in it]
+        except OSError:
+            shims = []
+        for path, match in shims:
+            # A pythonX.Y shim only tells which installation ran when exactly one provides it
+            candidates = [name for name in by_name if match and name.startswith(match.group(1) + ".")]
+            if len(candidates) == 1:
+                credit(candidates[0], read_atime(path))
+        return selected
+
+    def _version_files(self) -> List[str]:
+        """.python-version files under the project roots, rediscovered once per rescan interval"""
+        projects = self._data["projects"]
+        now = time.time()
+        if projects.get("roots") == self.project_roots and now - projects.get("scanned", 0) < self.rescan_interval:
+            return projects["files"]
+        walker = ParallelWalker(max_depth=self.project_depth)
+
+        def visit(directory, entries, depth):
+            found = [entry.path for entry in entries if entry.name == VERSION_FILE]
+            subdirs = walker.subdirectories([entry for entry in entries if not entry.name.startswith(".")],
+                                            prune=DEFAULT_PRUNE | {"venv", "env"})
+            return found or None, subdirs
+
+        files = sorted(path for found in walker.walk(self.project_roots, visit) for path in found)
+        self._data["projects"] = {"roots": self.project_roots, "scanned": now, "files": files}
+        self._dirty = True
+        return files
+
+    def _logged(self, installations: List[PythonInstallation]) -> Dict[str, float]:
+        """Latest usage-log entry for each installation; only new log lines are read"""
+        log = self._data["log"]
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            st = None
+        if st is not None:
+            offset = log.get("offset", 0) if log.get("inode") == st.st_ino and st.st_size >= log.get("offset", 0) else 0
+            if st.st_size > offset:
+                with open(self.log_path, "rb") as f:
+                    f.seek(offset)
+                    chunk = f.read()
+                complete = chunk.rfind(b"\n") + 1  # leave a line being written for next time
+                entries = log.setdefault("entries", {})
+                for line in chunk[:complete].decode("utf-8", "replace").splitlines():
+                    when, _, executable = line.partition(" ")
+                    try:
+                        when = float(when)
+                    except ValueError:
+                        continue
+                    if executable and when > entries.get(executable, 0):
+                        entries[executable] = when
+                offset += complete
+            if log.get("inode") != st.st_ino or log.get("offset") != offset:
+                log.update(inode=st.st_ino, offset=offset)
+                self._dirty = True
+        entries = log.get("entries", {})
+        if not entries:
+            return {}
+        # A hook logs sys.executable, which may be a symlink into the installation
+        resolved: Dict[str, float] = {}
+        for executable, when in entries.items():
+            for path in {executable, os.path.realpath(executable)}:
+                resolved[path] = max(resolved.get(path, 0), when)
+        logged = {}
+        for install in installations:
+            when = resolved.get(install.path)
+            if when is None and not (install.prefix and install.prefix != install.base_prefix):
+                when = resolved.get(os.path.realpath(install.path))
+            if when is not None:
+                logged[install.path] = when
+        return logged
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_ino, st.st_mtime_ns]
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            data = (self.storage.load() or {}) if self.enabled else {}
+            if data.get("version") != CACHE_VERSION:
+                data = {"version": CACHE_VERSION}
+            for key in ("installations", "projects", "references", "log"):
+                data.setdefault(key, {})
+            self._data = data
+        return self._data
@@ -1,11 +1,212 @@
-from typing import Dict, List
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from packaging.markers import Marker
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.version import InvalidVersion, Version
+
 from ..core.models import PythonInstallation
+from ..scanner.inventory import Distribution, InventoryReader, canonicalize_name
+
+PLATFORM_SYSTEMS = {"linux": "Linux", "darwin": "Darwin", "win32": "Windows", "cygwin": "CYGWIN_NT"}
+
+def marker_environment(install: PythonInstallation) -> Dict[str, str]:
+    """PEP 508 marker variables of an installation, from its probe report.
+
+    Reports without them (static probes, older caches) are completed from
+    the version, implementation and platform they do carry.
+    """
+    probe = install.probe or {}
+    if probe.get("marker_environment"):
+        return dict(probe["marker_environment"])
+    version = probe.get("version") or install.version
+    implementation = probe.get("implementation") or install.implementation or "CPython"
+    sys_platform = probe.get("platform") or "linux"
+    return {
+        "implementation_name": implementation.lower(),
+        "implementation_version": version if implementation == "CPython" else "0",
+        "os_name": "nt" if sys_platform == "win32" else "posix",
+        "platform_machine": probe.get("machine") or "",
+        "platform_release": "",
+        "platform_system": PLATFORM_SYSTEMS.get(sys_platform, sys_platform.capitalize()),
+        "platform_version": "",
+        "python_full_version": version,
+        "platform_python_implementation": implementation,
+        "python_version": ".".join(version.split(".")[:2]),
+        "sys_platform": sys_platform,
+    }
+
+class ParsedRequirement(NamedTuple):
+    name: str  # canonical
+    specifier: str
+    extras: FrozenSet[str]
+    marker: Optional[Marker]
+
+class RequirementIndex:
+    """Memoized requirement parsing and evaluation, shared by every environment.
+
+    The same Requires-Dist strings, installed versions and markers repeat
+    across environments, so each distinct requirement string is parsed
+    once, each (specifier, version) pair checked once and each marker
+    evaluated once per distinct marker environment and set of extras.
+    """
+
+    def __init__(self):
+        self._requirements: Dict[str, Optional[ParsedRequirement]] = {}
+        self._specifiers: Dict[str, SpecifierSet] = {}
+        self._versions: Dict[str, Optional[Version]] = {}
+        self._satisfied: Dict[Tuple[str, str], Optional[bool]] = {}
+        self._environments: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._markers: Dict[Tuple[str, int, FrozenSet[str]], bool] = {}
+
+    def requirement(self, text: str) -> Optional[ParsedRequirement]:
+        """Parsed requirement, None when it is not valid PEP 508"""
+        try:
+            return self._requirements[text]
+        except KeyError:
+            pass
+        try:
+            requirement = Requirement(text)
+        except InvalidRequirement:
+            parsed = None
+        else:
+            parsed = ParsedRequirement(canonicalize_name(requirement.name), str(requirement.specifier),
+                                       frozenset(canonicalize_name(extra) for extra in requirement.extras),
+                                       requirement.marker)
+        self._requirements[text] = parsed
+        return parsed
+
+    def environment_id(self, environment: Dict[str, str]) -> int:
+        key = tuple(sorted(environment.items()))
+        return self._environments.setdefault(key, len(self._environments))
+
+    def applies(self, requirement: ParsedRequirement, environment: Dict[str, str], environment_id: int,
+                extras: FrozenSet[str]) -> bool:
+        """Whether the requirement's marker holds, with no extra or any of `extras` requested"""
+        if requirement.marker is None:
+            return True
+        marker = str(requirement.marker)
+        key = (marker, environment_id, extras if "extra" in marker else frozenset())
+        result = self._markers.get(key)
+        if result is None:
+            try:
+                result = any(requirement.marker.evaluate(dict(environment, extra=extra))
+                             for extra in ("",) + tuple(sorted(key[2])))
+            except Exception:
+                result = False  # a marker this environment cannot evaluate
+            self._markers[key] = result
+        return result
+
+    def satisfied(self, specifier: str, version: str) -> Optional[bool]:
+        """Whether an installed version meets a specifier, None for unparsable versions"""
+        key = (specifier, version)
+        if key in self._satisfied:
+            return self._satisfied[key]
+        if version not in self._versions:
+            try:
+                self._versions[version] = Version(version)
+            except InvalidVersion:
+                self._versions[version] = None
+        parsed = self._versions[version]
+        if parsed is None:
+            result = None
+        else:
+            specifiers = self._specifiers.get(specifier)
+            if specifiers is None:
+                specifiers = self._specifiers[specifier] = SpecifierSet(specifier)
+            # Whatever is installed counts, pre-releases included
+            result = specifiers.contains(parsed, prereleases=True)
+        self._satisfied[key] = result
+        return result
 
 class DependencyAnalyzer:
-    def __init__(self, installations: List[PythonInstallation]):
+    """Checks every environment's installed distributions against their Requires-Dist.
+
+    Requirements are followed from every installed distribution, including
+    those only pulled in by requested extras, with markers evaluated against
+    each interpreter's probed environment. Environments sharing the same
+    site-packages and marker environment are analysed once.
+    """
+
+    def __init__(self, installations: List[PythonInstallation], reader: Optional[InventoryReader] = None,
+                 index: Optional[RequirementIndex] = None):
         self.installations = installations
-    
+        self.reader = reader or InventoryReader()
+        self.index = index or RequirementIndex()
+        self._directories: Dict[str, List[Distribution]] = {}
+        self._results: Dict[Tuple[Tuple[str, ...], int], List[Dict[str, Any]]] = {}
+
     def find_conflicts(self) -> Dict[str, List[str]]:
-        conflicts = {}
-        # Implémentation de la détection de conflits
-        return conflicts
+        """Readable problems of every environment that has any, by interpreter path"""
+        return {path: [self.describe(problem) for problem in problems]
+                for path, problems in self.analyze().items() if problems}
+
+    def analyze(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Unsatisfied requirements and version conflicts by interpreter path"""
+        results = {install.path: self.analyze_installation(install) for install in self.installations}
+        self.reader.flush()
+        return results
+
+    def analyze_installation(self, install: PythonInstallation) -> List[Dict[str, Any]]:
+        environment = marker_environment(install)
+        environment_id = self.index.environment_id(environment)
+        key = (tuple(install.site_packages), environment_id)
+        if key not in self._results:
+            self._results[key] = self._check(self._installed(install.site_packages), environment, environment_id)
+        return [dict(problem) for problem in self._results[key]]
+
+    @staticmethod
+    def describe(problem: Dict[str, Any]) -> str:
+        needed = f"{problem['required_by']} requires {problem['requirement']}"
+        if problem["kind"] == "missing":
+            return f"{needed}, which is not installed"
+        return f"{needed}, but {problem['package']} {problem['installed']} is installed"
+
+    def _installed(self, site_packages: List[str]) -> Dict[str, Distribution]:
+        """Visible distributions by canonical name; earlier directories shadow later ones"""
+        installed: Dict[str, Distribution] = {}
+        for directory in site_packages:
+            if directory not in self._directories:
+                self._directories[directory] = self.reader.distributions(directory)
+            for dist in self._directories[directory]:
+                installed.setdefault(canonicalize_name(dist.name), dist)
+        return installed
+
+    def _check(self, installed: Dict[str, Distribution], environment: Dict[str, str],
+               environment_id: int) -> List[Dict[str, Any]]:
+        index = self.index
+        extras: Dict[str, FrozenSet[str]] = {}
+        checked: Dict[str, FrozenSet[str]] = {}
+        problems: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        pending = list(installed)
+        while pending:
+            name = pending.pop()
+            dist = installed[name]
+            wanted = extras.get(name, frozenset())
+            if checked.get(name) == wanted:
+                continue
+            checked[name] = wanted
+            for text in dist.requires:
+                requirement = index.requirement(text)
+                if requirement is None or not index.applies(requirement, environment, environment_id, wanted):
+                    continue
+                target = installed.get(requirement.name)
+                if target is None:
+                    kind = "missing"
+                elif index.satisfied(requirement.specifier, target.version) is False:
+                    kind = "conflict"
+                else:
+                    kind = None
+                if kind:
+                    problems.setdefault((name, text), {
+                        "kind": kind,
+                        "package": requirement.name,
+                        "required_by": f"{dist.name} {dist.version}",
+                        "requirement": text.split(";", 1)[0].strip(),
+                        "installed": target.version if target else None
+                    })
+                if target is not None and not requirement.extras <= extras.get(requirement.name, frozenset()):
+                    # Requested extras bring in more of the target's requirements
+                    extras[requirement.name] = extras.get(requirement.name, frozenset()) | requirement.extras
+                    pending.append(requirement.name)
+        return sorted(problems.values(), key=lambda problem: (problem["required_by"], problem["package"]))
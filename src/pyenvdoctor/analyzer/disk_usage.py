@@ -0,0 +1,183 @@
+import os
+import stat
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.config import config
+from ..core.models import PythonInstallation
+from ..utils.fswalk import ParallelWalker
+from ..utils.storage import Storage
+
+CACHE_VERSION = 1
+
+@dataclass
+class DiskUsage:
+    apparent_bytes: int = 0
+    allocated_bytes: int = 0
+    files: int = 0
+    # Bytes that would actually be freed by deleting the tree: hardlinked
+    # files with links outside of it are not counted
+    reclaimable_bytes: int = 0
+
+    @property
+    def size_mb(self) -> float:
+        return round(self.allocated_bytes / (1024 * 1024), 2)
+
+    def to_dict(self) -> Dict:
+        return {
+            "apparent_bytes": self.apparent_bytes,
+            "allocated_bytes": self.allocated_bytes,
+            "files": self.files,
+            "reclaimable_bytes": self.reclaimable_bytes
+        }
+
+def installation_roots(install: PythonInstallation) -> List[str]:
+    """Directories owned by an installation; system Pythons only own site-packages"""
+    if install.provider == "system":
+        return list(install.site_packages)
+    return [install.prefix or str(Path(install.path).parent.parent)]
+
+class DiskUsageEngine:
+    """Parallel, hardlink-aware `du` for installations and venvs.
+
+    Every directory is summarised once (lstat of its entries) and the
+    summary is cached with the directory's mtime, so re-sizing a large
+    tree after a small change only re-reads the directories that changed.
+    Files with several links are tracked by (dev, inode) so they are
+    counted once per measured tree.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, enabled: Optional[bool] = None,
+                 max_workers: Optional[int] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "disk_usage.json")
+        self.walker = ParallelWalker(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._records: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    def measure(self, path: str) -> DiskUsage:
+        return self.measure_many([path])[path]
+
+    def measure_many(self, paths: List[str], flush: bool = True) -> Dict[str, DiskUsage]:
+        """Size several trees in one parallel walk"""
+        records = self._load()
+        roots = [os.path.abspath(path) for path in paths]
+        refreshed: Dict[str, Dict] = {}
+
+        def shortcut(directory, depth):
+            cached = records.get(directory)
+            if cached is None:
+                return None
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                return None
+            if cached["mtime"] != mtime:
+                return None
+            return (directory, cached), [os.path.join(directory, name) for name in cached["subdirs"]]
+
+        def visit(directory, entries, depth):
+            record = self._summarise(directory, entries)
+            return (directory, record), [os.path.join(directory, name) for name in record["subdirs"]]
+
+        for directory, record in self.walker.walk(roots, visit, shortcut):
+            refreshed[directory] = record
+
+        # Drop records of directories that vanished from the measured trees
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+        for directory in [d for d in records if d.startswith(prefixes) or d in roots]:
+            if directory not in refreshed:
+                del records[directory]
+        records.update(refreshed)
+        self._dirty = True
+        if flush:
+            self.flush()
+
+        return {path: self._aggregate(root, records) for path, root in zip(paths, roots)}
+
+    def size_installations(self, installations: List[PythonInstallation],
+                           flush: bool = True) -> List[PythonInstallation]:
+        """Fill `size_mb` on every installation"""
+        roots = {install.path: installation_roots(install) for install in installations}
+        usage = self.measure_many(sorted({root for install_roots in roots.values() for root in install_roots}),
+                                  flush=flush)
+        for install in installations:
+            allocated = sum(usage[root].allocated_bytes for root in roots[install.path])
+            install.size_mb = round(allocated / (1024 * 1024), 2)
+        return installations
+
+    def flush(self):
+        """Persist the directory records"""
+        with self._lock:
+            if self._dirty and self.enabled:
+                self.storage.save({"version": CACHE_VERSION, "records": self._records})
+            self._dirty = False
+
+    @staticmethod
+    def _summarise(directory: str, entries: List[os.DirEntry]) -> Dict:
+        # The directory's own inode counts too, as with `du`
+        try:
+            dir_stat = os.stat(directory)
+            mtime = dir_stat.st_mtime_ns
+            apparent = dir_stat.st_size
+            allocated = getattr(dir_stat, "st_blocks", 0) * 512
+        except OSError:
+            mtime = None
+            apparent = allocated = 0
+        files = 0
+        links = []
+        subdirs = []
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                subdirs.append(entry.name)
+                continue
+            blocks = getattr(st, "st_blocks", None)
+            entry_allocated = blocks * 512 if blocks is not None else st.st_size
+            if st.st_nlink > 1 and not stat.S_ISLNK(st.st_mode):
+                links.append([st.st_dev, st.st_ino, st.st_nlink, st.st_size, entry_allocated])
+            else:
+                apparent += st.st_size
+                allocated += entry_allocated
+                files += 1
+        return {"mtime": mtime, "apparent": apparent, "allocated": allocated, "files": files,
+                "links": links, "subdirs": subdirs}
+
+    @staticmethod
+    def _aggregate(root: str, records: Dict[str, Dict]) -> DiskUsage:
+        usage = DiskUsage()
+        inodes: Dict[tuple, List[int]] = {}
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            record = records.get(directory)
+            if record is None:
+                continue
+            usage.apparent_bytes += record["apparent"]
+            usage.allocated_bytes += record["allocated"]
+            usage.files += record["files"]
+            for dev, ino, nlink, size, allocated in record["links"]:
+                inodes.setdefault((dev, ino), [0, nlink, size, allocated])[0] += 1
+            stack.extend(os.path.join(directory, name) for name in record["subdirs"])
+
+        usage.reclaimable_bytes = usage.allocated_bytes
+        for seen, nlink, size, allocated in inodes.values():
+            usage.apparent_bytes += size
+            usage.allocated_bytes += allocated
+            usage.files += 1
+            if seen >= nlink:
+                usage.reclaimable_bytes += allocated
+        return usage
+
+    def _load(self) -> Dict[str, Dict]:
+        with self._lock:
+            if self._records is None:
+                data = (self.storage.load() or {}) if self.enabled else {}
+                self._records = data.get("records", {}) if data.get("version") == CACHE_VERSION else {}
+            return self._records
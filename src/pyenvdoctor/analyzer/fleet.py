@@ -0,0 +1,334 @@
+import fcntl
+import hashlib
+import json
+import os
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+STORE_VERSION = 1
+
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+# Column name -> array typecode. Strings are stored as ids into the
+# interned string table; every column of a table has one entry per row.
+TABLES = {
+    "reports": {"host": "i", "scanned_at": "d", "installations": "i", "issues": "i"},
+    "installations": {"report": "i", "host": "i", "path": "i", "version": "i", "provider": "i", "valid": "b",
+                      "status": "i", "packages": "i", "size_mb": "d"},
+    "issues": {"report": "i", "host": "i", "type": "i", "severity": "b", "description": "i"}
+}
+
+# Values of columns added after the first release, for rows written before
+# them and for reports that did not measure them
+MISSING = {("installations", "packages"): -1, ("installations", "size_mb"): float("nan")}
+
+def _report_records(path: str, errors: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Scan reports in a file: `scan --json` documents or `scan --ndjson` streams.
+
+    NDJSON is read line by line; lines that are not JSON records are
+    skipped and described in `errors`.
+    """
+    errors = [] if errors is None else errors
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+        if not (isinstance(record, dict) and "kind" in record):
+            # A JSON document, pretty-printed or on a single line
+            f.seek(0)
+            try:
+                document = json.load(f)
+            except ValueError as e:
+                errors.append(f"{path}: {e}")
+                return
+            if isinstance(document, dict):
+                yield document
+            return
+        f.seek(0)
+        report: Dict[str, Any] = {"installations": [], "issues": []}
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind = record.pop("kind", None)
+            except (ValueError, AttributeError, TypeError) as e:
+                errors.append(f"{path}:{number}: {e}")
+                continue
+            if kind == "installation":
+                report["installations"].append(record)
+            elif kind == "issue":
+                report["issues"].append(record)
+            elif kind == "summary":
+                report["host"] = record.get("host")
+                yield report
+                report = {"installations": [], "issues": []}
+    if report["installations"] or report["issues"]:
+        yield report
+
+class FleetStore:
+    """Columnar, append-only store of scan reports from many hosts.
+
+    Each column is a flat binary array file and strings (hosts, paths,
+    versions, providers, issue types) are interned once in strings.jsonl.
+    Appends only ever add to the end of the files; meta.json records the
+    committed row counts and is replaced last, so a crash mid-append
+    leaves the previous state readable. Queries look at the latest report
+    of every host.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Path.home() / ".pyenvdoctor" / "fleet")
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._strings: Optional[List[str]] = None
+        self._string_ids: Dict[str, int] = {}
+        self._columns: Optional[Dict[str, Dict[str, array]]] = None
+        self._digests: Optional[Set[str]] = None
+        # Unreadable files and lines met by the last ingest
+        self.errors: List[str] = []
+
+    # Ingestion
+
+    def ingest(self, paths: Iterable[str]) -> int:
+        """Append every report found in the files; returns how many were new"""
+        added = 0
+        self.errors = []
+        with self._locked():
+            self._load()
+            self._truncate()
+            pending = {table: {column: array(code) for column, code in columns.items()}
+                       for table, columns in TABLES.items()}
+            new_strings: List[str] = []
+            new_digests: List[str] = []
+            for path in paths:
+                for report in _report_records(path, self.errors):
+                    digest = hashlib.sha1(json.dumps(report, sort_keys=True).encode()).hexdigest()
+                    if digest in self._digests:
+                        continue
+                    self._digests.add(digest)
+                    new_digests.append(digest)
+                    self._add_report(report, path, pending, new_strings)
+                    added += 1
+            if added:
+                self._commit(pending, new_strings, new_digests)
+        return added
+
+    def _add_report(self, report: Dict[str, Any], source: str, pending, new_strings: List[str]):
+        host_info = report.get("host") or {}
+        host = self._intern(host_info.get("hostname") or Path(source).stem.split(".")[0], new_strings)
+        try:
+            scanned_at = datetime.fromisoformat(host_info["scanned_at"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            scanned_at = os.path.getmtime(source)
+        report_id = len(self._columns["reports"]["host"]) + len(pending["reports"]["host"])
+
+        installations = report.get("installations") or []
+        issues = report.get("issues") or []
+        self._append(pending["reports"], host=host, scanned_at=scanned_at,
+                     installations=len(installations), issues=len(issues))
+        for inst in installations:
+            self._append(pending["installations"], report=report_id, host=host,
+                         path=self._intern(inst.get("path") or "", new_strings),
+                         version=self._intern(inst.get("version") or "Unknown", new_strings),
+                         provider=self._intern(inst.get("provider") or "", new_strings),
+                         valid=1 if inst.get("is_valid", True) else 0,
+                         status=self._intern(inst.get("status") or "", new_strings),
+                         packages=len(inst["packages"]) if inst.get("packages") is not None else -1,
+                         size_mb=inst["size_mb"] if inst.get("size_mb") is not None else float("nan"))
+        for issue in issues:
+            severity = issue.get("severity", "medium")
+            self._append(pending["issues"], report=report_id, host=host,
+                         type=self._intern(issue.get("type") or "general", new_strings),
+                         severity=SEVERITIES.index(severity) if severity in SEVERITIES else 1,
+                         description=self._intern(issue.get("description") or "", new_strings))
+
+    @staticmethod
+    def _append(table: Dict[str, array], **values):
+        for column, value in values.items():
+            table[column].append(value)
+
+    def _intern(self, value: str, new_strings: List[str]) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+            new_strings.append(value)
+        return string_id
+
+    def _commit(self, pending, new_strings: List[str], new_digests: List[str]):
+        with open(self.path / "strings.jsonl", "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(value) + "\n" for value in new_strings)
+        with open(self.path / "digests.txt", "a", encoding="utf-8") as f:
+            f.writelines(digest + "\n" for digest in new_digests)
+        for table, columns in pending.items():
+            for column, values in columns.items():
+                with open(self._column_path(table, column), "ab") as f:
+                    values.tofile(f)
+                self._columns[table][column].extend(values)
+        self._save_meta()
+
+    # Queries
+
+    def hosts(self) -> List[str]:
+        return sorted(self._strings[host] for host in self._latest_reports())
+
+    def hosts_with_version(self, version: str) -> List[str]:
+        """Hosts whose latest report has an interpreter of this version (or X.Y prefix)"""
+        self._load()
+        wanted = {i for i, value in enumerate(self._strings)
+                  if value == version or value.startswith(version + ".")}
+        return self._hosts_where("installations", "version", wanted.__contains__)
+
+    def hosts_with_invalid(self) -> List[str]:
+        """Hosts whose latest report has an interpreter that failed to run"""
+        return self._hosts_where("installations", "valid", lambda valid: not valid)
+
+    def issue_counts(self, by: str = "type") -> Dict[str, int]:
+        """Issues in the latest reports, counted by type or severity"""
+        latest = set(self._latest_reports().values())
+        columns = self._load()["issues"]
+        counts: Dict[str, int] = {}
+        for report, value in zip(columns["report"], columns[by]):
+            if report in latest:
+                key = SEVERITIES[value] if by == "severity" else self._strings[value]
+                counts[key] = counts.get(key, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def version_counts(self) -> Dict[str, int]:
+        """Interpreters in the latest reports, counted by version"""
+        latest = set(self._latest_reports().values())
+        columns = self._load()["installations"]
+        counts: Dict[str, int] = {}
+        for report, version in zip(columns["report"], columns["version"]):
+            if report in latest:
+                counts[self._strings[version]] = counts.get(self._strings[version], 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def installation_columns(self, names: Iterable[str]) -> Dict[str, List[float]]:
+        """Numeric installation columns of the latest reports, NaN where unknown"""
+        latest = set(self._latest_reports().values())
+        columns = self._load()["installations"]
+        rows = [row for row, report in enumerate(columns["report"]) if report in latest]
+        table = {}
+        for name in names:
+            values = columns[name]
+            missing = MISSING.get(("installations", name))
+            table[name] = [float("nan") if values[row] == missing else float(values[row]) for row in rows]
+        return table
+
+    def _hosts_where(self, table: str, column: str, predicate) -> List[str]:
+        latest = set(self._latest_reports().values())
+        columns = self._load()[table]
+        hosts = {host for report, host, value in zip(columns["report"], columns["host"], columns[column])
+                 if report in latest and predicate(value)}
+        return sorted(self._strings[host] for host in hosts)
+
+    def _latest_reports(self) -> Dict[int, int]:
+        """host id -> id of its most recent report"""
+        reports = self._load()["reports"]
+        latest: Dict[int, int] = {}
+        newest: Dict[int, float] = {}
+        for report_id, (host, scanned_at) in enumerate(zip(reports["host"], reports["scanned_at"])):
+            if scanned_at >= newest.get(host, float("-inf")):
+                newest[host] = scanned_at
+                latest[host] = report_id
+        return latest
+
+    # Storage
+
+    def _column_path(self, table: str, column: str) -> Path:
+        return self.path / f"{table}.{column}.bin"
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path / ".lock", "w") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since we last read
+                self._columns = None
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Dict[str, array]]:
+        if self._columns is not None:
+            return self._columns
+        try:
+            with open(self.path / "meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("version") != STORE_VERSION:
+            meta = {"rows": {}, "strings": 0, "digests": 0}
+
+        self._strings = self._read_lines("strings.jsonl", meta["strings"], json.loads)
+        self._string_ids = {value: i for i, value in enumerate(self._strings)}
+        self._digests = set(self._read_lines("digests.txt", meta["digests"], str.strip))
+        self._columns = {}
+        for table, columns in TABLES.items():
+            rows = meta["rows"].get(table, 0)
+            self._columns[table] = {}
+            for column, code in columns.items():
+                values = array(code)
+                if rows:
+                    # Rows past the committed count belong to an interrupted append
+                    try:
+                        with open(self._column_path(table, column), "rb") as f:
+                            values.fromfile(f, rows)
+                    except (FileNotFoundError, EOFError):
+                        if (table, column) not in MISSING:
+                            raise
+                        # A column added after these rows were written
+                        values.extend([MISSING[table, column]] * (rows - len(values)))
+                self._columns[table][column] = values
+        return self._columns
+
+    def _read_lines(self, name: str, count: int, parse) -> list:
+        values = []
+        if count:
+            with open(self.path / name, encoding="utf-8") as f:
+                for line in f:
+                    if len(values) == count:
+                        break
+                    values.append(parse(line))
+        return values
+
+    def _truncate(self):
+        # Drop the tail of an interrupted append so the next one lines up
+        for table, columns in TABLES.items():
+            for column, code in columns.items():
+                path = self._column_path(table, column)
+                size = len(self._columns[table]["host"]) * array(code).itemsize
+                actual = path.stat().st_size if path.exists() else 0
+                if actual > size:
+                    os.truncate(path, size)
+                elif actual < size:
+                    # Write out a column padded by _load so appends line up
+                    with open(path, "wb") as f:
+                        self._columns[table][column].tofile(f)
+        for name, count in (("strings.jsonl", len(self._strings)), ("digests.txt", len(self._digests))):
+            path = self.path / name
+            if path.exists():
+                with open(path, "rb") as f:
+                    offset = sum(len(line) for _, line in zip(range(count), f))
+                if path.stat().st_size > offset:
+                    os.truncate(path, offset)
+
+    def _save_meta(self):
+        meta = {
+            "version": STORE_VERSION,
+            "rows": {table: len(columns["host"]) for table, columns in self._columns.items()},
+            "strings": len(self._strings),
+            "digests": len(self._digests)
+        }
+        temp_path = self.path / "meta.json.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(self.path / "meta.json")
@@ -4,10 +4,19 @@ from rich.prompt import Confirm, Prompt
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import json
+import os
+import socket
 import sys
+from datetime import datetime
 
 # Import our modules
+from ..analyzer.disk_usage import DiskUsageEngine
+from ..core.config import parse_duration
+from ..scanner.cache import ProbeCache
+from ..scanner.inventory import InventoryReader
+from ..scanner.static_probe import StaticScanner
 from ..scanner.system_scanner import SystemScanner
+from ..scanner.venv_discovery import VenvDiscovery
 from ..gamification.manager import GamificationManager
 from ..ai.fix_oracle import FixOracle
 
@@ -22,8 +31,55 @@ def main():
     scan_parser.add_argument('--full', action='store_true', help='Perform comprehensive scan')
     scan_parser.add_argument('--ai', action='store_true', help='Include AI-powered analysis')
     scan_parser.add_argument('--json', action='store_true', help='Output in JSON format')
+    scan_parser.add_argument('--ndjson', action='store_true',
+                             help='Stream one JSON record per line as results are found')
+    scan_parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the probe cache')
+    scan_parser.add_argument('--refresh', action='store_true', help='Re-probe every interpreter and refresh the cache')
+    scan_parser.add_argument('--packages', action='store_true', help='Inventory installed packages from site-packages')
+    scan_parser.add_argument('--sizes', action='store_true', help='Measure disk usage of each installation')
+    scan_parser.add_argument('--roots', nargs='+', metavar='DIR', help='Also discover virtualenvs under these directories')
+    scan_parser.add_argument('--max-depth', type=int, default=8, help='Maximum directory depth for --roots discovery')
+    scan_parser.add_argument('--follow-symlinks', action='store_true', help='Follow directory symlinks during --roots discovery')
+    scan_parser.add_argument('--root', action='append', metavar='DIR',
+                             help='Scan a mounted root filesystem (repeatable); implies --no-exec')
+    scan_parser.add_argument('--no-exec', action='store_true',
+                             help='Identify interpreters from their files without executing them')
+    scan_parser.add_argument('--deadline', type=parse_duration, metavar='DURATION',
+                             help='Time budget for the whole scan, e.g. 10s; late probes are reported as unknown')
     scan_parser.set_defaults(func=enhanced_scan)
     
+    # Container image scan
+    image_parser = subparsers.add_parser('scan-image', help='Scan docker save / OCI image archives without extracting them')
+    image_parser.add_argument('images', nargs='+', metavar='IMAGE',
+                              help='Image archive (.tar), or an image name when the docker package is installed')
+    image_parser.add_argument('--json', action='store_true', help='Output in JSON format')
+    image_parser.add_argument('--ndjson', action='store_true', help='Stream one JSON record per line')
+    image_parser.add_argument('--no-packages', action='store_true', help='Skip the dist-info package inventory')
+    image_parser.set_defaults(func=scan_images)
+    
+    # Fleet aggregation
+    aggregate_parser = subparsers.add_parser('aggregate', help='Aggregate scan --json/--ndjson reports from many hosts')
+    aggregate_parser.add_argument('reports', nargs='*', metavar='REPORT',
+                                  help='Report files or directories to append to the store')
+    aggregate_parser.add_argument('--store', metavar='DIR', help='Store directory (default ~/.pyenvdoctor/fleet)')
+    aggregate_parser.add_argument('--version', metavar='X.Y', help='List hosts with this Python version')
+    aggregate_parser.add_argument('--invalid', action='store_true', help='List hosts with invalid interpreters')
+    aggregate_parser.add_argument('--issues', action='store_true', help='Count issues')
+    aggregate_parser.add_argument('--by', choices=['type', 'severity'], default='type', help='Issue grouping')
+    aggregate_parser.add_argument('--versions', action='store_true', help='Count interpreters by version')
+    aggregate_parser.add_argument('--update-model', action='store_true',
+                                  help='Refit the installation anomaly model if the fleet drifted (needs the ai extra)')
+    aggregate_parser.add_argument('--json', action='store_true', help='Output in JSON format')
+    aggregate_parser.set_defaults(func=aggregate_reports)
+    
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Watch installations and stream changes as NDJSON')
+    watch_parser.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds')
+    watch_parser.add_argument('--poll', action='store_true', help='Force mtime polling instead of inotify')
+    watch_parser.add_argument('--venv-root', action='append', default=[], metavar='DIR',
+                              help='Directory holding virtualenvs to watch (repeatable)')
+    watch_parser.set_defaults(func=watch_installations)
+    
     # Advanced fix command
     fix_parser = subparsers.add_parser('fix', help='Fix issues with AI suggestions and undo support')
     fix_parser.add_argument('--dry-run', action='store_true', help='Simulate fixes without making changes')
@@ -41,8 +97,25 @@ def main():
     audit_parser = subparsers.add_parser('audit', help='Security and compliance audit')
     audit_parser.add_argument('--cis', action='store_true', help='Check CIS benchmark compliance')
     audit_parser.add_argument('--cve', action='store_true', help='Scan for known vulnerabilities')
+    audit_parser.add_argument('--packages', action='store_true',
+                              help='Check installed packages against the local advisory database')
+    audit_parser.add_argument('--permissions', action='store_true',
+                              help='Stream world/group-writable and foreign-owned files in every installation')
+    audit_parser.add_argument('--integrity', action='store_true',
+                              help='Verify installed files against the sha256 hashes in their RECORD')
+    audit_parser.add_argument('--deadline', type=parse_duration, metavar='DURATION',
+                              help='Time budget for probing interpreters, e.g. 10s')
     audit_parser.set_defaults(func=security_audit)
     
+    # Advisory database
+    update_db_parser = subparsers.add_parser('update-db', help='Create or update the local vulnerability database')
+    update_db_parser.add_argument('--from', dest='source', metavar='PATH',
+                                  help='Import an offline OSV dump (all.zip, directory or JSON) instead of downloading')
+    update_db_parser.add_argument('--db', metavar='PATH', help='Database file (default ~/.pyenvdoctor/advisories.db)')
+    update_db_parser.add_argument('--cpython', metavar='PATH',
+                                  help='Install a newer CPython advisory table used by `audit --cve`')
+    update_db_parser.set_defaults(func=update_advisory_db)
+    
     # History and undo
     history_parser = subparsers.add_parser('history', help='View operation history')
     history_parser.add_argument('--limit', type=int, default=10, help='Number of entries to show')
@@ -67,21 +140,30 @@ def main():
 
 def enhanced_scan(args):
     """Enhanced scanning with AI integration"""
-    console.print("[bold blue]PyEnvDoctor 2.0 - Environment Scan[/bold blue]\n")
+    if args.ndjson:
+        return stream_scan(args)
+    
+    # Keep stdout clean for machine-readable output
+    status_console = Console(stderr=True) if args.json else console
+    status_console.print("[bold blue]PyEnvDoctor 2.0 - Environment Scan[/bold blue]\n")
     
     # Initialize components
-    scanner = SystemScanner()
+    scanner = _scan_scanner(args)
     gamification = GamificationManager()
     
     # Perform scan
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=status_console
     ) as progress:
         task = progress.add_task("Scanning environment...", total=None)
-        issues = scanner.scan(comprehensive=args.full)
+        issues = scanner.scan(comprehensive=args.full, roots=args.roots)
         installations = scanner.get_installations()
+        if args.packages:
+            InventoryReader(enabled=False if args.no_cache else None).inventory(installations)
+        if args.sizes:
+            DiskUsageEngine(enabled=False if args.no_cache else None).size_installations(installations)
         
     # Update gamification
     gamification.update_stats(scans_performed=1)
@@ -94,7 +176,9 @@ def enhanced_scan(args):
             "summary": {
                 "total_installations": len(installations),
                 "total_issues": len(issues)
-            }
+            },
+            "providers": scanner.provider_timings,
+            "host": _host_info()
         }
         print(json.dumps(results, indent=2))
     else:
@@ -102,9 +186,15 @@ def enhanced_scan(args):
         console.print(f"✓ Found {len(installations)} Python installation(s)")
         
         for inst in installations:
-            status = "✓" if inst.is_valid else "✗"
-            color = "green" if inst.is_valid else "red"
+            status, color = {
+                "ok": ("✓", "green"),
+                "unknown": ("?", "yellow")
+            }.get(inst.status, ("✗", "red"))
             console.print(f"  [{color}]{status} {inst.path} ({inst.provider}) - {inst.version}[/{color}]")
+            if args.packages:
+                console.print(f"    [dim]{len(inst.packages)} package(s)[/dim]")
+            if args.sizes:
+                console.print(f"    [dim]{inst.size_mb} MB on disk[/dim]")
             
         if issues:
             console.print(f"\n[bold yellow]Issues Found:[/bold yellow]")
@@ -127,6 +217,142 @@ def enhanced_scan(args):
             else:
                 console.print("🤖 See the issues above for areas that need attention")
 
+def stream_scan(args):
+    """Write scan results as NDJSON, flushing each record as soon as it is found"""
+    scanner = _scan_scanner(args)
+    inventory = InventoryReader(enabled=False if args.no_cache else None) if args.packages else None
+    disk_usage = DiskUsageEngine(enabled=False if args.no_cache else None) if args.sizes else None
+    counts = {"installation": 0, "issue": 0}
+    
+    try:
+        for kind, record in scanner.iter_scan(comprehensive=args.full, roots=args.roots):
+            if kind == "installation" and inventory:
+                inventory.inventory([record], flush=False)
+            if kind == "installation" and disk_usage:
+                disk_usage.size_installations([record], flush=False)
+            counts[kind] += 1
+            _write_ndjson({"kind": kind, **record.to_dict()})
+    finally:
+        if inventory:
+            inventory.flush()
+        if disk_usage:
+            disk_usage.flush()
+    
+    _write_ndjson({
+        "kind": "summary",
+        "total_installations": counts["installation"],
+        "total_issues": counts["issue"],
+        "providers": scanner.provider_timings,
+        "host": _host_info()
+    })
+    GamificationManager().update_stats(scans_performed=1)
+
+def scan_images(args):
+    """Scan container image archives for Python installations"""
+    from ..scanner.image_scanner import ImageScanner
+    
+    results = []
+    for image in args.images:
+        scanner = ImageScanner(image)
+        if args.ndjson:
+            for kind, record in scanner.iter_scan(packages=not args.no_packages):
+                _write_ndjson({"kind": kind, "image": image, **record.to_dict()})
+            continue
+        issues = scanner.scan(packages=not args.no_packages)
+        results.append((image, scanner.get_installations(), issues))
+    
+    if args.json:
+        print(json.dumps({"images": [{
+            "image": image,
+            "installations": [inst.to_dict() for inst in installations],
+            "issues": [issue.to_dict() for issue in issues]
+        } for image, installations, issues in results]}, indent=2))
+        return
+    for image, installations, issues in results:
+        console.print(f"\n[bold blue]{image}[/bold blue]")
+        console.print(f"✓ Found {len(installations)} Python installation(s)")
+        for inst in installations:
+            status, color = ("✓", "green") if inst.is_valid else ("✗", "red")
+            console.print(f"  [{color}]{status} {inst.path} ({inst.provider}) - {inst.version}[/{color}]")
+            if inst.packages:
+                console.print(f"    [dim]{len(inst.packages)} package(s)[/dim]")
+        for issue in issues:
+            console.print(f"  • [yellow]{issue.description}[/yellow]")
+
+def aggregate_reports(args):
+    """Load scan reports into the fleet store and query it"""
+    from ..analyzer.fleet import FleetStore
+    
+    store = FleetStore(args.store)
+    files = []
+    for report in args.reports:
+        if os.path.isdir(report):
+            files.extend(sorted(os.path.join(report, name) for name in os.listdir(report)
+                                if name.endswith((".json", ".ndjson"))))
+        else:
+            files.append(report)
+    added = store.ingest(files) if files else 0
+    
+    results = {"added_reports": added, "hosts": len(store.hosts())}
+    if store.errors:
+        results["skipped_input"] = store.errors
+    if args.version:
+        results["hosts_with_version"] = store.hosts_with_version(args.version)
+    if args.invalid:
+        results["hosts_with_invalid"] = store.hosts_with_invalid()
+    if args.issues:
+        results["issue_counts"] = store.issue_counts(by=args.by)
+    if args.versions:
+        results["version_counts"] = store.version_counts()
+    if args.update_model:
+        from ..ai.predictors import InstallationPredictor
+        results["model_refit"] = InstallationPredictor([], fleet=store).update()
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    console.print(f"Added {added} report(s); {results['hosts']} host(s) in {store.path}")
+    for key, value in results.items():
+        if key in ("added_reports", "hosts"):
+            continue
+        if key == "model_refit":
+            console.print("\nAnomaly model " + ("refit on the fleet" if value else "unchanged (no drift)"))
+            continue
+        console.print(f"\n[bold]{key.replace('_', ' ').capitalize()}:[/bold]")
+        if isinstance(value, dict):
+            for name, count in value.items():
+                console.print(f"  {name}: {count}")
+        else:
+            for host in value:
+                console.print(f"  {host}")
+
+def _host_info():
+    return {"hostname": socket.gethostname(), "scanned_at": datetime.now().astimezone().isoformat()}
+
+def _scan_scanner(args):
+    discovery = VenvDiscovery(max_depth=args.max_depth, follow_symlinks=args.follow_symlinks)
+    if args.root or args.no_exec:
+        return StaticScanner(roots=args.root or ["/"], venv_discovery=discovery)
+    cache = ProbeCache(enabled=False if args.no_cache else None, refresh=args.refresh)
+    return SystemScanner(cache=cache, venv_discovery=discovery, deadline=args.deadline)
+
+def _write_ndjson(record):
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+def watch_installations(args):
+    """Stream installation add/remove/change events as NDJSON"""
+    from ..scanner.watcher import InstallationWatcher
+    
+    watcher = InstallationWatcher(venv_roots=args.venv_root, interval=args.interval,
+                                  force_polling=args.poll)
+    Console(stderr=True).print(f"[dim]Watching with {watcher.backend.name} backend (Ctrl+C to stop)[/dim]")
+    try:
+        for event in watcher.events():
+            _write_ndjson(event)
+    except KeyboardInterrupt:
+        pass
+
 def advanced_fix(args):
     """Advanced fix with AI suggestions"""
     console.print("[bold blue]PyEnvDoctor 2.0 - Fix Issues[/bold blue]\n")
@@ -147,8 +373,9 @@ def advanced_fix(args):
     
     if args.ai:
         oracle = FixOracle()
-        for issue in issues:
-            suggestions = oracle.suggest_fixes(issue)
+        batches = oracle.suggest_fixes_batch(issues)
+        oracle.flush()
+        for issue, suggestions in zip(issues, batches):
             if suggestions:
                 console.print(f"\n[yellow]AI Suggestions for: {issue.description}[/yellow]")
                 for i, suggestion in enumerate(suggestions, 1):
@@ -173,7 +400,33 @@ def security_audit(args):
     try:
         from ..security.auditor import SecurityAuditor
         
-        auditor = SecurityAuditor()
+        auditor = SecurityAuditor(deadline=getattr(args, "deadline", None))
+        
+        if getattr(args, "permissions", False):
+            from ..security.permission_audit import describe
+            colors = {"high": "red", "medium": "yellow", "low": "dim"}
+            count = 0
+            for finding in auditor.iter_permission_findings():
+                count += 1
+                color = colors[finding["severity"]]
+                console.print(f"  [{color}]{finding['severity'].upper()}[/{color}] {describe(finding)}")
+            console.print(f"\n{count} permission finding(s)")
+            if not (args.cis or args.cve or args.packages or args.integrity):
+                return
+        
+        if getattr(args, "integrity", False):
+            from ..security.integrity import IntegrityVerifier
+            verifier = IntegrityVerifier()
+            count = 0
+            for finding in auditor.iter_integrity_findings(verifier):
+                count += 1
+                console.print(f"  [red]{finding['kind'].upper()}[/red] {finding['package']} "
+                              f"{finding['version']}: {finding['path']}")
+            stats = verifier.stats
+            console.print(f"\n{count} integrity finding(s) in {stats['files']} file(s); "
+                          f"{stats['hashed']} hashed, {stats['cached']} unchanged since the last run")
+            if not (args.cis or args.cve or args.packages):
+                return
         
         # Determine what to check
         check_cis = args.cis if hasattr(args, "cis") else True
@@ -186,7 +439,8 @@ def security_audit(args):
             console=console
         ) as progress:
             task = progress.add_task("Running security audit...", total=None)
-            results = auditor.run_security_audit(check_cis=check_cis, check_cve=check_cve)
+            results = auditor.run_security_audit(check_cis=check_cis, check_cve=check_cve,
+                                                 check_packages=getattr(args, "packages", False))
             
         # Display results
         if "cis_compliance" in results:
@@ -196,7 +450,8 @@ def security_audit(args):
             for check_name, check_result in cis_results.items():
                 status = check_result.get("status", "unknown")
                 color = "green" if status == "pass" else "red"
-                console.print(f"  [{color}]• {check_name}: {status.upper()}[/{color}]")
+                timing = f" ({check_result['duration_ms']} ms)" if "duration_ms" in check_result else ""
+                console.print(f"  [{color}]• {check_name}: {status.upper()}{timing}[/{color}]")
                 
                 if "issues" in check_result and check_result["issues"]:
                     for issue in check_result["issues"]:
@@ -210,14 +465,47 @@ def security_audit(args):
                 for vuln in vuln_results["vulnerabilities"]:
                     status = vuln.get("status", "unknown")
                     color = "green" if status == "clean" else "red"
-                    console.print(f"  [{color}]• {vuln['version''']}: {status.upper()}[/{color}]")
+                    console.print(f"  [{color}]• {vuln['version''']} ({vuln['interpreter']}): {status.upper()}[/{color}]")
+                    for cve in vuln.get("cves", []):
+                        fixed = f", fixed in {', '.join(cve['fixed_in'])}" if cve["fixed_in"] else ""
+                        console.print(f"    - {cve['id']} ({cve['severity']}) {cve['component']}: {cve['summary']}{fixed}")
             else:
                 console.print("  [green]No vulnerabilities found[/green]")
                 
+        if "package_vulnerabilities" in results:
+            console.print("\n[bold]Package Vulnerabilities:[/bold]")
+            package_results = results["package_vulnerabilities"]
+            if package_results.get("error"):
+                console.print(f"  [yellow]{package_results['error']}[/yellow]")
+            elif not package_results["installations"]:
+                console.print("  [green]No vulnerable packages found[/green]")
+            for path, packages in package_results["installations"].items():
+                console.print(f"  [red]{path}[/red]")
+                for package, vulns in packages.items():
+                    ids = ", ".join(vuln["id"] for vuln in vulns)
+                    console.print(f"    - {package}: {ids}")
+                
     except ImportError as e:
         console.print(f"[red]Security module error: {e}[/red]")
         console.print("Security audit requires all modules to be properly installed.")
 
+def update_advisory_db(args):
+    """Import or sync the OSV advisory database"""
+    from ..security.advisory_db import AdvisoryDB
+    from ..security.cpython_advisories import CPythonAdvisories
+    
+    if args.cpython:
+        table = CPythonAdvisories.install(args.cpython)
+        console.print(f"✓ CPython advisory table from {table.updated} installed ({len(table.advisories)} advisories)")
+        return
+    db = AdvisoryDB(args.db)
+    if args.source:
+        changed = db.import_path(args.source)
+    else:
+        console.print("Syncing advisories from OSV...")
+        changed = db.update()
+    console.print(f"✓ {changed} advisory record(s) added or updated in {db.path}")
+
 def show_history(args):
     """Show operation history"""
     console.print("[bold blue]Operation History[/bold blue]\n")
@@ -1,8 +1,21 @@
 import os
+import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import yaml
 
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_duration(value: Union[str, int, float]) -> float:
+    """Convert a duration such as "90s", "1h" or "7d" to seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+    number, unit = match.groups()
+    return float(number) * _DURATION_UNITS.get(unit or "s")
+
 class Config:
     def __init__(self):
         self.config_dir = Path.home() / ".config" / "pyenvdoctor"
@@ -27,7 +40,15 @@ class Config:
                 "enabled": True,
                 "api_key": os.environ.get("PYENVDOCTOR_API_KEY", ""),
                 "model": "pyenvdoctor-v1",
-                "max_suggestions": 5
+                "max_suggestions": 5,
+                "fix_cache_size": 4096,
+                "persist_fix_cache": False,
+                "fix_rules": [],  # extra rule files or directories of them
+                "drift_threshold": 0.5,  # baseline standard deviations before the anomaly model is refit
+                "project_roots": ["~"],  # searched for .python-version files
+                "project_depth": 3,
+                "project_rescan_interval": "7d",
+                "usage_log": str(Path.home() / ".pyenvdoctor" / "usage.log")
             },
             "gamification": {
                 "enabled": True,
@@ -38,6 +59,10 @@ class Config:
                 "audit_enabled": True,
                 "cis_compliance": True,
                 "vulnerability_scanning": True,
+                "fetch_workers": 8,
+                "fetch_timeout": 10,
+                "fetch_retries": 3,
+                "permission_cache_ttl": "1d",
                 "security_log": str(Path.home() / ".pyenvdoctor" / "security.log")
             },
             "fixer": {
@@ -50,7 +75,12 @@ class Config:
                 "full_scan_interval": "7d",
                 "quick_scan_interval": "1d",
                 "cache_results": True,
-                "cache_ttl": "1h"
+                "cache_ttl": "1h",
+                "max_workers": 0,  # 0 = auto
+                "probe_timeout": 5,
+                "max_probe_timeout": 30,
+                "scan_deadline": 0,  # 0 = no global budget
+                "provider_timeout": 10
             },
             "logging": {
                 "level": "INFO",
@@ -70,7 +100,8 @@ class Config:
                 "pyenv_root": os.environ.get("PYENV_ROOT", ""),
                 "prefer_pyenv": True,
                 "check_shims": True,
-                "verify_installations": True
+                "verify_installations": True,
+                "venv_roots": []
             }
         }
     
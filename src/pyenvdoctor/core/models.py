@@ -9,6 +9,48 @@ class PythonInstallation:
     provider: str = "system"
     is_active: bool = False
     is_valid: bool = True
+    implementation: Optional[str] = None
+    abi: Optional[str] = None
+    prefix: Optional[str] = None
+    base_prefix: Optional[str] = None
+    site_packages: List[str] = field(default_factory=list)
+    openssl_version: Optional[str] = None
+    expat_version: Optional[str] = None
+    sqlite_version: Optional[str] = None
+    build_flags: Dict[str, Any] = field(default_factory=dict)
+    base_interpreter: Optional[str] = None
+    packages: Dict[str, str] = field(default_factory=dict)
+    size_mb: Optional[float] = None
+    status: Optional[str] = None  # ok, invalid, unknown (probe missed its deadline)
+    last_used: Optional[datetime] = None
+    probe: Dict[str, Any] = field(default_factory=dict, repr=False)
+    
+    def __post_init__(self):
+        if self.status is None:
+            self.status = "ok" if self.is_valid else "invalid"
+    
+    @classmethod
+    def from_probe(cls, path: str, provider: str, probe: Optional[Dict[str, Any]],
+                   version: Optional[str] = None) -> 'PythonInstallation':
+        """Build an installation from an introspection probe report"""
+        if not probe:
+            return cls(path=path, version=version or "Unknown", provider=provider, is_valid=False)
+        return cls(
+            path=path,
+            version=probe.get("version") or version or "Unknown",
+            provider=provider,
+            is_valid=bool(probe.get("ok")),
+            implementation=probe.get("implementation"),
+            abi=probe.get("abi"),
+            prefix=probe.get("prefix"),
+            base_prefix=probe.get("base_prefix"),
+            site_packages=list(probe.get("site_packages") or []),
+            openssl_version=probe.get("openssl_version"),
+            expat_version=probe.get("expat_version"),
+            sqlite_version=probe.get("sqlite_version"),
+            build_flags=dict(probe.get("build_flags") or {}),
+            probe=probe
+        )
     
     def to_dict(self) -> Dict:
         return {
@@ -16,7 +58,21 @@ class PythonInstallation:
             "version": self.version,
             "provider": self.provider,
             "is_active": self.is_active,
-            "is_valid": self.is_valid
+            "is_valid": self.is_valid,
+            "implementation": self.implementation,
+            "abi": self.abi,
+            "prefix": self.prefix,
+            "base_prefix": self.base_prefix,
+            "site_packages": self.site_packages,
+            "openssl_version": self.openssl_version,
+            "expat_version": self.expat_version,
+            "sqlite_version": self.sqlite_version,
+            "build_flags": self.build_flags,
+            "base_interpreter": self.base_interpreter,
+            "packages": self.packages,
+            "size_mb": self.size_mb,
+            "status": self.status,
+            "last_used": self.last_used.isoformat() if self.last_used else None
         }
 
 @dataclass
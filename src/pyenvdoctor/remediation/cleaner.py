@@ -1,10 +1,16 @@
 import shutil
 from typing import List
+from ..analyzer.disk_usage import DiskUsageEngine
 from ..core.models import PythonInstallation
 
 class EnvironmentCleaner:
-    def __init__(self, installations: List[PythonInstallation]):
+    def __init__(self, installations: List[PythonInstallation], disk_usage: DiskUsageEngine = None):
         self.installations = installations
+        self.disk_usage = disk_usage or DiskUsageEngine()
+    
+    def estimate_reclaimable(self, path: str) -> int:
+        """Bytes freed by removing path; hardlinks kept alive elsewhere are excluded"""
+        return self.disk_usage.measure(path).reclaimable_bytes
     
     def clean_installation(self, path: str) -> bool:
         try:
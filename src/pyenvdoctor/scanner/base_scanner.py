@@ -1,14 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import List
-from ..core.models import PythonInstallation
+from typing import List, NamedTuple, Optional
+
+class InstallationCandidate(NamedTuple):
+    """An interpreter found on disk, not yet probed"""
+    path: str
+    provider: str
+    version: Optional[str] = None
 
 class BaseScanner(ABC):
+    """Installation provider: discovers interpreters without executing them.
+
+    Subclasses set `name`, may override `timeout` (seconds, defaults to
+    scanner.provider_timeout) and list the directories whose contents
+    signal new or removed installations in `watch_roots`.
+    """
+
+    name = "base"
+    timeout: Optional[float] = None
+
     def __init__(self):
-        self.found_installations: List[PythonInstallation] = []
+        self.found_installations: List[InstallationCandidate] = []
 
     @abstractmethod
-    def scan(self):
+    def scan(self) -> List[InstallationCandidate]:
         pass
 
+    def watch_roots(self) -> List[str]:
+        return []
+
     def get_installations(self):
         return self.found_installations
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.config import config, parse_duration
+from ..utils.storage import Storage
+from .introspect import PROBE_SCRIPT
+
+# Reports produced by an older probe script are discarded wholesale
+CACHE_VERSION = "1-" + hashlib.sha1(PROBE_SCRIPT.encode()).hexdigest()[:12]
+
+# relatime moves an atime at most once a day
+PROBE_HISTORY = 86400
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+def _dir_mtime(path: Optional[str]) -> Optional[int]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def stdlib_dir(probe: Dict[str, Any]) -> Optional[str]:
+    """Location of lib/pythonX.Y for a probed interpreter"""
+    prefix = probe.get("base_prefix") or probe.get("prefix")
+    version_info = probe.get("version_info") or []
+    if not prefix or len(version_info) < 2:
+        return None
+    return os.path.join(prefix, "lib", f"python{version_info[0]}.{version_info[1]}")
+
+class ProbeCache:
+    """On-disk cache of interpreter probe reports.
+
+    Entries are keyed by interpreter path and invalidated when the
+    interpreter's inode, size or mtime change, when its lib/pythonX.Y
+    directory is modified, or once scanner.cache_ttl has elapsed.
+
+    When each interpreter was probed (or read by a static probe) is
+    recorded even with the cache disabled, since those reads move its
+    atime and must not count as use.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None,
+                 enabled: Optional[bool] = None, refresh: bool = False):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.ttl = parse_duration(config.get("scanner.cache_ttl", "1h")) if ttl is None else ttl
+        self.refresh = refresh
+        self.storage = Storage(path or Path.home() / ".pyenvdoctor" / "cache" / "probes.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def get(self, python_path: str) -> Optional[Dict[str, Any]]:
+        """Return a cached probe report if it is still fresh"""
+        if not self.enabled or self.refresh:
+            return None
+        with self._lock:
+            entry = self._load().get(python_path)
+        if not entry:
+            return None
+        if time.time() - entry.get("probed_at", 0) > self.ttl:
+            return None
+        if entry.get("fingerprint") != _stat_key(python_path):
+            return None
+        if entry.get("lib_mtime") != _dir_mtime(entry.get("lib_dir")):
+            return None
+        return entry.get("probe")
+
+    def probe_times(self, python_path: str) -> List[float]:
+        """When the interpreter was probed during the day before its latest probe"""
+        with self._lock:
+            entry = self._load().get(python_path)
+        if not entry:
+            return []
+        return list(entry.get("probes") or [entry.get("probed_at", 0)])
+
+    def put(self, python_path: str, probe: Dict[str, Any]):
+        """Record a fresh probe report"""
+        fingerprint = _stat_key(python_path) if self.enabled else None
+        if fingerprint is None:
+            self.record_probe(python_path)
+            return
+        lib_dir = stdlib_dir(probe)
+        now = time.time()
+        entry = {
+            "fingerprint": fingerprint,
+            "lib_dir": lib_dir,
+            "lib_mtime": _dir_mtime(lib_dir),
+            "probed_at": now,
+            "probe": probe
+        }
+        with self._lock:
+            entry["probes"] = self._history(self._load().get(python_path) or {}, now)
+            self._entries[python_path] = entry
+            self._dirty = True
+
+    def record_probe(self, python_path: str):
+        """Note that the interpreter was just read without keeping a report, e.g. a failed or static probe"""
+        now = time.time()
+        with self._lock:
+            entry = self._load().setdefault(python_path, {})
+            entry["probes"] = self._history(entry, now)
+            self._dirty = True
+
+    @staticmethod
+    def _history(entry: Dict[str, Any], now: float) -> List[float]:
+        # Probes read the interpreter too; on relatime mounts the one that
+        # last moved its atime can be any from the previous day
+        history = entry.get("probes") or [entry.get("probed_at", 0)]
+        return [t for t in history if now - t < PROBE_HISTORY] + [now]
+
+    def flush(self):
+        """Persist pending entries"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.storage.save({"version": CACHE_VERSION, "entries": self._entries})
+            self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            data = self.storage.load() or {}
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+            else:
+                self._entries = {}
+        return self._entries
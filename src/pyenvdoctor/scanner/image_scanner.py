@@ -0,0 +1,348 @@
+import io
+import json
+import os
+import posixpath
+import tarfile
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..core.models import Issue, PythonInstallation
+from .inventory import canonicalize_name, read_site_packages
+from .static_probe import (INTERPRETER_NAME, LIBPYTHON, MAX_BINARY_SIZE, STDLIB_DIR, StaticFS,
+                           find_interpreters, static_installation)
+from .venv_discovery import base_interpreter, parse_pyvenv_cfg, venv_version
+
+WHITEOUT_PREFIX = ".wh."
+OPAQUE_WHITEOUT = ".wh..wh..opq"
+
+# Outer members up to this size are buffered so JSON manifests and small
+# layers can be told apart without seeking
+SMALL_MEMBER = 1024 * 1024
+
+class Node:
+    """A file, directory or symlink in the merged image tree"""
+
+    __slots__ = ("kind", "size", "target", "data", "layer", "children")
+
+    def __init__(self, kind: str, layer: int, size: int = 0, target: Optional[str] = None,
+                 data: Optional[bytes] = None):
+        self.kind = kind  # "file", "dir" or "link"
+        self.layer = layer
+        self.size = size
+        self.target = target
+        self.data = data
+        self.children: Optional[Dict[str, "Node"]] = {} if kind == "dir" else None
+
+def _normalize(name: str) -> str:
+    return "/" + posixpath.normpath("/" + name).lstrip("/")
+
+def is_interesting(path: str) -> bool:
+    """Files whose content static identification and the inventory need"""
+    directory, name = posixpath.split(path)
+    parent = posixpath.basename(directory)
+    if parent == "bin" and INTERPRETER_NAME.match(name):
+        return True
+    if LIBPYTHON.match(name) or name == "pyvenv.cfg":
+        return True
+    if name == "patchlevel.h" and parent.startswith("python"):
+        return True
+    if name.startswith("_sysconfigdata") and name.endswith(".py") and STDLIB_DIR.match(parent):
+        return True
+    if name == "METADATA" and parent.endswith(".dist-info"):
+        return True
+    if name == "requires.txt" and parent.endswith(".egg-info"):
+        return True
+    return (name == "PKG-INFO" and parent.endswith(".egg-info")) or name.endswith(".egg-info")
+
+def _metadata_only(data: bytes) -> bytes:
+    # Only the header block of METADATA / PKG-INFO is ever read
+    end = data.find(b"\n\n")
+    return data if end < 0 else data[:end + 1]
+
+class LayerEntry(NamedTuple):
+    member: tarfile.TarInfo
+    data: Optional[bytes]  # only for interesting files
+
+def read_layer(layer: tarfile.TarFile) -> List[LayerEntry]:
+    """Record a layer's entries, keeping the content of interesting files only"""
+    entries = []
+    for member in layer:
+        data = None
+        if member.isfile() and member.size <= MAX_BINARY_SIZE and is_interesting(_normalize(member.name)):
+            data = layer.extractfile(member).read()
+            name = posixpath.basename(member.name)
+            if name in ("METADATA", "PKG-INFO") or name.endswith(".egg-info"):
+                data = _metadata_only(data)
+        entries.append(LayerEntry(member, data))
+    return entries
+
+class ImageFS(StaticFS):
+    """Merged view of an image's layers, held in memory.
+
+    Only metadata is kept for most entries; file contents are retained for
+    the few files `is_interesting` selects.
+    """
+
+    def __init__(self):
+        self.tree = Node("dir", -1)
+
+    def apply_layer(self, entries: Iterable[LayerEntry], index: int):
+        """Merge one layer on top of the tree, honouring whiteouts"""
+        for member, data in entries:
+            path = _normalize(member.name)
+            directory, name = posixpath.split(path)
+            if name == OPAQUE_WHITEOUT:
+                # Hide everything lower layers put in this directory
+                parent = self._directory(directory, index)
+                for child in [c for c, node in parent.children.items() if node.layer < index]:
+                    del parent.children[child]
+                continue
+            if name.startswith(WHITEOUT_PREFIX):
+                parent = self._lookup(directory)
+                hidden = name[len(WHITEOUT_PREFIX):]
+                if parent is not None and parent.children is not None and hidden in parent.children:
+                    if parent.children[hidden].layer < index:
+                        del parent.children[hidden]
+                continue
+            if path == "/":
+                continue
+
+            if member.isdir():
+                existing = self._lookup(path)
+                if existing is not None and existing.kind == "dir":
+                    continue
+                node = Node("dir", index)
+            elif member.issym():
+                node = Node("link", index, target=member.linkname)
+            elif member.islnk():
+                source = self._lookup(_normalize(member.linkname))
+                if source is None or source.kind != "file":
+                    continue
+                node = Node("file", index, size=source.size, data=source.data)
+            elif member.isfile():
+                node = Node("file", index, size=member.size, data=data)
+            else:
+                continue  # devices and fifos
+            self._directory(directory, index).children[name] = node
+
+    def _directory(self, path: str, layer: int) -> Node:
+        node = self.tree
+        for part in [part for part in path.split("/") if part]:
+            child = node.children.get(part)
+            if child is None or child.kind != "dir":
+                child = node.children[part] = Node("dir", layer)
+            node = child
+        return node
+
+    def _lookup(self, path: str) -> Optional[Node]:
+        node = self.tree
+        for part in [part for part in path.split("/") if part]:
+            if node.children is None:
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _find(self, path: str) -> Optional[Node]:
+        resolved = self.resolve(path)
+        return self._lookup(resolved) if resolved is not None else None
+
+    def readlink(self, path: str) -> Optional[str]:
+        node = self._lookup(path)
+        return node.target if node is not None and node.kind == "link" else None
+
+    def listdir(self, path: str) -> List[str]:
+        node = self._find(path)
+        return list(node.children) if node is not None and node.children is not None else []
+
+    def isdir(self, path: str) -> bool:
+        node = self._find(path)
+        return node is not None and node.kind == "dir"
+
+    def isfile(self, path: str) -> bool:
+        node = self._find(path)
+        return node is not None and node.kind == "file"
+
+    def size(self, path: str) -> Optional[int]:
+        node = self._find(path)
+        return node.size if node is not None else None
+
+    def read(self, path: str, limit: Optional[int] = None, offset: int = 0) -> Optional[bytes]:
+        node = self._find(path)
+        if node is None or node.data is None:
+            return None
+        return node.data[offset:] if limit is None else node.data[offset:offset + limit]
+
+    def walk_files(self, name: str) -> Iterator[str]:
+        """Paths of every file called name"""
+        stack = [("/", self.tree)]
+        while stack:
+            path, node = stack.pop()
+            for child_name, child in node.children.items():
+                child_path = posixpath.join(path, child_name)
+                if child.kind == "dir":
+                    stack.append((child_path, child))
+                elif child_name == name and child.kind == "file":
+                    yield child_path
+
+class _ChunkReader(io.RawIOBase):
+    """File object over an iterator of byte chunks (e.g. the docker SDK's image.save())"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+def open_image(image: str) -> BinaryIO:
+    """A `docker save` / OCI archive file, or the image of that name from the local docker daemon"""
+    if os.path.exists(image):
+        return open(image, "rb")
+    try:
+        import docker
+    except ImportError:
+        raise FileNotFoundError(f"{image}: no such file (install the docker package to read images by name)")
+    return io.BufferedReader(_ChunkReader(docker.from_env().images.get(image).save()))
+
+def _layer_order(metadata: Dict[str, Any]) -> List[str]:
+    """Archive member names of the layers, bottom first"""
+    manifest = metadata.get("manifest.json")
+    if isinstance(manifest, list) and manifest:
+        return list(manifest[0].get("Layers", []))
+    index = metadata.get("index.json")
+    while isinstance(index, dict) and index.get("manifests"):
+        digest = index["manifests"][0]["digest"]
+        index = metadata.get("blobs/" + digest.replace(":", "/"))
+    if isinstance(index, dict):
+        return ["blobs/" + layer["digest"].replace(":", "/") for layer in index.get("layers", [])]
+    return []
+
+class ImageScanner:
+    """Find Python installations inside a container image archive without extracting it.
+
+    The archive is read once, front to back. Each layer is streamed with
+    tarfile as soon as it is reached and recorded on its own; layers are
+    merged in manifest order (applying whiteouts) once the manifest has
+    been seen, since `docker save` writes it last.
+    """
+
+    def __init__(self, image: str):
+        self.image = image
+        self.issues: List[Issue] = []
+        self.installations: List[PythonInstallation] = []
+
+    def scan(self, packages: bool = True) -> List[Issue]:
+        self.installations = [record for kind, record in self.iter_scan(packages) if kind == "installation"]
+        return self.issues
+
+    def iter_scan(self, packages: bool = True) -> Iterator[Tuple[str, Any]]:
+        """Yield ("installation", ...) and ("issue", ...) records for the image"""
+        self.issues = []
+        fs = self.load()
+        if fs is not None:
+            for path in find_interpreters(fs):
+                installation = static_installation(fs, path)
+                if not installation.is_valid:
+                    self._issue(f"Could not identify interpreter {path}", "invalid_installation", "low",
+                                {"path": path})
+                yield "installation", self._with_packages(fs, installation, packages)
+            for venv in self._venvs(fs):
+                yield "installation", self._with_packages(fs, venv, packages)
+        for issue in self.issues:
+            yield "issue", issue
+
+    def get_installations(self) -> List[PythonInstallation]:
+        return self.installations
+
+    def load(self) -> Optional[ImageFS]:
+        """Stream the archive and merge its layers"""
+        metadata: Dict[str, Any] = {}
+        layers: Dict[str, List[LayerEntry]] = {}
+        try:
+            with open_image(self.image) as stream, tarfile.open(fileobj=stream, mode="r|*") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    name = posixpath.normpath(member.name)
+                    fileobj = archive.extractfile(member)
+                    if member.size <= SMALL_MEMBER:
+                        data = fileobj.read()
+                        try:
+                            metadata[name] = json.loads(data)
+                            continue
+                        except ValueError:
+                            fileobj = io.BytesIO(data)
+                    layer = self._read_layer(name, fileobj)
+                    if layer is not None:
+                        layers[name] = layer
+        except (OSError, tarfile.TarError) as e:
+            self._issue(f"Cannot read image {self.image}: {e}", "image_error", "high", {"image": self.image})
+            return None
+
+        order = _layer_order(metadata)
+        if not order:
+            self._issue(f"No manifest found in {self.image}", "image_error", "high", {"image": self.image})
+            return None
+        return self._merge([layers[name] for name in order if name in layers])
+
+    def _read_layer(self, name: str, fileobj: BinaryIO) -> Optional[List[LayerEntry]]:
+        try:
+            with tarfile.open(fileobj=fileobj, mode="r|*") as layer:
+                return read_layer(layer)
+        except (tarfile.TarError, OSError, EOFError) as e:
+            self._issue(f"Cannot read layer {name}: {e}", "image_error", "medium", {"layer": name})
+            return None
+
+    @staticmethod
+    def _merge(layers: List[List[LayerEntry]]) -> ImageFS:
+        fs = ImageFS()
+        for index, entries in enumerate(layers):
+            fs.apply_layer(entries, index)
+        return fs
+
+    def _venvs(self, fs: ImageFS) -> Iterator[PythonInstallation]:
+        for cfg_path in sorted(fs.walk_files("pyvenv.cfg")):
+            venv_dir = posixpath.dirname(cfg_path)
+            cfg = parse_pyvenv_cfg((fs.read(cfg_path) or b"").decode("utf-8", "replace").splitlines())
+            python_path = posixpath.join(venv_dir, "bin", "python")
+            home = cfg.get("home")
+            base = base_interpreter(cfg, fs.isfile)
+            lib_dir = posixpath.join(venv_dir, "lib")
+            site_packages = sorted(posixpath.join(lib_dir, name, "site-packages") for name in fs.listdir(lib_dir)
+                                   if fs.isdir(posixpath.join(lib_dir, name, "site-packages")))
+            yield PythonInstallation(
+                path=python_path,
+                version=venv_version(cfg) or "Unknown",
+                provider="virtualenv",
+                is_valid=fs.isfile(python_path) and base is not None,
+                prefix=venv_dir,
+                base_prefix=posixpath.dirname(home) if home else None,
+                site_packages=site_packages,
+                base_interpreter=base
+            )
+
+    @staticmethod
+    def _with_packages(fs: ImageFS, installation: PythonInstallation, packages: bool) -> PythonInstallation:
+        if not packages:
+            return installation
+        found = {}
+        for directory in installation.site_packages:
+            for dist in read_site_packages(directory, fs):
+                found.setdefault(canonicalize_name(dist.name), dist.version)
+        installation.packages = found
+        return installation
+
+    def _issue(self, description: str, type: str, severity: str, details: Dict[str, Any]):
+        self.issues.append(Issue(description=description, type=type, severity=severity, details=details))
@@ -0,0 +1,146 @@
+import json
+from typing import Any, Dict, Optional
+
+# Executed inside the probed interpreter. It must stay compatible with every
+# Python we may find (2.7 included) and only touch the standard library.
+PROBE_SCRIPT = r'''
+import sys
+sys.path = [p for p in sys.path if p not in ("", ".")]
+import json, os, platform, sysconfig
+
+def marker_environment():
+    # PEP 508 marker variables, computed as packaging's default_environment does
+    implementation = getattr(sys, "implementation", None)
+    if implementation is not None:
+        info = implementation.version
+        implementation_version = "%d.%d.%d" % tuple(info[:3])
+        if info.releaselevel != "final":
+            implementation_version += info.releaselevel[0] + str(info.serial)
+        implementation_name = implementation.name
+    else:
+        implementation_version, implementation_name = "0", ""
+    return {
+        "implementation_name": implementation_name,
+        "implementation_version": implementation_version,
+        "os_name": os.name,
+        "platform_machine": platform.machine(),
+        "platform_release": platform.release(),
+        "platform_system": platform.system(),
+        "platform_version": platform.version(),
+        "python_full_version": platform.python_version(),
+        "platform_python_implementation": platform.python_implementation(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    }
+
+def venv_config():
+    # -S keeps site.venv() from running, so sys.prefix is the base
+    # installation's; find pyvenv.cfg the same way site.venv() does
+    exe_dir = os.path.dirname(os.path.abspath(sys.executable))
+    prefix = os.path.dirname(exe_dir)
+    for directory in (exe_dir, prefix):
+        path = os.path.join(directory, "pyvenv.cfg")
+        if os.path.isfile(path):
+            break
+    else:
+        return None, False
+    include_system = False
+    try:
+        with open(path) as f:
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep and key.strip().lower() == "include-system-site-packages":
+                    include_system = value.strip().lower() == "true"
+    except (IOError, OSError):
+        pass
+    return prefix, include_system
+
+def collect():
+    config_var = sysconfig.get_config_var
+    try:
+        import ssl
+        openssl_version = ssl.OPENSSL_VERSION
+    except Exception:
+        openssl_version = None
+    try:
+        import pyexpat
+        expat_version = pyexpat.EXPAT_VERSION
+    except Exception:
+        expat_version = None
+    try:
+        import sqlite3
+        sqlite_version = sqlite3.sqlite_version
+    except Exception:
+        sqlite_version = None
+    venv_prefix, include_system = venv_config()
+    site_packages = []
+    if venv_prefix:
+        # Distro builds default to schemes (e.g. Debian's posix_local) that
+        # only apply outside venvs
+        schemes = sysconfig.get_scheme_names()
+        scheme = "venv" if "venv" in schemes else ("nt" if os.name == "nt" else "posix_prefix")
+        paths = sysconfig.get_paths(scheme, vars={"base": venv_prefix, "platbase": venv_prefix})
+        site_packages += [paths.get("purelib"), paths.get("platlib")]
+    if not venv_prefix or include_system:
+        paths = sysconfig.get_paths()
+        site_packages += [paths.get("purelib"), paths.get("platlib")]
+        try:
+            # Importing site under -S does not run it; distro builds list extra
+            # directories (e.g. Debian's dist-packages) only here
+            import site
+            site_packages.extend(site.getsitepackages())
+        except Exception:
+            pass
+    site_packages = [p for i, p in enumerate(site_packages) if p and p not in site_packages[:i]]
+    return {
+        "ok": True,
+        "executable": sys.executable,
+        "version": platform.python_version(),
+        "version_info": list(sys.version_info[:3]),
+        "implementation": platform.python_implementation(),
+        "abi": config_var("SOABI") or getattr(sys, "abiflags", "") or None,
+        "prefix": venv_prefix or sys.prefix,
+        "base_prefix": getattr(sys, "base_prefix", getattr(sys, "real_prefix", sys.prefix)),
+        "site_packages": site_packages,
+        "openssl_version": openssl_version,
+        "expat_version": expat_version,
+        "sqlite_version": sqlite_version,
+        "platform": sys.platform,
+        "machine": platform.machine(),
+        "marker_environment": marker_environment(),
+        "build_flags": {
+            "CONFIG_ARGS": config_var("CONFIG_ARGS"),
+            "Py_DEBUG": config_var("Py_DEBUG"),
+            "Py_ENABLE_SHARED": config_var("Py_ENABLE_SHARED"),
+            "Py_GIL_DISABLED": config_var("Py_GIL_DISABLED"),
+            "WITH_PYMALLOC": config_var("WITH_PYMALLOC"),
+            "MULTIARCH": config_var("MULTIARCH"),
+        },
+    }
+
+if __name__ == "__main__":
+    sys.stdout.write(json.dumps(collect()))
+'''
+
+# -E -s -S plus the sys.path filter above is the portable spelling of
+# `-I -S`: Python 2 does not understand -I.
+PROBE_FLAGS = ["-E", "-s", "-S"]
+
+
+def introspect(python_path: str, probe_engine, deadline: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Run the introspection probe in an interpreter and decode its report"""
+    result = probe_engine.run([python_path] + PROBE_FLAGS + ["-c", PROBE_SCRIPT], deadline)
+    if result is None or result.returncode != 0:
+        return None
+    return parse_probe_output(result.stdout)
+
+
+def parse_probe_output(output: str) -> Optional[Dict[str, Any]]:
+    """Decode probe stdout, rejecting anything that is not a live report"""
+    try:
+        data = json.loads(output)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get("ok"):
+        return None
+    return data
@@ -0,0 +1,232 @@
+import csv
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from ..core.config import config
+from ..core.models import PythonInstallation
+from ..utils.storage import Storage
+
+CACHE_VERSION = 2
+
+METADATA_FIELDS = ("name", "version", "requires-dist")
+
+def canonicalize_name(name: str) -> str:
+    """PEP 503 normalized project name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def parse_metadata_headers(lines: Iterable[str], fields: Iterable[str] = ("name", "version")) -> Dict[str, List[str]]:
+    """Selected RFC 822 header fields, stopping at the end of the header block"""
+    wanted = {field.lower() for field in fields}
+    headers: Dict[str, List[str]] = {}
+    for line in lines:
+        if line in ("\n", "\r\n", ""):
+            break
+        if line[0] in " \t":
+            continue  # folded continuation of a header we do not need
+        key, sep, value = line.partition(":")
+        if sep and key.lower() in wanted:
+            headers.setdefault(key.lower(), []).append(value.strip())
+    return headers
+
+def read_metadata_headers(path: str, fields: Iterable[str] = ("name", "version")) -> Dict[str, List[str]]:
+    """Read selected header fields of a METADATA / PKG-INFO file"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return parse_metadata_headers(f, fields)
+    except OSError:
+        return {}
+
+class RecordEntry(NamedTuple):
+    path: str
+    algorithm: Optional[str]
+    digest: Optional[str]
+    size: Optional[int]
+
+@dataclass
+class Distribution:
+    name: str
+    version: str
+    path: str  # the .dist-info / .egg-info entry
+    site_packages: str
+    requires: List[str] = field(default_factory=list)  # Requires-Dist entries
+
+    @property
+    def record_path(self) -> Optional[str]:
+        record = os.path.join(self.path, "RECORD")
+        return record if self.path.endswith(".dist-info") and os.path.exists(record) else None
+
+    def read_record(self) -> Iterator[RecordEntry]:
+        """Entries of the RECORD file, paths resolved against site-packages"""
+        record = self.record_path
+        if not record:
+            return
+        with open(record, newline="", encoding="utf-8", errors="replace") as f:
+            for row in csv.reader(f):
+                if not row or not row[0]:
+                    continue
+                algorithm = digest = None
+                if len(row) > 1 and "=" in row[1]:
+                    algorithm, digest = row[1].split("=", 1)
+                size = int(row[2]) if len(row) > 2 and row[2].isdigit() else None
+                path = os.path.normpath(os.path.join(self.site_packages, row[0]))
+                yield RecordEntry(path, algorithm, digest, size)
+
+class HostFiles:
+    """The host filesystem, through the calls a static_probe.StaticFS also answers"""
+
+    def listdir(self, path: str) -> List[str]:
+        try:
+            return os.listdir(path)
+        except OSError:
+            return []
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def read(self, path: str, limit: Optional[int] = None) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read(-1 if limit is None else limit)
+        except OSError:
+            return None
+
+    def metadata_headers(self, path: str, fields: Iterable[str]) -> Dict[str, List[str]]:
+        return read_metadata_headers(path, fields)
+
+HOST_FILES = HostFiles()
+
+def _metadata_file(site_packages: str, entry: str, files: HostFiles = HOST_FILES) -> Optional[str]:
+    """The METADATA / PKG-INFO file of a site-packages entry, None for other entries"""
+    path = os.path.join(site_packages, entry)
+    if entry.endswith(".dist-info"):
+        return os.path.join(path, "METADATA")
+    if entry.endswith(".egg-info"):
+        # Either a directory holding PKG-INFO or a bare PKG-INFO file
+        return os.path.join(path, "PKG-INFO") if files.isdir(path) else path
+    return None
+
+def read_egg_requires(path: str, files: HostFiles = HOST_FILES) -> List[str]:
+    """requires.txt of an .egg-info directory in Requires-Dist notation"""
+    data = files.read(os.path.join(path, "requires.txt"))
+    if data is None:
+        return []
+    requires = []
+    marker = ""
+    for line in data.decode("utf-8", "replace").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            # [extra], [:marker] or [extra:marker]
+            extra, _, condition = line[1:-1].partition(":")
+            clauses = [f"({condition})" if condition else "", f'extra == "{extra}"' if extra else ""]
+            marker = " and ".join(clause for clause in clauses if clause)
+            continue
+        requires.append(f"{line}; {marker}" if marker else line)
+    return requires
+
+def read_site_packages(site_packages: str, files: HostFiles = HOST_FILES) -> List[Distribution]:
+    """Parse every distribution's metadata in a site-packages directory.
+
+    `files` gives access to another filesystem, such as an image's StaticFS.
+    """
+    distributions = []
+    for entry in sorted(files.listdir(site_packages)):
+        metadata = _metadata_file(site_packages, entry, files)
+        if metadata is None:
+            continue
+        headers = files.metadata_headers(metadata, METADATA_FIELDS)
+        if "name" not in headers:
+            continue
+        path = os.path.join(site_packages, entry)
+        requires = headers.get("requires-dist")
+        if requires is None and entry.endswith(".egg-info") and files.isdir(path):
+            requires = read_egg_requires(path, files)
+        distributions.append(Distribution(
+            name=headers["name"][0],
+            version=headers.get("version", ["0"])[0],
+            path=path,
+            site_packages=site_packages,
+            requires=requires or []
+        ))
+    return distributions
+
+class InventoryReader:
+    """Installed-package inventory read straight from site-packages.
+
+    No interpreter is started. Results are cached on disk per
+    site-packages directory and reused while the directory's mtime is
+    unchanged (installing or removing a distribution always adds or
+    removes a *.dist-info entry).
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, enabled: Optional[bool] = None,
+                 max_workers: Optional[int] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "inventory.json")
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    def inventory(self, installations: List[PythonInstallation], flush: bool = True) -> List[PythonInstallation]:
+        """Fill `packages` on every installation, reading each directory once"""
+        directories = sorted({directory for install in installations for directory in install.site_packages})
+        if directories:
+            workers = max(1, min(self.max_workers, len(directories)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyenvdoctor-inventory") as pool:
+                by_directory = dict(zip(directories, pool.map(self.distributions, directories)))
+        else:
+            by_directory = {}
+        if flush:
+            self.flush()
+
+        for install in installations:
+            packages = {}
+            for directory in install.site_packages:
+                for dist in by_directory.get(directory, []):
+                    packages.setdefault(canonicalize_name(dist.name), dist.version)
+            install.packages = packages
+        return installations
+
+    def distributions(self, site_packages: str) -> List[Distribution]:
+        """Distributions in a site-packages directory, from cache when fresh"""
+        try:
+            mtime = os.stat(site_packages).st_mtime_ns
+        except OSError:
+            return []
+        if self.enabled:
+            with self._lock:
+                cached = self._load().get(site_packages)
+            if cached and cached["mtime"] == mtime:
+                return [Distribution(name, version, os.path.join(site_packages, entry), site_packages, requires)
+                        for name, version, entry, requires in cached["distributions"]]
+
+        distributions = read_site_packages(site_packages)
+        if self.enabled:
+            with self._lock:
+                self._load()[site_packages] = {
+                    "mtime": mtime,
+                    "distributions": [[d.name, d.version, os.path.basename(d.path), d.requires]
+                                      for d in distributions]
+                }
+                self._dirty = True
+        return distributions
+
+    def flush(self):
+        """Persist pending cache entries"""
+        with self._lock:
+            if self._dirty:
+                self.storage.save({"version": CACHE_VERSION, "entries": self._entries})
+                self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            data = self.storage.load() or {}
+            self._entries = data.get("entries", {}) if data.get("version") == CACHE_VERSION else {}
+        return self._entries
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from ..core.config import config
+
+
+class ProbeEngine:
+    """Run interpreter probes concurrently with a bounded worker pool.
+
+    Each probe gets its own deadline; results are returned in the order the
+    items were submitted, regardless of which probe finished first.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_workers = max_workers or config.get("scanner.max_workers") or min(32, (os.cpu_count() or 1) * 4)
+        self.timeout = float(timeout or config.get("scanner.probe_timeout", 5))
+
+    def map(self, func: Callable[[Any, float], Any], items: Iterable[Any],
+            deadline_for: Optional[Callable[[Any], float]] = None) -> List[Any]:
+        """Apply func(item, deadline) to every item, preserving input order"""
+        items = list(items)
+        if not items:
+            return []
+
+        workers = max(1, min(self.max_workers, len(items)))
+        if workers == 1:
+            return [self._call(func, item, deadline_for) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyenvdoctor-probe") as pool:
+            futures = [pool.submit(self._call, func, item, deadline_for) for item in items]
+            return [future.result() for future in futures]
+
+    def imap(self, func: Callable[[Any, float], Any], items: Iterable[Any], ordered: bool = False,
+             deadline_for: Optional[Callable[[Any], float]] = None) -> Iterator[Any]:
+        """Yield func(item, deadline) results as soon as they are available.
+
+        Items are consumed lazily with at most 2 * max_workers probes in
+        flight, so memory stays flat however many items there are. With
+        ordered=True a result is held back only until every earlier item
+        has finished. deadline_for, when given, computes each item's
+        deadline as its probe starts instead of the fixed timeout.
+        """
+        iterator = iter(items)
+        window = max(1, self.max_workers * 2)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyenvdoctor-probe") as pool:
+            in_flight = {}
+            finished = {}
+            next_index = next_yield = 0
+            while True:
+                while len(in_flight) < window:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    in_flight[pool.submit(self._call, func, item, deadline_for)] = next_index
+                    next_index += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    if ordered:
+                        finished[index] = future.result()
+                    else:
+                        yield future.result()
+                while ordered and next_yield in finished:
+                    yield finished.pop(next_yield)
+                    next_yield += 1
+
+    def run(self, command: List[str], deadline: Optional[float] = None) -> Optional[subprocess.CompletedProcess]:
+        """Run a command, killing it if it outlives the probe deadline"""
+        remaining = self.remaining(deadline)
+        if remaining <= 0:
+            return None
+        try:
+            return subprocess.run(command, capture_output=True, text=True, timeout=remaining)
+        except (subprocess.SubprocessError, OSError):
+            return None
+
+    def remaining(self, deadline: Optional[float]) -> float:
+        """Seconds left before a probe deadline"""
+        if deadline is None:
+            return self.timeout
+        return deadline - time.monotonic()
+
+    def _call(self, func: Callable[[Any, float], Any], item: Any,
+              deadline_for: Optional[Callable[[Any], float]] = None) -> Any:
+        deadline = deadline_for(item) if deadline_for else time.monotonic() + self.timeout
+        return func(item, deadline)
@@ -0,0 +1,177 @@
+import glob
+import os
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.config import config
+from .base_scanner import BaseScanner, InstallationCandidate
+
+def _existing(paths) -> List[str]:
+    return [str(path) for path in paths if Path(path).exists()]
+
+class SystemPythonScanner(BaseScanner):
+    """Interpreters shipped by the OS"""
+
+    name = "system"
+    system_paths = [
+        '/usr/bin/python3',
+        '/usr/local/bin/python3',
+        '/opt/homebrew/bin/python3',
+        '/bin/python3'
+    ]
+
+    def scan(self) -> List[InstallationCandidate]:
+        self.found_installations = [
+            InstallationCandidate(path, self.name) for path in _existing(self.system_paths)
+        ]
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return sorted({os.path.dirname(path) for path in _existing(self.system_paths)})
+
+class AsdfScanner(BaseScanner):
+    """Versions installed by the asdf python plugin"""
+
+    name = "asdf"
+
+    def __init__(self):
+        super().__init__()
+        self.data_dir = Path(os.environ.get('ASDF_DATA_DIR', os.path.expanduser('~/.asdf')))
+
+    def scan(self) -> List[InstallationCandidate]:
+        installs_dir = self.data_dir / 'installs' / 'python'
+        self.found_installations = []
+        if installs_dir.is_dir():
+            for version_dir in sorted(installs_dir.iterdir()):
+                python_path = version_dir / 'bin' / 'python'
+                if python_path.exists():
+                    self.found_installations.append(
+                        InstallationCandidate(str(python_path), self.name, version_dir.name))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return [str(self.data_dir / 'installs' / 'python')]
+
+class UvScanner(BaseScanner):
+    """Managed interpreters installed by `uv python install`"""
+
+    name = "uv"
+    _dir_pattern = re.compile(r"^[a-z]+-(\d+\.\d+\.\d+[a-z0-9]*)")
+
+    def __init__(self):
+        super().__init__()
+        data_home = os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share'))
+        self.install_dir = Path(os.environ.get('UV_PYTHON_INSTALL_DIR', os.path.join(data_home, 'uv', 'python')))
+
+    def scan(self) -> List[InstallationCandidate]:
+        self.found_installations = []
+        if self.install_dir.is_dir():
+            for install in sorted(self.install_dir.iterdir()):
+                python_path = install / 'bin' / 'python3'
+                if install.is_dir() and python_path.exists():
+                    match = self._dir_pattern.match(install.name)
+                    self.found_installations.append(InstallationCandidate(
+                        str(python_path), self.name, match.group(1) if match else None))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return [str(self.install_dir)]
+
+class CondaScanner(BaseScanner):
+    """Conda/mamba base installs and their named environments"""
+
+    name = "conda"
+    timeout = 30.0  # conda trees often live on slow shared storage
+    base_dirs = ['~/miniconda3', '~/anaconda3', '~/miniforge3', '~/mambaforge', '/opt/conda']
+
+    def scan(self) -> List[InstallationCandidate]:
+        prefixes = []
+        for base in self._base_prefixes():
+            prefixes.append(base)
+            envs_dir = base / 'envs'
+            if envs_dir.is_dir():
+                prefixes.extend(sorted(envs_dir.iterdir()))
+        prefixes.extend(self._registered_environments())
+
+        self.found_installations = []
+        seen = set()
+        for prefix in prefixes:
+            python_path = prefix / 'bin' / 'python'
+            if str(prefix) not in seen and python_path.exists():
+                seen.add(str(prefix))
+                self.found_installations.append(InstallationCandidate(str(python_path), self.name))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return [str(base / 'envs') for base in self._base_prefixes()]
+
+    def _base_prefixes(self) -> List[Path]:
+        candidates = [os.path.expanduser(base) for base in self.base_dirs]
+        conda_exe = os.environ.get('CONDA_EXE')
+        if conda_exe:
+            candidates.insert(0, os.path.dirname(os.path.dirname(conda_exe)))
+        bases = []
+        for candidate in candidates:
+            path = Path(candidate)
+            if (path / 'conda-meta').is_dir() and path not in bases:
+                bases.append(path)
+        return bases
+
+    @staticmethod
+    def _registered_environments() -> List[Path]:
+        registry = Path.home() / '.conda' / 'environments.txt'
+        try:
+            lines = registry.read_text().splitlines()
+        except OSError:
+            return []
+        return [Path(line.strip()) for line in lines if line.strip()]
+
+class HomebrewScanner(BaseScanner):
+    """Formula-managed interpreters under a Homebrew prefix"""
+
+    name = "homebrew"
+    prefixes = ['/opt/homebrew', '/usr/local', '/home/linuxbrew/.linuxbrew']
+
+    def scan(self) -> List[InstallationCandidate]:
+        self.found_installations = []
+        for prefix in self.prefixes:
+            for python_path in sorted(glob.glob(os.path.join(prefix, 'opt', 'python@*', 'bin', 'python3'))):
+                version = python_path.split('python@', 1)[1].split(os.sep, 1)[0]
+                self.found_installations.append(InstallationCandidate(python_path, self.name, version))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return [os.path.join(prefix, 'opt') for prefix in self.prefixes]
+
+class VirtualenvScanner(BaseScanner):
+    """Virtualenvs directly under the registered venv roots and $WORKON_HOME"""
+
+    name = "virtualenv"
+
+    def __init__(self, roots: Optional[List[str]] = None):
+        super().__init__()
+        if roots is None:
+            workon_home = os.environ.get('WORKON_HOME', os.path.expanduser('~/.virtualenvs'))
+            roots = list(config.get("environment.venv_roots") or []) + [workon_home]
+        self.roots = [os.path.expanduser(root) for root in roots]
+
+    def scan(self) -> List[InstallationCandidate]:
+        venv_dirs = []
+        active = os.environ.get('VIRTUAL_ENV')
+        if active:
+            venv_dirs.append(Path(active))
+        for root in self.roots:
+            root_path = Path(root)
+            if root_path.is_dir():
+                venv_dirs.extend(sorted(root_path.iterdir()))
+
+        self.found_installations = []
+        for venv_dir in venv_dirs:
+            python_path = venv_dir / 'bin' / 'python'
+            if (venv_dir / 'pyvenv.cfg').exists() and python_path.exists():
+                self.found_installations.append(InstallationCandidate(str(python_path), self.name))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return list(self.roots)
@@ -1,5 +1,29 @@
-# src/pyenvdoctor/scanner/pyenv_scanner.py
+import os
+from pathlib import Path
+from typing import List
+
+from .base_scanner import BaseScanner, InstallationCandidate
+
 class PyenvScanner(BaseScanner):
-    def scan(self):
-        pyenv_root = Path.home() / ".pyenv/versions"
-        # Implémentation...
\ No newline at end of file
+    name = "pyenv"
+
+    def __init__(self, pyenv_root=None):
+        super().__init__()
+        self.pyenv_root = Path(pyenv_root or os.environ.get('PYENV_ROOT', os.path.expanduser('~/.pyenv')))
+
+    def scan(self) -> List[InstallationCandidate]:
+        """Find interpreters under $PYENV_ROOT/versions"""
+        versions_dir = self.pyenv_root / 'versions'
+        self.found_installations = []
+        
+        if versions_dir.exists():
+            for version_dir in sorted(versions_dir.iterdir()):
+                if version_dir.is_dir():
+                    python_path = version_dir / 'bin' / 'python'
+                    if python_path.exists():
+                        self.found_installations.append(
+                            InstallationCandidate(str(python_path), self.name, version_dir.name))
+        return self.found_installations
+
+    def watch_roots(self) -> List[str]:
+        return [str(self.pyenv_root / 'versions')]
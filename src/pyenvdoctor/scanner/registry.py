@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import config
+from ..utils.logging import get_logger
+from ..utils.plugins import load_entry_points
+from .base_scanner import BaseScanner, InstallationCandidate
+from .providers import (
+    AsdfScanner, CondaScanner, HomebrewScanner, SystemPythonScanner, UvScanner, VirtualenvScanner
+)
+from .pyenv_scanner import PyenvScanner
+
+ENTRY_POINT_GROUP = "pyenvdoctor.providers"
+
+# Registration order is also the precedence used when two providers find
+# the same interpreter: the more specific manager wins over "system".
+BUILTIN_PROVIDERS = [
+    PyenvScanner,
+    AsdfScanner,
+    UvScanner,
+    CondaScanner,
+    HomebrewScanner,
+    VirtualenvScanner,
+    SystemPythonScanner,
+]
+
+def _entry_point_providers() -> List[type]:
+    """Provider classes published by other packages under ENTRY_POINT_GROUP"""
+    return load_entry_points(ENTRY_POINT_GROUP)
+
+def _dedup_key(python_path: str) -> str:
+    """Real path identifying an interpreter across providers.
+
+    A venv's bin/python is a symlink to its base interpreter, so venvs are
+    identified by their own real directory instead.
+    """
+    venv_dir = os.path.dirname(os.path.dirname(python_path))
+    if os.path.exists(os.path.join(venv_dir, 'pyvenv.cfg')):
+        return os.path.join(os.path.realpath(venv_dir), 'pyvenv.cfg')
+    return os.path.realpath(python_path)
+
+class ProviderRegistry:
+    """Runs installation providers concurrently and merges their findings"""
+
+    def __init__(self, providers: Optional[List[BaseScanner]] = None, load_entry_points: bool = True):
+        # Plugins that could not be instantiated, reported with every discovery
+        self.load_errors: Dict[str, str] = {}
+        if providers is None:
+            providers = [cls() for cls in BUILTIN_PROVIDERS]
+            if load_entry_points:
+                providers.extend(self._instantiate(_entry_point_providers()))
+        self.providers: List[BaseScanner] = list(providers)
+        self.default_timeout = float(config.get("scanner.provider_timeout", 10))
+        self.timings: Dict[str, Dict] = {}
+
+    def _instantiate(self, classes: List[type]) -> List[BaseScanner]:
+        providers = []
+        for cls in classes:
+            try:
+                providers.append(cls())
+            except Exception as e:
+                name = getattr(cls, "name", None) or getattr(cls, "__name__", repr(cls))
+                get_logger(__name__).warning(f"Could not start provider plugin {name}: {e}")
+                self.load_errors[name] = str(e)
+        return providers
+
+    def register(self, provider: BaseScanner):
+        """Add a provider; later registrations lose ties on duplicate paths"""
+        self.providers.append(provider)
+
+    def discover(self, deadline: Optional[float] = None) -> List[InstallationCandidate]:
+        """Run every provider and return candidates deduplicated by real path.
+
+        deadline (time.monotonic()) caps every provider's own timeout.
+        """
+        self.timings = {name: {"status": "error", "error": error, "count": 0, "duration_ms": 0.0}
+                        for name, error in self.load_errors.items()}
+        per_provider = self._run_providers(deadline)
+        candidates = []
+        seen = set()
+        for index in range(len(self.providers)):
+            for candidate in per_provider.get(index, []):
+                key = _dedup_key(candidate.path)
+                if key not in seen:
+                    seen.add(key)
+                    candidates.append(candidate)
+        return candidates
+
+    def watch_roots(self) -> List[str]:
+        roots = []
+        for provider in self.providers:
+            roots.extend(root for root in provider.watch_roots() if root not in roots)
+        return roots
+
+    def _run_providers(self, deadline: Optional[float] = None) -> Dict[int, List[InstallationCandidate]]:
+        if not self.providers:
+            return {}
+        results = {}
+        outcomes: Dict[int, Tuple[Any, float]] = {}
+        started = time.monotonic()
+        # Daemon threads rather than a pool: a provider that blows its budget
+        # is abandoned and cannot hold up interpreter exit
+        threads = [threading.Thread(target=self._timed_scan, args=(provider, index, outcomes), daemon=True,
+                                    name=f"pyenvdoctor-provider-{provider.name}")
+                   for index, provider in enumerate(self.providers)]
+        for thread in threads:
+            thread.start()
+        for index, (provider, thread) in enumerate(zip(self.providers, threads)):
+            timeout = provider.timeout if provider.timeout is not None else self.default_timeout
+            if deadline is not None:
+                timeout = max(0.0, min(timeout, deadline - started))
+            thread.join(max(0.0, started + timeout - time.monotonic()))
+            if index not in outcomes:
+                self.timings[provider.name] = {"status": "timeout", "duration_ms": round(timeout * 1000, 1),
+                                               "count": 0}
+                continue
+            found, duration = outcomes[index]
+            if isinstance(found, Exception):
+                self.timings[provider.name] = {"status": "error", "error": str(found), "count": 0,
+                                               "duration_ms": round(duration * 1000, 1)}
+                continue
+            results[index] = found
+            self.timings[provider.name] = {"status": "ok", "duration_ms": round(duration * 1000, 1),
+                                           "count": len(found)}
+        return results
+
+    @staticmethod
+    def _timed_scan(provider: BaseScanner, index: int, outcomes: Dict[int, Tuple[Any, float]]):
+        start = time.monotonic()
+        try:
+            found: Any = list(provider.scan())
+        except Exception as e:
+            found = e
+        outcomes[index] = (found, time.monotonic() - start)
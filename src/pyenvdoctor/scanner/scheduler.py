@@ -0,0 +1,153 @@
+import math
+import statistics
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..core.config import config, parse_duration
+from ..utils.storage import Storage
+
+CACHE_VERSION = 1
+
+class ProbeTimes:
+    """Typical probe duration per interpreter, learned across runs.
+
+    Durations are smoothed with an exponentially weighted moving average
+    and stored in ~/.pyenvdoctor/cache/probe_times.json.
+    """
+
+    def __init__(self, path: Optional[Path] = None, alpha: float = 0.3, enabled: Optional[bool] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.alpha = alpha
+        self.storage = Storage(path or Path.home() / ".pyenvdoctor" / "cache" / "probe_times.json")
+        self._lock = threading.Lock()
+        self._times: Optional[Dict[str, float]] = None
+        self._dirty = False
+
+    def expected(self, key: str) -> Optional[float]:
+        with self._lock:
+            return self._load().get(key)
+
+    def known(self) -> List[float]:
+        with self._lock:
+            return list(self._load().values())
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            times = self._load()
+            previous = times.get(key)
+            times[key] = seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+            self._dirty = True
+
+    def record_timeout(self, key: str, seconds: float):
+        """A probe was cut off after `seconds`: it needs at least that, so back off"""
+        if seconds <= 0:
+            return  # never ran
+        with self._lock:
+            times = self._load()
+            times[key] = max(seconds, 2 * times.get(key, 0.0))
+            self._dirty = True
+
+    def flush(self):
+        """Persist learned durations"""
+        with self._lock:
+            if self._dirty and self.enabled:
+                self.storage.save({"version": CACHE_VERSION, "times": self._times})
+            self._dirty = False
+
+    def _load(self) -> Dict[str, float]:
+        if self._times is None:
+            data = (self.storage.load() or {}) if self.enabled else {}
+            self._times = data.get("times", {}) if data.get("version") == CACHE_VERSION else {}
+        return self._times
+
+class DeadlineScheduler:
+    """Share a scan's time budget between interpreter probes.
+
+    Probes are ordered cheapest first by their learned duration. Each one
+    gets an adaptive timeout (a multiple of its usual duration, or
+    scanner.probe_timeout when it has never been timed), cut down to its
+    fair share of what is left of the budget: the remaining time divided
+    by the number of rounds the pending probes still need on the pool.
+    Without a budget the adaptive timeout only ever extends
+    scanner.probe_timeout. A probe that times out doubles its learned
+    duration, so a slow run does not keep failing at the same timeout.
+    """
+
+    def __init__(self, budget: Optional[float] = None, max_workers: int = 1, times: Optional[ProbeTimes] = None,
+                 default_timeout: Optional[float] = None, margin: float = 3.0, min_timeout: float = 0.5,
+                 max_timeout: Optional[float] = None):
+        if budget is None:
+            budget = parse_duration(config.get("scanner.scan_deadline", 0)) or None
+        self.budget = budget
+        self.max_workers = max(1, max_workers)
+        self.times = times if times is not None else ProbeTimes()
+        self.default_timeout = float(default_timeout or config.get("scanner.probe_timeout", 5))
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.max_timeout = float(max_timeout or config.get("scanner.max_probe_timeout", 30))
+        self.deadline: Optional[float] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the budget clock"""
+        self.deadline = time.monotonic() + self.budget if self.budget else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the budget, or None when the scan is unbounded"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def order(self, items: Iterable[Any], key: Callable[[Any], str] = lambda item: item[0]) -> List[Any]:
+        """Sort items cheapest first; never-timed items count as the median known cost"""
+        items = list(items)
+        known = self.times.known()
+        default = statistics.median(known) if known else self.default_timeout
+        with self._lock:
+            self._pending += len(items)
+        return sorted(items, key=lambda item: self._cost(key(item), default))
+
+    def deadline_for(self, item: Any, key: Callable[[Any], str] = lambda item: item[0]) -> float:
+        """Absolute monotonic deadline for a probe that is starting now"""
+        now = time.monotonic()
+        with self._lock:
+            pending = max(1, self._pending)
+            self._pending = max(0, self._pending - 1)
+
+        expected = self.times.expected(key(item))
+        if expected is None:
+            timeout = self.default_timeout
+        else:
+            timeout = min(self.max_timeout, max(self.min_timeout, expected * self.margin))
+
+        if self.deadline is None:
+            # Nothing to share: a warm estimate must not fail a probe that
+            # would have finished within the configured timeout
+            timeout = max(timeout, self.default_timeout)
+        else:
+            remaining = self.deadline - now
+            share = remaining / math.ceil(pending / self.max_workers)
+            # A probe known to need more than its share may borrow from the
+            # rest of the budget, but never past the global deadline
+            timeout = min(timeout, max(share, expected or 0.0), remaining)
+        return now + max(0.0, timeout)
+
+    def record(self, key: str, seconds: float):
+        self.times.record(key, seconds)
+
+    def record_timeout(self, key: str, seconds: float):
+        self.times.record_timeout(key, seconds)
+
+    def flush(self):
+        self.times.flush()
+
+    def _cost(self, key: str, default: float) -> float:
+        expected = self.times.expected(key)
+        return default if expected is None else expected
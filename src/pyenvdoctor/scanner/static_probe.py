@@ -0,0 +1,519 @@
+import ast
+import fnmatch
+import os
+import posixpath
+import re
+import struct
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.models import PythonInstallation
+from .cache import ProbeCache
+from .inventory import parse_metadata_headers
+from .venv_discovery import VenvDiscovery
+
+# Static identification never executes the interpreter: everything is read
+# from the files an installation leaves behind, so it works on mounted
+# images, chroots and foreign architectures alike.
+
+ELF_MACHINES = {
+    3: "i686", 8: "mips", 20: "ppc", 21: "ppc64", 22: "s390x",
+    40: "arm", 62: "x86_64", 183: "aarch64", 243: "riscv64"
+}
+
+INTERPRETER_NAME = re.compile(r"^(python|pypy)(\d+(\.\d+)?t?)?$")
+STDLIB_DIR = re.compile(r"^(python|pypy)(\d+)\.(\d+)(t?)$")
+LIBPYTHON = re.compile(r"^libpython(\d+)\.(\d+)([a-z]*)\.so")
+VERSIONED_NAME = re.compile(r"^(?:python|pypy)(\d+)\.(\d+)(t?)$")
+PY_VERSION = re.compile(r'#define\s+PY_VERSION\s+"([^"]+)"')
+SYSCONFIGDATA = re.compile(r"^_sysconfigdata_(?P<abiflags>[a-z]*)_(?P<platform>[^_]+)_(?P<multiarch>.+)\.py$")
+
+# Where interpreters live in a root filesystem; `*` matches one path component
+INTERPRETER_DIRS = [
+    "/usr/bin", "/usr/local/bin", "/bin", "/opt/*/bin",
+    "/root/.pyenv/versions/*/bin", "/home/*/.pyenv/versions/*/bin",
+    "/root/.local/share/uv/python/*/bin", "/home/*/.local/share/uv/python/*/bin",
+    "/usr/local/python*/bin", "/root/miniconda*/bin", "/root/anaconda*/bin",
+    "/home/*/miniconda*/bin", "/home/*/anaconda*/bin"
+]
+
+BUILD_FLAG_VARS = ("CONFIG_ARGS", "Py_DEBUG", "Py_ENABLE_SHARED", "Py_GIL_DISABLED", "WITH_PYMALLOC", "MULTIARCH")
+
+# Large enough for statically linked interpreters (conda's is ~35 MB)
+MAX_BINARY_SIZE = 128 * 1024 * 1024
+
+def parse_elf(data: bytes) -> Optional[Dict[str, Any]]:
+    """Machine, interpreter and DT_NEEDED/DT_SONAME entries of an ELF image"""
+    return read_elf(lambda offset, size: data[offset:offset + size])
+
+def read_elf(read_at: Callable[[int, int], bytes]) -> Optional[Dict[str, Any]]:
+    """parse_elf over `read_at(offset, size)`, reading only the headers, dynamic section and strings"""
+    header = read_at(0, 64)
+    if len(header) < 52 or header[:4] != b"\x7fELF":
+        return None
+    is64 = header[4] == 2
+    endian = "<" if header[5] == 1 else ">"
+    info: Dict[str, Any] = {"bits": 64 if is64 else 32, "endian": "little" if endian == "<" else "big",
+                            "machine": None, "interpreter": None, "needed": [], "soname": None}
+    try:
+        (e_machine,) = struct.unpack_from(endian + "H", header, 18)
+        info["machine"] = ELF_MACHINES.get(e_machine, str(e_machine))
+        if is64:
+            (phoff,) = struct.unpack_from(endian + "Q", header, 32)
+            phentsize, phnum = struct.unpack_from(endian + "HH", header, 54)
+        else:
+            (phoff,) = struct.unpack_from(endian + "I", header, 28)
+            phentsize, phnum = struct.unpack_from(endian + "HH", header, 42)
+
+        table = read_at(phoff, phentsize * phnum)
+        loads: List[Tuple[int, int, int]] = []
+        dynamic = None
+        for index in range(phnum):
+            offset = index * phentsize
+            if is64:
+                p_type, _, p_offset, p_vaddr, _, p_filesz = struct.unpack_from(endian + "IIQQQQ", table, offset)
+            else:
+                p_type, p_offset, p_vaddr, _, p_filesz = struct.unpack_from(endian + "IIIII", table, offset)
+            if p_type == 1:  # PT_LOAD
+                loads.append((p_vaddr, p_offset, p_filesz))
+            elif p_type == 2:  # PT_DYNAMIC
+                dynamic = (p_offset, p_filesz)
+            elif p_type == 3:  # PT_INTERP
+                info["interpreter"] = read_at(p_offset, p_filesz).rstrip(b"\0").decode("utf-8", "replace")
+        if dynamic is None:
+            return info
+
+        entry_format, entry_size = (endian + "qQ", 16) if is64 else (endian + "iI", 8)
+        needed, soname, strtab = [], None, None
+        section = read_at(*dynamic)
+        offset = 0
+        while offset + entry_size <= len(section):
+            tag, value = struct.unpack_from(entry_format, section, offset)
+            offset += entry_size
+            if tag == 0:  # DT_NULL
+                break
+            if tag == 1:  # DT_NEEDED
+                needed.append(value)
+            elif tag == 5:  # DT_STRTAB
+                strtab = value
+            elif tag == 14:  # DT_SONAME
+                soname = value
+        if strtab is None:
+            return info
+        base = next((p_offset + strtab - p_vaddr for p_vaddr, p_offset, p_filesz in loads
+                     if p_vaddr <= strtab < p_vaddr + p_filesz), None)
+        if base is None:
+            return info
+
+        def string_at(index):
+            start = base + index
+            text = b""
+            while True:
+                chunk = read_at(start + len(text), 256)
+                end = chunk.find(b"\0")
+                if end >= 0:
+                    return (text + chunk[:end]).decode("utf-8", "replace")
+                if not chunk:
+                    raise ValueError("unterminated string")
+                text += chunk
+
+        info["needed"] = [string_at(index) for index in needed]
+        info["soname"] = string_at(soname) if soname is not None else None
+    except (struct.error, ValueError):
+        pass
+    return info
+
+def parse_libpython(name: str) -> Optional[Tuple[int, int, str]]:
+    """(major, minor, abiflags) from a libpython file name or SONAME"""
+    match = LIBPYTHON.match(os.path.basename(name))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)), match.group(3)
+
+def parse_patchlevel(text: str) -> Optional[str]:
+    """PY_VERSION from include/pythonX.Y/patchlevel.h"""
+    match = PY_VERSION.search(text)
+    return match.group(1) if match else None
+
+def parse_sysconfigdata_name(name: str) -> Optional[Dict[str, str]]:
+    """abiflags, platform and multiarch encoded in a _sysconfigdata_*.py file name"""
+    match = SYSCONFIGDATA.match(name)
+    return match.groupdict() if match else None
+
+def parse_sysconfigdata(text: str) -> Dict[str, Any]:
+    """build_time_vars of a _sysconfigdata_*.py module, read without importing it"""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "build_time_vars" for t in node.targets)):
+            try:
+                values = ast.literal_eval(node.value)
+            except ValueError:
+                return {}
+            return values if isinstance(values, dict) else {}
+    return {}
+
+def embedded_versions(data: bytes, major: Optional[int] = None, minor: Optional[int] = None) -> List[str]:
+    """NUL-delimited PY_VERSION strings compiled into an interpreter or libpython"""
+    prefix = rb"\d+\.\d+" if major is None else re.escape(f"{major}.{minor}".encode())
+    pattern = re.compile(rb"\x00(" + prefix + rb"\.\d+(?:(?:a|b|rc)\d+)?\+?)\x00")
+    found = []
+    for match in pattern.finditer(data):
+        version = match.group(1).decode()
+        if version not in found:
+            found.append(version)
+    return found
+
+def version_info(version: str) -> List[int]:
+    return [int(part) for part in re.findall(r"\d+", version)[:3]]
+
+class StaticFS(ABC):
+    """Read-only view of a root filesystem seen from inside.
+
+    Subclasses provide `readlink` for paths whose directories contain no
+    symlinks, and `listdir`, `isdir`, `isfile`, `size` and `read` for any
+    path, following symlinks through `resolve`, which re-roots absolute
+    targets in the image.
+    """
+
+    @abstractmethod
+    def readlink(self, path: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def listdir(self, path: str) -> List[str]:
+        pass
+
+    @abstractmethod
+    def isdir(self, path: str) -> bool:
+        pass
+
+    @abstractmethod
+    def isfile(self, path: str) -> bool:
+        pass
+
+    @abstractmethod
+    def size(self, path: str) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def read(self, path: str, limit: Optional[int] = None, offset: int = 0) -> Optional[bytes]:
+        pass
+
+    def host_path(self, path: str) -> str:
+        """How a path inside the image is reported"""
+        return path
+
+    def metadata_headers(self, path: str, fields: Iterable[str]) -> Dict[str, List[str]]:
+        """Header fields of a METADATA / PKG-INFO file, like inventory.read_metadata_headers"""
+        data = self.read(path)
+        return parse_metadata_headers(data.decode("utf-8", "replace").splitlines(True), fields) if data else {}
+
+    def resolve(self, path: str) -> Optional[str]:
+        parts = [part for part in path.split("/") if part]
+        resolved: List[str] = []
+        hops = 0
+        while parts:
+            part = parts.pop(0)
+            if part == ".":
+                continue
+            if part == "..":
+                if resolved:
+                    resolved.pop()
+                continue
+            target = self.readlink("/" + "/".join(resolved + [part]))
+            if target is None:
+                resolved.append(part)
+                continue
+            hops += 1
+            if hops > 40:
+                return None
+            if target.startswith("/"):
+                resolved = []
+            parts = [p for p in target.split("/") if p] + parts
+        return "/" + "/".join(resolved)
+
+    def glob(self, pattern: str) -> List[str]:
+        """Expand `*`-style components one directory level at a time"""
+        matches = ["/"]
+        for component in [part for part in pattern.split("/") if part]:
+            expanded = []
+            for directory in matches:
+                if any(char in component for char in "*?["):
+                    names = fnmatch.filter(self.listdir(directory), component)
+                    expanded.extend(posixpath.join(directory, name) for name in sorted(names))
+                else:
+                    expanded.append(posixpath.join(directory, component))
+            matches = expanded
+        return [path for path in matches if self.isdir(path)]
+
+class RootFS(StaticFS):
+    """A root filesystem mounted or unpacked under a host directory.
+
+    Every access is resolved inside the root first, so an absolute
+    symlink in the tree never reaches the host's own files.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _host(self, path: str) -> str:
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def _resolved(self, path: str) -> Optional[str]:
+        resolved = self.resolve(path)
+        return self._host(resolved) if resolved is not None else None
+
+    def host_path(self, path: str) -> str:
+        return self._host(path)
+
+    def readlink(self, path: str) -> Optional[str]:
+        try:
+            return os.readlink(self._host(path))
+        except OSError:
+            return None
+
+    def listdir(self, path: str) -> List[str]:
+        host = self._resolved(path)
+        try:
+            return os.listdir(host) if host else []
+        except OSError:
+            return []
+
+    def isdir(self, path: str) -> bool:
+        host = self._resolved(path)
+        return bool(host) and os.path.isdir(host)
+
+    def isfile(self, path: str) -> bool:
+        host = self._resolved(path)
+        return bool(host) and os.path.isfile(host)
+
+    def size(self, path: str) -> Optional[int]:
+        host = self._resolved(path)
+        try:
+            return os.path.getsize(host) if host else None
+        except OSError:
+            return None
+
+    def read(self, path: str, limit: Optional[int] = None, offset: int = 0) -> Optional[bytes]:
+        host = self._resolved(path)
+        if not host:
+            return None
+        try:
+            with open(host, "rb") as f:
+                f.seek(offset)
+                return f.read(-1 if limit is None else limit)
+        except OSError:
+            return None
+
+def find_interpreters(fs: StaticFS) -> List[str]:
+    """Interpreter executables in the usual places, one per resolved file"""
+    found = []
+    seen = set()
+    for directory in INTERPRETER_DIRS:
+        for bin_dir in fs.glob(directory):
+            resolved_dir = fs.resolve(bin_dir) or bin_dir
+            names = sorted((name for name in fs.listdir(resolved_dir) if INTERPRETER_NAME.match(name)),
+                           key=lambda name: (len(name), name))
+            for name in names:
+                path = posixpath.join(bin_dir, name)
+                real = fs.resolve(path)
+                if real and real not in seen and fs.isfile(real):
+                    seen.add(real)
+                    found.append(path)
+    return found
+
+def guess_provider(path: str) -> str:
+    if "/.pyenv/versions/" in path:
+        return "pyenv"
+    if "/uv/python/" in path:
+        return "uv"
+    if "conda" in path or "miniforge" in path or "mambaforge" in path:
+        return "conda"
+    return "system"
+
+def _stdlib_dirs(fs: StaticFS, prefix: str) -> List[Tuple[str, int, int, str]]:
+    dirs = []
+    for lib in ("lib", "lib64"):
+        lib_dir = posixpath.join(prefix, lib)
+        for name in sorted(fs.listdir(lib_dir)):
+            match = STDLIB_DIR.match(name)
+            if match and fs.isdir(posixpath.join(lib_dir, name)):
+                dirs.append((posixpath.join(lib_dir, name), int(match.group(2)), int(match.group(3)), match.group(4)))
+    return dirs
+
+def _read_text(fs: StaticFS, path: str) -> Optional[str]:
+    data = fs.read(path)
+    return data.decode("utf-8", "replace") if data is not None else None
+
+def identify(fs: StaticFS, path: str) -> Optional[Dict[str, Any]]:
+    """Probe-shaped report for an interpreter, built without executing it"""
+    real = fs.resolve(path)
+    if not real or not fs.isfile(real):
+        return None
+    size = fs.size(real) or 0
+
+    def read_at(offset: int, length: int) -> bytes:
+        return fs.read(real, limit=max(0, min(length, size - offset)), offset=offset) or b""
+
+    elf = read_elf(read_at)
+    if elf is None:
+        return None  # shell shims and other wrappers
+    data = None
+
+    def binary() -> bytes:
+        # The whole image is read only when its embedded version is needed
+        nonlocal data
+        if data is None:
+            data = (fs.read(real) or b"") if size <= MAX_BINARY_SIZE else b""
+        return data
+
+    prefix = posixpath.dirname(posixpath.dirname(real))
+    stdlibs = _stdlib_dirs(fs, prefix)
+    libpython_name = next((name for name in elf["needed"] if parse_libpython(name)), None)
+    libpython = parse_libpython(libpython_name) if libpython_name else None
+    named = VERSIONED_NAME.match(posixpath.basename(real)) or VERSIONED_NAME.match(posixpath.basename(path))
+
+    major = minor = None
+    abiflags = ""
+    if libpython:
+        major, minor, abiflags = libpython
+    elif named:
+        major, minor, abiflags = int(named.group(1)), int(named.group(2)), named.group(3)
+    elif len(stdlibs) == 1:
+        major, minor, abiflags = stdlibs[0][1:]
+    else:
+        # Several stdlibs (or none) and an unversioned name: trust the
+        # version string compiled into the binary
+        for version in embedded_versions(binary()):
+            major, minor = version_info(version)[:2]
+            if any(s[1:3] == (major, minor) for s in stdlibs):
+                break
+    if major is None:
+        return None
+    stdlib = next((s[0] for s in stdlibs if s[1:3] == (major, minor)), None)
+
+    # Full version: patchlevel.h, else the string compiled into the binary
+    # or the shared libpython it loads
+    version = None
+    for include in sorted(fs.listdir(posixpath.join(prefix, "include"))):
+        if include.startswith(f"python{major}.{minor}"):
+            text = _read_text(fs, posixpath.join(prefix, "include", include, "patchlevel.h"))
+            version = parse_patchlevel(text) if text else None
+            if version:
+                break
+    if not version:
+        candidates = embedded_versions(binary(), major, minor)
+        if not candidates and libpython_name:
+            for lib in ("lib", "lib64"):
+                lib_path = fs.resolve(posixpath.join(prefix, lib, libpython_name))
+                if lib_path and fs.isfile(lib_path):
+                    candidates = embedded_versions(fs.read(lib_path, limit=MAX_BINARY_SIZE) or b"", major, minor)
+                    break
+        version = candidates[0] if candidates else f"{major}.{minor}"
+
+    build_vars: Dict[str, Any] = {}
+    abi = None
+    if stdlib:
+        for name in sorted(fs.listdir(stdlib), key=lambda name: (not name.startswith("_sysconfigdata__linux"), name)):
+            encoded = parse_sysconfigdata_name(name)
+            if encoded is None and name != "_sysconfigdata.py":  # Python 2.7 and 3.5
+                continue
+            encoded = encoded or {}
+            text = _read_text(fs, posixpath.join(stdlib, name))
+            build_vars = parse_sysconfigdata(text) if text else {}
+            abiflags = build_vars.get("ABIFLAGS", encoded.get("abiflags", abiflags)) or abiflags
+            abi = build_vars.get("SOABI")
+            if not abi and encoded.get("multiarch"):
+                abi = f"cpython-{major}{minor}{abiflags}-{encoded['multiarch']}"
+            break
+
+    implementation = "PyPy" if posixpath.basename(real).startswith("pypy") or (
+        stdlib and posixpath.basename(stdlib).startswith("pypy")) else "CPython"
+    site_packages = [posixpath.join(stdlib, "site-packages")] if stdlib else []
+    # Distro builds keep packages in dist-packages instead
+    site_packages += [posixpath.join(prefix, "local", "lib", f"python{major}.{minor}", "dist-packages"),
+                      posixpath.join(prefix, "lib", f"python{major}", "dist-packages")]
+    build_flags = {name: build_vars.get(name) for name in BUILD_FLAG_VARS}
+    if build_flags["Py_ENABLE_SHARED"] is None and libpython:
+        build_flags["Py_ENABLE_SHARED"] = 1
+
+    return {
+        "ok": stdlib is not None,
+        "static": True,
+        "executable": path,
+        "version": version,
+        "version_info": version_info(version),
+        "implementation": implementation,
+        "abi": abi,
+        "prefix": prefix,
+        "base_prefix": prefix,
+        "site_packages": [p for p in site_packages if fs.isdir(p)],
+        "openssl_version": None,
+        "expat_version": None,
+        "sqlite_version": None,
+        "platform": "linux",
+        "machine": elf["machine"],
+        "build_flags": build_flags
+    }
+
+def static_installation(fs: StaticFS, path: str) -> PythonInstallation:
+    """PythonInstallation for an interpreter in an image, paths reported as the host sees them"""
+    report = identify(fs, path)
+    if report:
+        report["prefix"] = report["base_prefix"] = fs.host_path(report["prefix"])
+        report["site_packages"] = [fs.host_path(p) for p in report["site_packages"]]
+    return PythonInstallation.from_probe(fs.host_path(path), guess_provider(path), report)
+
+class StaticScanner:
+    """Scan root filesystems for interpreters without executing anything.
+
+    Every root is handled on its own worker, so hundreds of mounted
+    snapshots can be audited in parallel.
+    """
+
+    def __init__(self, roots=("/",), max_workers=None, venv_discovery=None, probe_cache=None):
+        self.roots = list(roots)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.venv_discovery = venv_discovery or VenvDiscovery()
+        # Reading an interpreter moves its atime like a probe does
+        self.probe_cache = probe_cache or ProbeCache()
+        self.installations = []
+        self.issues = []
+        self.provider_timings = {}
+
+    def scan(self, comprehensive=False, roots=None):
+        """Identify every interpreter under the roots"""
+        self.installations = [record for kind, record in self.iter_scan(comprehensive, roots) if kind == "installation"]
+        return self.issues
+
+    def iter_scan(self, comprehensive=False, roots=None) -> Iterator[Tuple[str, Any]]:
+        """Yield ("installation", PythonInstallation) records, root by root.
+
+        There is no host to deep-scan, so comprehensive adds nothing here.
+        """
+        self.issues = []
+        known = set()
+        workers = max(1, min(self.max_workers, len(self.roots)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyenvdoctor-static") as pool:
+            for installations in pool.map(self._scan_root, self.roots):
+                for installation in installations:
+                    known.add(installation.path)
+                    self.probe_cache.record_probe(installation.path)
+                    yield "installation", installation
+        self.probe_cache.flush()
+        if roots:
+            venvs = (venv for venv in self.venv_discovery.discover(roots) if venv.path not in known)
+            for venv in sorted(venvs, key=lambda venv: venv.path):
+                yield "installation", venv
+
+    def get_installations(self):
+        return self.installations
+
+    @staticmethod
+    def _scan_root(root: str) -> List[PythonInstallation]:
+        fs = RootFS(root)
+        return [static_installation(fs, path) for path in find_interpreters(fs)]
@@ -1,123 +1,129 @@
 import os
-import subprocess
+import shutil
 import platform
+import time
 from pathlib import Path
-from typing import List, Dict
-import sys
+from functools import partial
 
-# Create stubs for missing models
-class PythonInstallation:
-    def __init__(self, path, version, provider, is_valid=True):
-        self.path = path
-        self.version = version
-        self.provider = provider
-        self.is_valid = is_valid
-        
-    def to_dict(self):
-        return {
-            "path": self.path,
-            "version": self.version,
-            "provider": self.provider,
-            "is_valid": self.is_valid
-        }
-
-class Issue:
-    def __init__(self, description, type="general", severity="medium", details=None):
-        self.description = description
-        self.type = type
-        self.severity = severity
-        self.details = details or {}
-        
-    def to_dict(self):
-        return {
-            "description": self.description,
-            "type": self.type,
-            "severity": self.severity,
-            "details": self.details
-        }
+from ..core.models import PythonInstallation, Issue
+from .cache import ProbeCache
+from .introspect import introspect
+from .probe import ProbeEngine
+from .registry import ProviderRegistry
+from .scheduler import DeadlineScheduler, ProbeTimes
+from .venv_discovery import VenvDiscovery
 
 class SystemScanner:
-    def __init__(self):
+    def __init__(self, probe_engine=None, cache=None, registry=None, venv_discovery=None, scheduler=None,
+                 deadline=None):
         self.installations = []
         self.issues = []
+        self.probe_engine = probe_engine or ProbeEngine()
+        self.cache = cache if cache is not None else ProbeCache()
+        self.scheduler = scheduler or DeadlineScheduler(
+            budget=deadline,
+            max_workers=self.probe_engine.max_workers,
+            times=ProbeTimes(enabled=self.cache.enabled),
+            default_timeout=self.probe_engine.timeout
+        )
+        self.registry = registry or ProviderRegistry()
+        self.venv_discovery = venv_discovery or VenvDiscovery()
+        self.provider_timings = {}
         
-    def scan(self, comprehensive=False):
+    def scan(self, comprehensive=False, roots=None):
         """Scan system for Python installations and issues"""
         self.installations = []  # Reset installations
-        self.issues = []  # Reset issues
-        
-        self._detect_system_python()
-        self._detect_pyenv_installations()
         
-        if comprehensive:
-            self._deep_scan()
+        for kind, record in self.iter_scan(comprehensive=comprehensive, roots=roots, ordered=True):
+            if kind == "installation":
+                self.installations.append(record)
             
         return self.issues
         
-    def _detect_system_python(self):
-        """Detect system Python installations"""
-        system_paths = [
-            '/usr/bin/python3',
-            '/usr/local/bin/python3',
-            '/opt/homebrew/bin/python3',
-            '/bin/python3'
-        ]
-        
-        for path in system_paths:
-            if os.path.exists(path):
-                version = self._get_python_version(path)
-                installation = PythonInstallation(
-                    path=path,
-                    version=version,
-                    provider="system",
-                    is_valid=self._verify_installation(path)
-                )
-                self.installations.append(installation)
-                
-    def _detect_pyenv_installations(self):
-        """Detect pyenv installations"""
-        pyenv_root = os.environ.get('PYENV_ROOT', os.path.expanduser('~/.pyenv'))
-        versions_dir = Path(pyenv_root) / 'versions'
+    def iter_scan(self, comprehensive=False, roots=None, ordered=False):
+        """Yield ("installation", PythonInstallation) and ("issue", Issue) records as they are found.
         
-        if versions_dir.exists():
-            for version_dir in versions_dir.iterdir():
-                if version_dir.is_dir():
-                    python_path = version_dir / 'bin' / 'python'
-                    if python_path.exists():
-                        version = version_dir.name
-                        installation = PythonInstallation(
-                            path=str(python_path),
-                            version=version,
-                            provider="pyenv",
-                            is_valid=self._verify_installation(str(python_path))
-                        )
-                        self.installations.append(installation)
-                        
-    def _get_python_version(self, python_path):
-        """Get Python version from executable"""
+        Installations are not kept on the scanner, so memory stays flat on
+        large scans. With ordered=True installations come out in discovery
+        order and venvs found under roots sorted by path.
+        """
+        self.issues = []
+        known = set()
+        self.scheduler.start()
+        candidates = self.discover()
+        position = {candidate[0]: index for index, candidate in enumerate(candidates)}
+        # Every provider's candidates go through one worker pool, cheapest first
+        installations = self.probe_engine.imap(self._probe_installation, self.scheduler.order(candidates),
+                                               deadline_for=self.scheduler.deadline_for)
+        if ordered:
+            installations = sorted(installations, key=lambda installation: position[installation.path])
         try:
-            result = subprocess.run([python_path, '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                return result.stdout.strip().replace('Python ', '')
-            return "Unknown"
-        except Exception as e:
-            return "Error"
+            for installation in installations:
+                known.add(installation.path)
+                yield "installation", installation
+        finally:
+            self.cache.flush()
+            self.scheduler.flush()
             
-    def _verify_installation(self, python_path):
-        """Verify a Python installation is working"""
-        try:
-            result = subprocess.run([python_path, '-c', 'print("OK")'], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0 and result.stdout.strip() == "OK"
-        except Exception:
-            return False
+        if roots:
+            venvs = (venv for venv in self.venv_discovery.discover(roots) if venv.path not in known)
+            if ordered:
+                venvs = sorted(venvs, key=lambda venv: venv.path)
+            for venv in venvs:
+                known.add(venv.path)
+                yield "installation", venv
+                
+        if comprehensive:
+            self._deep_scan(count=len(known))
+            for issue in self.issues:
+                yield "issue", issue
+        
+    def discover(self):
+        """Run the installation providers and return merged candidates"""
+        candidates = self.registry.discover(deadline=self.scheduler.deadline)
+        self.provider_timings = self.registry.timings
+        return candidates
+        
+    def probe(self, candidates, use_cache=True):
+        """Probe (path, provider, version) candidates, keeping their order"""
+        probe_one = partial(self._probe_installation, use_cache=use_cache)
+        installations = self.probe_engine.map(probe_one, candidates)
+        self.cache.flush()
+        return installations
+        
+    def _probe_installation(self, candidate, deadline=None, use_cache=True):
+        """Build a PythonInstallation from a single introspection probe"""
+        path, provider, version = candidate
+        probe = self.cache.get(path) if use_cache else None
+        missed_deadline = False
+        if probe is None and deadline is not None and self.probe_engine.remaining(deadline) <= 0:
+            # The budget ran out before this probe started; it says nothing of its cost
+            missed_deadline = True
+        elif probe is None:
+            started = time.monotonic()
+            try:
+                probe = introspect(path, self.probe_engine, deadline)
+            except Exception:
+                probe = None
+            if probe is not None:
+                self.scheduler.record(path, time.monotonic() - started)
+                self.cache.put(path, probe)
+            else:
+                self.cache.record_probe(path)
+                missed_deadline = deadline is not None and self.probe_engine.remaining(deadline) <= 0
+                if missed_deadline:
+                    # Killed at its deadline
+                    self.scheduler.record_timeout(path, time.monotonic() - started)
+        installation = PythonInstallation.from_probe(path, provider, probe, version=version)
+        if missed_deadline:
+            installation.status = "unknown"
+        return installation
             
-    def _deep_scan(self):
+    def _deep_scan(self, count=None):
         """Perform deep scan for issues"""
         self._check_missing_dependencies()
         self._check_permission_issues()
-        self._check_version_conflicts()
+        self._check_version_conflicts(count)
         
     def _check_missing_dependencies(self):
         """Check for missing system dependencies"""
@@ -166,24 +172,22 @@ class SystemScanner:
                 except Exception:
                     pass
                     
-    def _check_version_conflicts(self):
+    def _check_version_conflicts(self, count=None):
         """Check for Python version conflicts"""
         # Simple check for multiple Python versions
-        if len(self.installations) > 3:
+        if count is None:
+            count = len(self.installations)
+        if count > 3:
             self.issues.append(Issue(
-                description=f"Multiple Python installations detected ({len(self.installations)})",
+                description=f"Multiple Python installations detected ({count})",
                 type="version_conflict",
                 severity="low",
-                details={"count": len(self.installations)}
+                details={"count": count}
             ))
             
     def _command_exists(self, command):
         """Check if a command exists in PATH"""
-        try:
-            subprocess.run([command, '--version'], capture_output=True, timeout=5)
-            return True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
+        return shutil.which(command) is not None
             
     def get_installations(self):
         """Get all found installations"""
@@ -0,0 +1,98 @@
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from ..core.models import PythonInstallation
+from ..utils.fswalk import DEFAULT_PRUNE, ParallelWalker
+
+def parse_pyvenv_cfg(lines: Iterable[str]) -> Dict[str, str]:
+    """Parse the `key = value` lines of a pyvenv.cfg file"""
+    values = {}
+    for line in lines:
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip().lower()] = value.strip()
+    return values
+
+def read_pyvenv_cfg(path: str) -> Dict[str, str]:
+    """Parse a pyvenv.cfg file, empty when it cannot be read"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return parse_pyvenv_cfg(f)
+    except OSError:
+        return {}
+
+def venv_version(cfg: Dict[str, str]) -> Optional[str]:
+    """Interpreter version recorded by venv, virtualenv or uv"""
+    return cfg.get("version") or cfg.get("version_info") or None
+
+def base_interpreter(cfg: Dict[str, str], exists: Callable[[str], bool] = os.path.exists) -> Optional[str]:
+    """Resolve the base interpreter of a venv from pyvenv.cfg, without executing it.
+
+    `exists` checks candidates on another filesystem, such as an image's.
+    """
+    executable = cfg.get("executable") or cfg.get("base-executable")
+    if executable and exists(executable):
+        return executable
+    home = cfg.get("home")
+    if not home:
+        return None
+    names = ["python3", "python"]
+    match = re.match(r"(\d+)\.(\d+)", venv_version(cfg) or "")
+    if match:
+        names.insert(0, f"python{match.group(1)}.{match.group(2)}")
+    for name in names:
+        candidate = os.path.join(home, name)
+        if exists(candidate):
+            return candidate
+    return None
+
+def venv_installation(venv_dir: str, cfg: Optional[Dict[str, str]] = None) -> PythonInstallation:
+    """Describe a venv from its layout and pyvenv.cfg alone"""
+    if cfg is None:
+        cfg = read_pyvenv_cfg(os.path.join(venv_dir, "pyvenv.cfg"))
+    python_path = os.path.join(venv_dir, "bin", "python")
+    base = base_interpreter(cfg)
+    lib_dir = os.path.join(venv_dir, "lib")
+    try:
+        site_packages = sorted(
+            os.path.join(lib_dir, name, "site-packages") for name in os.listdir(lib_dir)
+            if name.startswith("python") and os.path.isdir(os.path.join(lib_dir, name, "site-packages"))
+        )
+    except OSError:
+        site_packages = []
+    return PythonInstallation(
+        path=python_path,
+        version=venv_version(cfg) or "Unknown",
+        provider="virtualenv",
+        is_valid=os.path.exists(python_path) and base is not None,
+        implementation=cfg.get("implementation"),
+        prefix=venv_dir,
+        base_prefix=os.path.dirname(cfg["home"]) if cfg.get("home") else None,
+        site_packages=site_packages,
+        base_interpreter=base
+    )
+
+class VenvDiscovery:
+    """Find virtualenvs (pyvenv.cfg + bin/python) under large directory trees.
+
+    Directories are read in parallel with os.scandir; pruned names are never
+    entered and a venv's own tree is not descended into.
+    """
+
+    def __init__(self, max_depth: Optional[int] = 8, follow_symlinks: bool = False,
+                 prune: Iterable[str] = DEFAULT_PRUNE, max_workers: Optional[int] = None):
+        self.walker = ParallelWalker(max_workers=max_workers, max_depth=max_depth,
+                                     follow_symlinks=follow_symlinks)
+        self.prune = frozenset(prune)
+
+    def discover(self, roots: Iterable[str]) -> Iterator[PythonInstallation]:
+        """Yield an installation per venv as soon as it is found"""
+        return self.walker.walk(roots, self._visit)
+
+    def _visit(self, path: str, entries: List[os.DirEntry], depth: int):
+        names = {entry.name for entry in entries}
+        # lexists: a venv whose base interpreter is gone is still a (broken) venv
+        if "pyvenv.cfg" in names and os.path.lexists(os.path.join(path, "bin", "python")):
+            return venv_installation(path), []
+        return None, self.walker.subdirectories(entries, self.prune)
@@ -0,0 +1,252 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from ..core.models import PythonInstallation
+from .providers import VirtualenvScanner
+from .system_scanner import SystemScanner
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "afs", "ceph", "glusterfs"}
+
+class PollingBackend:
+    """Detect changes by comparing mtime snapshots of watched paths"""
+
+    name = "polling"
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self._snapshot: Dict[str, Optional[int]] = {}
+
+    def watch(self, paths: Iterable[str]):
+        self._snapshot = {path: self._mtime(path) for path in set(paths)}
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        changed = set()
+        for path, mtime in self._snapshot.items():
+            current = self._mtime(path)
+            if current != mtime:
+                self._snapshot[path] = current
+                changed.add(path)
+        return changed
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+class InotifyBackend:
+    """Linux inotify watches on directories, via libc"""
+
+    name = "inotify"
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+
+    def watch(self, paths: Iterable[str]):
+        wanted = {self._watch_dir(path) for path in paths}
+        for wd, path in list(self._watches.items()):
+            if path not in wanted:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        watched = set(self._watches.values())
+        for path in wanted - watched:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = path
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        if not poller.poll(None if timeout is None else int(timeout * 1000)):
+            return set()
+        # Give bursts (pip installs, pyenv builds) a moment to settle
+        time.sleep(0.1)
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            changed.update(self._decode(data))
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _decode(self, data: bytes) -> Iterator[str]:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+            yield os.path.join(directory, os.fsdecode(name)) if name else directory
+
+    @staticmethod
+    def _watch_dir(path: str) -> str:
+        return path if os.path.isdir(path) else os.path.dirname(path)
+
+def _mount_fstype(path: str) -> Optional[str]:
+    """Filesystem type of the mount holding path, from /proc/self/mounts"""
+    try:
+        with open("/proc/self/mounts") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best, fstype = "", None
+    for mount_point, mount_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fstype = mount_point, mount_type
+    return fstype
+
+def select_backend(paths: Iterable[str], interval: float = 2.0, force_polling: bool = False):
+    """Pick inotify when it can see every watched path, polling otherwise"""
+    if force_polling or any(_mount_fstype(path) in NETWORK_FILESYSTEMS for path in paths):
+        return PollingBackend(interval)
+    try:
+        return InotifyBackend()
+    except (OSError, AttributeError):
+        return PollingBackend(interval)
+
+class InstallationWatcher:
+    """Keep a live model of installations and re-probe only what changed.
+
+    The watch roots of every registered provider (pyenv versions, system
+    interpreters, venv roots...) are observed; every change to the model
+    is reported as an event dict suitable for NDJSON output.
+    """
+
+    def __init__(self, scanner: Optional[SystemScanner] = None, venv_roots: Optional[List[str]] = None,
+                 backend=None, interval: float = 2.0, force_polling: bool = False):
+        self.scanner = scanner or SystemScanner()
+        if venv_roots:
+            self.scanner.registry.register(VirtualenvScanner(roots=venv_roots))
+        self.interval = interval
+        self.installations: Dict[str, PythonInstallation] = {}
+        self.backend = backend or select_backend(self._root_paths(), interval, force_polling)
+
+    def events(self) -> Iterator[Dict]:
+        """Yield the initial model as 'added' events, then live diffs"""
+        try:
+            yield from self.refresh()
+            while True:
+                changed = self.backend.wait(self.interval)
+                if changed:
+                    yield from self.refresh(changed)
+        finally:
+            self.backend.close()
+
+    def refresh(self, changed: Optional[Set[str]] = None) -> List[Dict]:
+        """Reconcile the model with disk; changed=None means initial load"""
+        candidates = {candidate[0]: candidate for candidate in self._candidates()}
+        events = []
+
+        for path in [path for path in self.installations if path not in candidates]:
+            events.append(self._event("removed", self.installations.pop(path)))
+
+        added = [candidate for path, candidate in candidates.items() if path not in self.installations]
+        stale = []
+        if changed:
+            stale = [candidates[path] for path in self.installations
+                     if self._is_affected(self.installations[path], changed)]
+
+        for installation in self.scanner.probe(added):
+            self.installations[installation.path] = installation
+            events.append(self._event("added", installation))
+
+        # A change event is our invalidation signal, so bypass the probe cache
+        for installation in self.scanner.probe(stale, use_cache=False):
+            previous = self.installations[installation.path]
+            self.installations[installation.path] = installation
+            if installation.to_dict() != previous.to_dict():
+                events.append(self._event("changed", installation))
+
+        self.backend.watch(self._watch_paths())
+        return events
+
+    def _candidates(self):
+        return self.scanner.discover()
+
+    def _root_paths(self) -> List[str]:
+        return [root for root in self.scanner.registry.watch_roots() if os.path.isdir(root)]
+
+    def _watch_paths(self) -> Set[str]:
+        paths = set(self._root_paths())
+        for installation in self.installations.values():
+            paths.add(installation.path)
+            paths.add(os.path.dirname(installation.path))
+            paths.update(self._tracked_dirs(installation))
+        return {path for path in paths if os.path.exists(path)}
+
+    @staticmethod
+    def _tracked_dirs(installation: PythonInstallation) -> List[str]:
+        dirs = list(installation.site_packages)
+        if installation.provider != "system":
+            # pyenv versions and venvs own their whole prefix
+            dirs.append(str(Path(installation.path).parent.parent))
+        return dirs
+
+    def _is_affected(self, installation: PythonInstallation, changed: Set[str]) -> bool:
+        prefixes = [directory.rstrip(os.sep) + os.sep for directory in self._tracked_dirs(installation)]
+        for path in changed:
+            if path == installation.path or path.rstrip(os.sep) + os.sep in prefixes:
+                return True
+            if any(path.startswith(prefix) for prefix in prefixes):
+                return True
+        return False
+
+    @staticmethod
+    def _event(kind: str, installation: PythonInstallation) -> Dict:
+        return {
+            "event": kind,
+            "path": installation.path,
+            "installation": installation.to_dict(),
+            "timestamp": datetime.now().isoformat()
+        }
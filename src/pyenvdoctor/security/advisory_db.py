@@ -0,0 +1,248 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from ..scanner.inventory import canonicalize_name
+
+OSV_BUCKET = "https://osv-vulnerabilities.storage.googleapis.com/PyPI"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS advisories (
+    id TEXT PRIMARY KEY,
+    modified TEXT NOT NULL,
+    summary TEXT,
+    aliases TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS ranges (
+    advisory_id TEXT NOT NULL REFERENCES advisories(id) ON DELETE CASCADE,
+    package TEXT NOT NULL,
+    introduced TEXT,
+    fixed TEXT,
+    last_affected TEXT
+);
+CREATE INDEX IF NOT EXISTS ranges_package ON ranges(package);
+CREATE TABLE IF NOT EXISTS affected_versions (
+    advisory_id TEXT NOT NULL REFERENCES advisories(id) ON DELETE CASCADE,
+    package TEXT NOT NULL,
+    version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS affected_versions_package ON affected_versions(package, version);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def osv_intervals(ranges: Iterable[Dict[str, Any]]) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """(introduced, fixed, last_affected) intervals from OSV ECOSYSTEM ranges"""
+    intervals = []
+    for version_range in ranges:
+        if version_range.get("type") not in ("ECOSYSTEM", "SEMVER"):
+            continue  # GIT ranges name commits, not releases
+        introduced, is_open = None, False
+        for event in version_range.get("events", []):
+            if "introduced" in event:
+                introduced = None if event["introduced"] == "0" else event["introduced"]
+                is_open = True
+            elif is_open and ("fixed" in event or "last_affected" in event):
+                intervals.append((introduced, event.get("fixed"), event.get("last_affected")))
+                is_open = False
+        if is_open:
+            intervals.append((introduced, None, None))
+    return intervals
+
+def _iter_dump(path: str) -> Iterator[Dict[str, Any]]:
+    """OSV records from an all.zip dump, a directory of .json/.yaml files or a single JSON file"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield json.loads(archive.read(name))
+    elif os.path.isdir(path):
+        import yaml
+        for directory, _, names in os.walk(path):
+            for name in sorted(names):
+                full = os.path.join(directory, name)
+                if name.endswith(".json"):
+                    with open(full, encoding="utf-8") as f:
+                        yield json.load(f)
+                elif name.endswith((".yaml", ".yml")):  # PyPA advisory-database layout
+                    with open(full, encoding="utf-8") as f:
+                        yield yaml.safe_load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data if isinstance(data, list) else [data])
+
+class AdvisoryDB:
+    """Local, indexed copy of the OSV PyPI advisories.
+
+    Advisories are stored in SQLite with one row per affected version
+    interval, indexed by canonical package name, so checking an
+    environment is one local lookup per package. `update` applies only the
+    advisories modified since the last sync.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Path.home() / ".pyenvdoctor" / "advisories.db")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path))
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def is_empty(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM advisories LIMIT 1").fetchone() is None
+
+    def import_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace advisories that are new or newer than the stored copy"""
+        connection = self.connection
+        changed = 0
+        with connection:
+            for record in records:
+                if not record or "id" not in record:
+                    continue
+                modified = str(record.get("modified", ""))
+                stored = connection.execute("SELECT modified FROM advisories WHERE id = ?", (record["id"],)).fetchone()
+                if stored is not None and stored[0] >= modified:
+                    continue
+                connection.execute("DELETE FROM advisories WHERE id = ?", (record["id"],))
+                if record.get("withdrawn"):
+                    changed += 1
+                    continue
+                connection.execute(
+                    "INSERT INTO advisories (id, modified, summary, aliases) VALUES (?, ?, ?, ?)",
+                    (record["id"], modified, record.get("summary") or (record.get("details") or "")[:200],
+                     json.dumps(record.get("aliases") or []))
+                )
+                for affected in record.get("affected") or []:
+                    package = affected.get("package") or {}
+                    if package.get("ecosystem") != "PyPI" or not package.get("name"):
+                        continue
+                    name = canonicalize_name(package["name"])
+                    connection.executemany(
+                        "INSERT INTO ranges (advisory_id, package, introduced, fixed, last_affected)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        [(record["id"], name) + interval for interval in osv_intervals(affected.get("ranges") or [])]
+                    )
+                    connection.executemany(
+                        "INSERT INTO affected_versions (advisory_id, package, version) VALUES (?, ?, ?)",
+                        [(record["id"], name, str(version)) for version in affected.get("versions") or []]
+                    )
+                changed += 1
+        return changed
+
+    def import_path(self, path: str) -> int:
+        """Import an offline dump (OSV all.zip, advisory directory or JSON file)"""
+        changed = self.import_records(_iter_dump(path))
+        self._set_meta("last_import", os.path.abspath(path))
+        return changed
+
+    def update(self, session: Optional[requests.Session] = None, base_url: str = OSV_BUCKET,
+               timeout: float = 30) -> int:
+        """Sync with OSV: the full dump the first time, then only modified advisories"""
+        session = session or requests.Session()
+        last_sync = self._get_meta("last_sync")
+        if last_sync is None or self.is_empty():
+            with tempfile.NamedTemporaryFile(suffix=".zip") as dump:
+                with session.get(f"{base_url}/all.zip", stream=True, timeout=timeout) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        dump.write(chunk)
+                dump.flush()
+                changed = self.import_path(dump.name)
+            newest = self.connection.execute("SELECT MAX(modified) FROM advisories").fetchone()[0]
+        else:
+            response = session.get(f"{base_url}/modified_id.csv", timeout=timeout)
+            response.raise_for_status()
+            # Newest first: stop at the first entry we already have
+            delta = []
+            for row in csv.reader(io.StringIO(response.text)):
+                if len(row) < 2 or row[0] <= last_sync:
+                    break
+                delta.append(row)
+            changed = self.import_records(self._fetch(session, base_url, row[1], timeout) for row in delta)
+            newest = delta[0][0] if delta else last_sync
+        if newest:
+            self._set_meta("last_sync", newest)
+        return changed
+
+    @staticmethod
+    def _fetch(session: requests.Session, base_url: str, advisory_id: str, timeout: float) -> Dict[str, Any]:
+        response = session.get(f"{base_url}/{advisory_id}.json", timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def lookup(self, package: str, version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Candidate advisories for a package: its intervals and explicit versions"""
+        name = canonicalize_name(package)
+        rows = self.connection.execute(
+            "SELECT a.id, a.summary, a.aliases, r.introduced, r.fixed, r.last_affected"
+            " FROM ranges r JOIN advisories a ON a.id = r.advisory_id WHERE r.package = ?", (name,)
+        ).fetchall()
+        advisories: Dict[str, Dict[str, Any]] = {}
+        for advisory_id, summary, aliases, introduced, fixed, last_affected in rows:
+            entry = advisories.setdefault(advisory_id, {"id": advisory_id, "summary": summary,
+                                                        "aliases": json.loads(aliases), "ranges": [], "versions": []})
+            entry["ranges"].append({"introduced": introduced, "fixed": fixed, "last_affected": last_affected})
+        if version is not None:
+            query = ("SELECT a.id, a.summary, a.aliases FROM affected_versions v"
+                     " JOIN advisories a ON a.id = v.advisory_id WHERE v.package = ? AND v.version = ?")
+            for advisory_id, summary, aliases in self.connection.execute(query, (name, version)):
+                entry = advisories.setdefault(advisory_id, {"id": advisory_id, "summary": summary,
+                                                            "aliases": json.loads(aliases), "ranges": [],
+                                                            "versions": []})
+                entry["versions"].append(version)
+        return list(advisories.values())
+
+    def lookup_many(self, packages: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Every advisory of many packages with all of their intervals and explicit versions"""
+        names = sorted({canonicalize_name(package) for package in packages})
+        found: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in names}
+
+        def entry(package, advisory_id, summary, aliases):
+            advisories = found[package]
+            if advisory_id not in advisories:
+                advisories[advisory_id] = {"id": advisory_id, "summary": summary, "aliases": json.loads(aliases),
+                                           "ranges": [], "versions": []}
+            return advisories[advisory_id]
+
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for package, advisory_id, summary, aliases, introduced, fixed, last_affected in self.connection.execute(
+                    "SELECT r.package, a.id, a.summary, a.aliases, r.introduced, r.fixed, r.last_affected"
+                    f" FROM ranges r JOIN advisories a ON a.id = r.advisory_id WHERE r.package IN ({placeholders})",
+                    chunk):
+                entry(package, advisory_id, summary, aliases)["ranges"].append(
+                    {"introduced": introduced, "fixed": fixed, "last_affected": last_affected})
+            for package, advisory_id, summary, aliases, version in self.connection.execute(
+                    "SELECT v.package, a.id, a.summary, a.aliases, v.version"
+                    f" FROM affected_versions v JOIN advisories a ON a.id = v.advisory_id WHERE v.package IN ({placeholders})",
+                    chunk):
+                entry(package, advisory_id, summary, aliases)["versions"].append(version)
+        return {name: list(advisories.values()) for name, advisories in found.items()}
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..core.config import config
+
+class AdvisoryFetcher:
+    """Concurrent HTTP GETs of JSON documents with an on-disk validator cache.
+
+    One pooled Session is shared by a bounded worker pool. Every response
+    is cached with its ETag / Last-Modified and later requests for the
+    same URL are conditional, so unchanged documents cost a 304. The same
+    URL is only ever requested once per batch. Connection errors and 429 /
+    5xx responses are retried with exponential backoff.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None, retries: Optional[int] = None, backoff: float = 0.5,
+                 session: Optional[requests.Session] = None):
+        self.cache_dir = Path(cache_dir or Path.home() / ".pyenvdoctor" / "cache" / "http")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or int(config.get("security.fetch_workers", 8))
+        self.timeout = float(timeout or config.get("security.fetch_timeout", 10))
+        retries = int(config.get("security.fetch_retries", 3)) if retries is None else retries
+        self.session = session or requests.Session()
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET"]), respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """Decoded JSON per unique URL; None when it could not be fetched"""
+        unique = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+        workers = max(1, min(self.max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyenvdoctor-fetch") as pool:
+            return dict(zip(unique, pool.map(self.fetch, unique)))
+
+    def fetch(self, url: str) -> Optional[Any]:
+        cached = self._load(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        self._count("requests")
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            self._count("errors")
+            # Stale data beats no data when the network is down
+            return cached["body"] if cached else None
+
+        if response.status_code == 304 and cached:
+            self._count("not_modified")
+            return cached["body"]
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            self._count("errors")
+            return cached["body"] if cached else None
+        try:
+            body = response.json()
+        except ValueError:
+            self._count("errors")
+            return None
+        self._save(url, {"etag": response.headers.get("ETag"),
+                         "last_modified": response.headers.get("Last-Modified"),
+                         "body": body})
+        return body
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, url: str, entry: Dict[str, Any]):
+        # Atomic replace without fsync: losing a cache entry only costs a refetch
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, self._path(url))
@@ -1,14 +1,26 @@
 import os
-import subprocess
 import platform
 from pathlib import Path
 from typing import Dict, List
 
+from ..scanner.inventory import InventoryReader
+from ..scanner.probe import ProbeEngine
+from ..scanner.system_scanner import SystemScanner
+from .cis_checks import CheckContext, CheckRegistry
+from .cpython_advisories import CPythonAdvisories
+from .integrity import IntegrityVerifier
+from .permission_audit import PermissionAuditor, audit_roots
+from .vulnerability_scanner import VulnerabilityScanner
+
 class SecurityAuditor:
-    def __init__(self):
+    def __init__(self, probe_engine=None, installations=None, deadline=None, cis_registry=None):
         self.pyenv_root = Path(os.environ.get("PYENV_ROOT", "~/.pyenv")).expanduser()
+        self.probe_engine = probe_engine or ProbeEngine()
+        self.deadline = deadline
+        self._installations = installations
+        self.cis_registry = cis_registry or CheckRegistry()
         
-    def run_security_audit(self, check_cis=True, check_cve=True):
+    def run_security_audit(self, check_cis=True, check_cve=True, check_packages=False, check_integrity=False):
         """Run security audit"""
         results = {}
         
@@ -18,97 +30,56 @@ class SecurityAuditor:
         if check_cve:
             results["vulnerability_scan"] = self._check_vulnerabilities()
             
+        if check_packages:
+            results["package_vulnerabilities"] = self._check_package_vulnerabilities()
+            
+        if check_integrity:
+            results["integrity"] = self._check_integrity()
+            
         return results
         
     def _check_cis_compliance(self):
-        """Check CIS compliance for Python environment"""
-        compliance_results = {}
-        
-        # Check directory permissions
-        compliance_results["directory_permissions"] = self._check_directory_permissions()
-        
-        # Check for secure Python configurations
-        compliance_results["python_config"] = self._check_python_security_config()
-        
-        # Check for insecure environment variables
-        compliance_results["environment_vars"] = self._check_environment_variables()
-        
-        return compliance_results
+        """Run every registered CIS check, sharing probe results between them"""
+        return self.cis_registry.run(self.check_context())
         
-    def _check_directory_permissions(self):
-        """Check directory permissions for security compliance"""
-        results = {"status": "pass", "issues": []}
-        
-        # Check pyenv directory permissions
-        if self.pyenv_root.exists():
-            mode = oct(self.pyenv_root.stat().st_mode)[-3:]
-            if int(mode) > 755:
-                results["status"] = "fail"
-                results["issues"].append({
-                    "severity": "medium",
-                    "description": f"PyEnv root directory has too open permissions: {mode}",
-                    "recommendation": "Run: chmod 755 ~/.pyenv"
-                })
-                
-        return results
-        
-    def _check_python_security_config(self):
-        """Check Python security configurations"""
-        results = {"status": "pass", "checks": []}
-        
-        # Check for secure SSL/TLS settings
-        try:
-            result = subprocess.run(
-                ["python3", "-c", "import ssl; print(ssl.OPENSSL_VERSION)"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                results["checks"].append({
-                    "name": "OpenSSL Version",
-                    "result": result.stdout.strip(),
-                    "status": "info"
-                })
-        except Exception:
-            pass
-            
-        return results
+    def iter_permission_findings(self):
+        """Stream permission and ownership findings for pyenv versions, site-packages and venvs"""
+        return PermissionAuditor().audit(audit_roots(self.pyenv_root, self._get_installations()))
         
-    def _check_environment_variables(self):
-        """Check for insecure environment variables"""
-        results = {"status": "pass", "issues": []}
+    def iter_integrity_findings(self, verifier=None):
+        """Stream files that no longer match the hashes in their RECORD"""
+        verifier = verifier or IntegrityVerifier()
+        return verifier.verify_installations(self._get_installations())
         
-        # Check for dangerous environment variables
-        dangerous_vars = {
-            "PYTHONPATH": "May cause import issues",
-            "PYTHON_DISABLE_SSL": "Disables SSL verification",
-            "PYTHON_NO_USER_SITE": "May affect package installations"
-        }
+    def _check_integrity(self):
+        """Verify installed files of every distribution against RECORD"""
+        verifier = IntegrityVerifier()
+        findings = list(self.iter_integrity_findings(verifier))
+        return {"status": "fail" if findings else "pass", "findings": findings, "stats": dict(verifier.stats)}
         
-        for var, description in dangerous_vars.items():
-            if os.environ.get(var):
-                results["status"] = "fail"
-                results["issues"].append({
-                    "severity": "medium",
-                    "variable": var,
-                    "value": os.environ[var],
-                    "description": description
-                })
-                
-        return results
+    def check_context(self) -> CheckContext:
+        return CheckContext(self.pyenv_root, self._get_installations)
         
     def _check_vulnerabilities(self):
-        """Check for known vulnerabilities in Python versions"""
-        results = {"status": "checking", "vulnerabilities": []}
+        """Check interpreters and their OpenSSL, expat and sqlite against known CVEs"""
+        results = {"status": "pass", "vulnerabilities": []}
         
-        # Get installed Python versions
         try:
-            versions = self._get_installed_python_versions()
-            for version in versions:
-                # Placeholder for actual CVE checking
+            installations = self._get_installations()
+            found = CPythonAdvisories.load().lookup_many(installations)
+            for installation in installations:
+                cves = found[installation.path]
+                if cves:
+                    results["status"] = "fail"
+                if not CPythonAdvisories.applies(installation):
+                    status = "unchecked"  # not a probed CPython
+                else:
+                    status = "vulnerable" if cves else "clean"
                 results["vulnerabilities"].append({
-                    "version": version,
-                    "cves": [],
-                    "status": "clean"
+                    "interpreter": installation.path,
+                    "version": installation.version,
+                    "cves": cves,
+                    "status": status
                 })
         except Exception as e:
             results["status"] = "error"
@@ -116,23 +87,30 @@ class SecurityAuditor:
             
         return results
         
+    def _check_package_vulnerabilities(self):
+        """Match installed packages against the local advisory database"""
+        results = {"status": "pass", "installations": {}}
+        scanner = VulnerabilityScanner(online=False)
+        if scanner.db.is_empty():
+            results["status"] = "error"
+            results["error"] = "Advisory database is empty; run `pyenvdoctor update-db` first"
+            return results
+        
+        installations = InventoryReader().inventory(self._get_installations())
+        for path, found in scanner.scan_installations(installations).items():
+            if found:
+                results["status"] = "fail"
+                results["installations"][path] = found
+        return results
+        
     def _get_installed_python_versions(self):
         """Get list of installed Python versions"""
-        versions = []
-        
-        # Check system Python
-        try:
-            result = subprocess.run(["python3", "--version"], capture_output=True, text=True)
-            if result.returncode == 0:
-                versions.append(result.stdout.strip())
-        except:
-            pass
-            
-        # Check pyenv versions
-        versions_dir = self.pyenv_root / "versions"
-        if versions_dir.exists():
-            for version_dir in versions_dir.iterdir():
-                if version_dir.is_dir():
-                    versions.append(version_dir.name)
-                    
-        return versions
+        return [installation.version for installation in self._get_installations()]
+        
+    def _get_installations(self):
+        """Probe installations once and share them between checks"""
+        if self._installations is None:
+            scanner = SystemScanner(probe_engine=self.probe_engine, deadline=self.deadline)
+            scanner.scan()
+            self._installations = scanner.get_installations()
+        return self._installations
@@ -0,0 +1,162 @@
+import os
+import stat
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from ..core.models import PythonInstallation
+from ..utils.plugins import load_entry_points
+from .permission_audit import PermissionAuditor, audit_roots, describe
+
+ENTRY_POINT_GROUP = "pyenvdoctor.cis_checks"
+
+# Cost classes, cheapest first. The runner starts the most expensive
+# checks first so they do not end up alone at the tail of the run.
+COSTS = ("cheap", "probe", "expensive")
+
+class CheckContext:
+    """Inputs shared by every check of one audit run.
+
+    Probe reports are loaded at most once, by whichever check asks first;
+    checks running concurrently wait for that same result.
+    """
+
+    def __init__(self, pyenv_root: Path, load_installations: Callable[[], List[PythonInstallation]],
+                 environ: Optional[Mapping[str, str]] = None):
+        self.pyenv_root = pyenv_root
+        self.environ = os.environ if environ is None else environ
+        self._load_installations = load_installations
+        self._installations: Optional[List[PythonInstallation]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def installations(self) -> List[PythonInstallation]:
+        with self._lock:
+            if self._installations is None:
+                self._installations = self._load_installations()
+            return self._installations
+
+class CISCheck(ABC):
+    """A compliance check run by `audit --cis`.
+
+    Subclasses set `name` and a `cost` from COSTS, which the runner uses
+    to start expensive checks first. `run` returns a dict with a "status"
+    of pass or fail plus check-specific details such as "issues". Other
+    packages can publish checks under ENTRY_POINT_GROUP.
+    """
+
+    name = "base"
+    cost = "cheap"
+
+    @abstractmethod
+    def run(self, context: CheckContext) -> Dict[str, Any]:
+        pass
+
+class DirectoryPermissionsCheck(CISCheck):
+    name = "directory_permissions"
+    cost = "expensive"
+    max_issues = 200
+
+    def run(self, context: CheckContext) -> Dict[str, Any]:
+        results = {"status": "pass", "issues": [], "findings": 0}
+        for finding in PermissionAuditor().audit(audit_roots(context.pyenv_root, context.installations)):
+            results["status"] = "fail"
+            results["findings"] += 1
+            if len(results["issues"]) < self.max_issues:
+                results["issues"].append(dict(finding, description=describe(finding)))
+        if context.pyenv_root.exists():
+            mode = stat.S_IMODE(context.pyenv_root.stat().st_mode)
+            if mode & 0o022:
+                results["status"] = "fail"
+                results["issues"].insert(0, {
+                    "severity": "medium",
+                    "description": f"PyEnv root directory has too open permissions: {oct(mode)[2:]}",
+                    "recommendation": "Run: chmod go-w ~/.pyenv"
+                })
+        return results
+
+class PythonSecurityConfigCheck(CISCheck):
+    name = "python_config"
+    cost = "probe"
+
+    def run(self, context: CheckContext) -> Dict[str, Any]:
+        results = {"status": "pass", "checks": []}
+        # Check for secure SSL/TLS settings, reusing the scanner's probe reports
+        for installation in context.installations:
+            if installation.openssl_version:
+                results["checks"].append({
+                    "name": "OpenSSL Version",
+                    "interpreter": installation.path,
+                    "result": installation.openssl_version,
+                    "status": "info"
+                })
+        return results
+
+class EnvironmentVariablesCheck(CISCheck):
+    name = "environment_vars"
+    dangerous_vars = {
+        "PYTHONPATH": "May cause import issues",
+        "PYTHON_DISABLE_SSL": "Disables SSL verification",
+        "PYTHON_NO_USER_SITE": "May affect package installations"
+    }
+
+    def run(self, context: CheckContext) -> Dict[str, Any]:
+        results = {"status": "pass", "issues": []}
+        for var, description in self.dangerous_vars.items():
+            if context.environ.get(var):
+                results["status"] = "fail"
+                results["issues"].append({
+                    "severity": "medium",
+                    "variable": var,
+                    "value": context.environ[var],
+                    "description": description
+                })
+        return results
+
+BUILTIN_CHECKS = [
+    DirectoryPermissionsCheck,
+    PythonSecurityConfigCheck,
+    EnvironmentVariablesCheck,
+]
+
+def _entry_point_checks() -> List[type]:
+    """Check classes published by other packages under ENTRY_POINT_GROUP"""
+    return load_entry_points(ENTRY_POINT_GROUP)
+
+class CheckRegistry:
+    """Runs registered CIS checks concurrently and times each of them"""
+
+    def __init__(self, checks: Optional[List[CISCheck]] = None, load_entry_points: bool = True):
+        if checks is None:
+            classes = list(BUILTIN_CHECKS)
+            if load_entry_points:
+                classes.extend(_entry_point_checks())
+            checks = [cls() for cls in classes]
+        self.checks: List[CISCheck] = list(checks)
+
+    def register(self, check: CISCheck):
+        self.checks.append(check)
+
+    def run(self, context: CheckContext, max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Results keyed by check name in registration order, each with its duration_ms"""
+        if not self.checks:
+            return {}
+        ordered = sorted(self.checks, key=lambda check: -COSTS.index(check.cost) if check.cost in COSTS else 0)
+        workers = max_workers or min(len(ordered), 8)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyenvdoctor-cis") as pool:
+            futures = {id(check): pool.submit(self._timed_run, check, context) for check in ordered}
+            return {check.name: futures[id(check)].result() for check in self.checks}
+
+    @staticmethod
+    def _timed_run(check: CISCheck, context: CheckContext) -> Dict[str, Any]:
+        start = time.monotonic()
+        try:
+            result = dict(check.run(context))
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        result["cost"] = check.cost
+        result["duration_ms"] = round((time.monotonic() - start) * 1000, 1)
+        return result
@@ -0,0 +1,177 @@
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.models import PythonInstallation
+
+BUNDLED_TABLE = Path(__file__).with_name("cpython_advisories.json")
+
+VERSION_NUMBER = re.compile(r"(\d+(?:\.\d+)*)([a-z]*)")
+
+# Upper bound of intervals that are still open
+UNBOUNDED = (float("inf"),)
+
+Key = Tuple[float, ...]
+
+def version_key(component: str, text: Optional[str]) -> Optional[Key]:
+    """Comparable key for a component version string; None when it cannot be ordered.
+
+    CPython pre-releases count as their final release (fixes land before
+    the first candidate), and OpenSSL 1.x letter releases sort after the
+    plain number: 1.1.1 < 1.1.1a < 1.1.1z < 1.1.1za.
+    """
+    if not text:
+        return None
+    if component == "openssl" and not text.startswith("OpenSSL") and not text[0].isdigit():
+        return None  # LibreSSL and BoringSSL number their releases differently
+    match = VERSION_NUMBER.search(text)
+    if match is None:
+        return None
+    numbers = [int(part) for part in match.group(1).split(".")][:3]
+    numbers += [0] * (3 - len(numbers))
+    letters = match.group(2) if component == "openssl" else ""
+    suffix = 26 * (len(letters) - 1) + ord(letters[-1]) - 96 if letters else 0
+    return tuple(numbers) + (suffix,)
+
+class IntervalTree:
+    """Static interval tree answering "which intervals contain this point".
+
+    Intervals are sorted by start and stored as an implicit balanced binary
+    tree over that array, each node holding the largest end below it, so a
+    stabbing query skips every subtree that ends before the point or starts
+    after it.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Key, Key, bool, Any]]):
+        self._intervals = sorted(intervals, key=lambda interval: interval[0])
+        self._max_end: List[Key] = [()] * len(self._intervals)
+        self._build(0, len(self._intervals))
+
+    def _build(self, low: int, high: int) -> Key:
+        if low >= high:
+            return ()
+        middle = (low + high) // 2
+        end = max(self._intervals[middle][1], self._build(low, middle), self._build(middle + 1, high))
+        self._max_end[middle] = end
+        return end
+
+    def stab(self, point: Key) -> List[Any]:
+        """Payloads of the intervals containing the point, in start order"""
+        found: List[Any] = []
+        self._stab(point, 0, len(self._intervals), found)
+        return found
+
+    def _stab(self, point: Key, low: int, high: int, found: List[Any]):
+        if low >= high:
+            return
+        middle = (low + high) // 2
+        if self._max_end[middle] < point:
+            return  # everything in this subtree ended earlier
+        self._stab(point, low, middle, found)
+        start, end, inclusive, payload = self._intervals[middle]
+        if start > point:
+            return  # so does everything to the right
+        if point < end or (inclusive and point == end):
+            found.append(payload)
+        self._stab(point, middle + 1, high, found)
+
+class CPythonAdvisories:
+    """Security advisories for CPython and the libraries it links.
+
+    The table ships with the package and a newer copy can be installed in
+    ~/.pyenvdoctor. Each component (cpython, openssl, expat, sqlite) gets
+    its own interval tree, and results are memoized per component version,
+    so checking an interpreter is a handful of in-memory tree queries.
+    """
+
+    COMPONENTS = {
+        "cpython": lambda install: install.probe.get("version"),
+        "openssl": lambda install: install.openssl_version,
+        "expat": lambda install: install.expat_version,
+        "sqlite": lambda install: install.sqlite_version,
+    }
+
+    def __init__(self, table: Dict[str, Any]):
+        self.updated = table.get("updated")
+        self.advisories = table.get("advisories", [])
+        intervals: Dict[str, list] = {component: [] for component in self.COMPONENTS}
+        for advisory in self.advisories:
+            component = advisory.get("component", "cpython")
+            if component not in intervals:
+                continue
+            for affected in advisory.get("affected", []):
+                start = version_key(component, affected.get("introduced")) or ()
+                if affected.get("fixed"):
+                    end, inclusive = version_key(component, affected["fixed"]), False
+                else:
+                    end, inclusive = version_key(component, affected.get("last_affected")), True
+                intervals[component].append((start, end or UNBOUNDED, inclusive, advisory))
+        self._trees = {component: IntervalTree(entries) for component, entries in intervals.items()}
+        self._memo: Dict[Tuple[str, Key], List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'CPythonAdvisories':
+        """The bundled table, or the installed copy when it is newer"""
+        candidates = [Path(path)] if path else [BUNDLED_TABLE, cls.installed_path()]
+        best = None
+        for candidate in candidates:
+            try:
+                with open(candidate, encoding="utf-8") as f:
+                    table = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if best is None or str(table.get("updated", "")) > str(best.get("updated", "")):
+                best = table
+        return cls(best or {})
+
+    @staticmethod
+    def installed_path() -> Path:
+        return Path.home() / ".pyenvdoctor" / "cpython_advisories.json"
+
+    @classmethod
+    def install(cls, source: str) -> 'CPythonAdvisories':
+        """Validate a table file and install it as the local copy"""
+        with open(source, encoding="utf-8") as f:
+            table = json.load(f)
+        if not isinstance(table.get("advisories"), list):
+            raise ValueError(f"{source} is not a CPython advisory table")
+        destination = cls.installed_path()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, destination)
+        return cls(table)
+
+    @staticmethod
+    def applies(install: PythonInstallation) -> bool:
+        """Whether the interpreter was probed as a working CPython.
+
+        Unprobed installs only have a directory name for a version, which
+        reads as CPython 3.0 for conda or 3.9 for pypy3.9-7.3.11.
+        """
+        return bool(install.is_valid and install.probe and install.probe.get("version")
+                    and install.implementation == "CPython")
+
+    def lookup(self, install: PythonInstallation) -> List[Dict[str, Any]]:
+        """Advisories affecting an interpreter or the OpenSSL, expat and sqlite it uses"""
+        if not self.applies(install):
+            return []
+        found = []
+        for component, version_of in self.COMPONENTS.items():
+            key = version_key(component, version_of(install))
+            if key is None:
+                continue
+            memo_key = (component, key)
+            if memo_key not in self._memo:
+                self._memo[memo_key] = [
+                    {"id": advisory["id"], "component": component, "version": version_of(install),
+                     "severity": advisory.get("severity", "medium"), "summary": advisory.get("summary"),
+                     "fixed_in": sorted({a["fixed"] for a in advisory.get("affected", []) if a.get("fixed")},
+                                        key=lambda fixed: version_key(component, fixed))}
+                    for advisory in self._trees[component].stab(key)
+                ]
+            found.extend(self._memo[memo_key])
+        return found
+
+    def lookup_many(self, installations: Iterable[PythonInstallation]) -> Dict[str, List[Dict[str, Any]]]:
+        return {install.path: self.lookup(install) for install in installations}
@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.config import config
+from ..core.models import PythonInstallation
+from ..scanner.inventory import Distribution, InventoryReader, RecordEntry
+from ..utils.storage import Storage
+
+CACHE_VERSION = 2
+
+CHUNK_SIZE = 1 << 20
+
+def record_digest(path: str, algorithm: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Digest of a file in RECORD notation: urlsafe base64 without padding"""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    # Unbuffered reads straight into one large buffer; hashlib releases
+    # the GIL while hashing it, so several files hash in parallel
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return base64.urlsafe_b64encode(digest.digest()).rstrip(b"=").decode("ascii")
+
+class IntegrityVerifier:
+    """Checks installed files against the hashes in their *.dist-info/RECORD.
+
+    Files are hashed on a thread pool with large unbuffered reads. A file
+    that matched once is remembered with its inode, size, mtime and ctime
+    (and the expected digest), so later runs only hash files that changed;
+    utime can restore an mtime after a same-size rewrite, but any write
+    moves the ctime.
+    Findings are yielded as soon as each file is checked.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, enabled: Optional[bool] = None,
+                 max_workers: Optional[int] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "integrity.json")
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.stats = {"files": 0, "hashed": 0, "cached": 0, "bytes_hashed": 0}
+        self._lock = threading.Lock()
+        self._known: Optional[Dict[str, List]] = None
+        self._dirty = False
+
+    def verify_installations(self, installations: Iterable[PythonInstallation],
+                             reader: Optional[InventoryReader] = None) -> Iterator[Dict[str, Any]]:
+        """Findings for every distribution in the installations' site-packages"""
+        reader = reader or InventoryReader()
+        directories = sorted({directory for install in installations for directory in install.site_packages})
+        distributions = [dist for directory in directories for dist in reader.distributions(directory)]
+        reader.flush()
+        return self.verify(distributions)
+
+    def verify(self, distributions: Iterable[Distribution], flush: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield a finding for every missing, resized or modified file"""
+        known = self._load()
+        window = self.max_workers * 4
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyenvdoctor-hash") as pool:
+            pending = {}
+            for dist, entry in self._entries(distributions):
+                self.stats["files"] += 1
+                try:
+                    st = os.stat(entry.path)
+                except OSError:
+                    yield self._finding(dist, entry, "missing")
+                    continue
+                if entry.size is not None and st.st_size != entry.size:
+                    yield self._finding(dist, entry, "size_mismatch", actual=st.st_size)
+                    continue
+                stamp = [st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns, entry.digest]
+                if known.get(entry.path) == stamp:
+                    self.stats["cached"] += 1
+                    continue
+                future = pool.submit(record_digest, entry.path, entry.algorithm)
+                pending[future] = (dist, entry, stamp)
+                if len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._collect(done, pending, known)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._collect(done, pending, known)
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """Persist the known-good file records"""
+        with self._lock:
+            if self._dirty and self.enabled:
+                self.storage.save({"version": CACHE_VERSION, "files": self._known})
+            self._dirty = False
+
+    def _collect(self, done, pending, known) -> Iterator[Dict[str, Any]]:
+        for future in done:
+            dist, entry, stamp = pending.pop(future)
+            try:
+                actual = future.result()
+            except OSError as e:
+                yield self._finding(dist, entry, "unreadable", actual=str(e))
+                continue
+            self.stats["hashed"] += 1
+            self.stats["bytes_hashed"] += stamp[1]
+            if actual == entry.digest:
+                known[entry.path] = stamp
+            else:
+                known.pop(entry.path, None)
+                yield self._finding(dist, entry, "modified", actual=f"{entry.algorithm}={actual}")
+            self._dirty = True
+
+    @staticmethod
+    def _entries(distributions: Iterable[Distribution]) -> Iterator[Tuple[Distribution, RecordEntry]]:
+        for dist in distributions:
+            try:
+                entries = list(dist.read_record())
+            except OSError:
+                continue
+            for entry in entries:
+                # RECORD lists itself, signatures and .pyc files without a hash
+                if entry.digest and entry.algorithm in hashlib.algorithms_guaranteed:
+                    yield dist, entry
+
+    @staticmethod
+    def _finding(dist: Distribution, entry: RecordEntry, kind: str, actual: Any = None) -> Dict[str, Any]:
+        return {
+            "package": dist.name,
+            "version": dist.version,
+            "path": entry.path,
+            "kind": kind,
+            "severity": "high" if kind == "modified" else "medium",
+            "expected": f"{entry.algorithm}={entry.digest}" if kind != "size_mismatch" else entry.size,
+            "actual": actual
+        }
+
+    def _load(self) -> Dict[str, List]:
+        with self._lock:
+            if self._known is None:
+                data = (self.storage.load() or {}) if self.enabled else {}
+                self._known = data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+            return self._known
@@ -0,0 +1,171 @@
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.config import config, parse_duration
+from ..core.models import PythonInstallation
+from ..utils.fswalk import ParallelWalker
+from ..utils.storage import Storage
+
+CACHE_VERSION = 2
+
+SEVERITY = {"world_writable": "high", "foreign_owner": "medium", "group_writable": "low"}
+
+def file_findings(path: str, st: os.stat_result, owner: int) -> List[Dict[str, Any]]:
+    """Permission problems of one lstat result in a tree owned by `owner`"""
+    if stat.S_ISLNK(st.st_mode):
+        return []  # a symlink's own mode is meaningless
+    mode = stat.S_IMODE(st.st_mode)
+    found = []
+    if stat.S_ISDIR(st.st_mode) and mode & stat.S_ISVTX:
+        pass  # shared, sticky directories such as tmp/ are meant to be writable
+    elif mode & 0o002:
+        found.append("world_writable")
+    elif mode & 0o020:
+        found.append("group_writable")
+    if st.st_uid not in (owner, 0):
+        found.append("foreign_owner")
+    return [{"path": path, "kind": kind, "severity": SEVERITY[kind], "mode": oct(mode), "uid": st.st_uid}
+            for kind in found]
+
+def describe(finding: Dict[str, Any]) -> str:
+    if finding["kind"] == "foreign_owner":
+        return f"{finding['path']} is owned by another user (uid {finding['uid']})"
+    who = "anyone" if finding["kind"] == "world_writable" else "its group"
+    return f"{finding['path']} is writable by {who} ({finding['mode'][2:]})"
+
+def audit_roots(pyenv_root: Optional[Path], installations: Iterable[PythonInstallation]) -> List[str]:
+    """pyenv versions, site-packages and venvs, without roots nested in other roots"""
+    roots = []
+    if pyenv_root is not None:
+        roots.append(str(pyenv_root / "versions"))
+    for install in installations:
+        roots.extend(install.site_packages)
+        if install.prefix and install.prefix != install.base_prefix:
+            roots.append(install.prefix)  # a venv owns its whole prefix
+    roots = sorted({os.path.abspath(root) for root in roots if os.path.isdir(root)})
+    kept: List[str] = []
+    for root in roots:
+        if not any(root.startswith(parent.rstrip(os.sep) + os.sep) for parent in kept):
+            kept.append(root)
+    return kept
+
+class PermissionAuditor:
+    """Parallel audit of file modes and owners across whole trees.
+
+    Every directory is read with one scandir and its entries lstat'ed on
+    the walker's threads; findings are yielded as each directory is done.
+    A directory's entry names are cached with its mtime and ctime, so
+    repeat audits skip listing directories whose entries did not change
+    (up to `security.permission_cache_ttl`). Entries are always lstat'ed
+    again: a chmod or chown of a file does not touch its parent directory.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, enabled: Optional[bool] = None,
+                 max_workers: Optional[int] = None, ttl: Optional[float] = None):
+        self.enabled = config.get("scanner.cache_results", True) if enabled is None else enabled
+        self.ttl = parse_duration(config.get("security.permission_cache_ttl", "1d")) if ttl is None else ttl
+        self.storage = Storage(cache_path or Path.home() / ".pyenvdoctor" / "cache" / "permissions.json")
+        self.walker = ParallelWalker(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._records: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    def audit(self, roots: Iterable[str], flush: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield findings for every file and directory under the roots"""
+        records = self._load()
+        roots = [os.path.abspath(root) for root in roots]
+        owners = {}
+        for root in roots:
+            try:
+                st = os.lstat(root)
+            except OSError:
+                continue
+            owners[root] = st.st_uid
+            yield from file_findings(root, st, st.st_uid)
+        now = time.time()
+
+        def owner_of(directory):
+            return owners.get(directory) if directory in owners else next(
+                (uid for root, uid in owners.items() if directory.startswith(root.rstrip(os.sep) + os.sep)), -1)
+
+        def shortcut(directory, depth):
+            cached = records.get(directory)
+            if cached is None or now - cached["checked"] > self.ttl:
+                return None
+            try:
+                st = os.lstat(directory)
+            except OSError:
+                return None
+            if [st.st_mtime_ns, st.st_ctime_ns] != cached["stamp"] or cached["owner"] != owner_of(directory):
+                return None
+            findings = []
+            for name in cached["entries"]:
+                path = os.path.join(directory, name)
+                try:
+                    entry_stat = os.lstat(path)
+                except OSError:
+                    return None  # changed while we looked; list it again
+                findings.extend(file_findings(path, entry_stat, cached["owner"]))
+            return (directory, None, findings), [os.path.join(directory, name) for name in cached["subdirs"]]
+
+        def visit(directory, entries, depth):
+            record, findings = self._examine(directory, entries, owner_of(directory), now)
+            return (directory, record, findings), [os.path.join(directory, name) for name in record["subdirs"]]
+
+        seen = set()
+        for directory, record, findings in self.walker.walk(list(owners), visit, shortcut):
+            seen.add(directory)
+            if record is not None:
+                records[directory] = record
+                self._dirty = True
+            yield from findings
+
+        # Drop records of directories that vanished from the audited trees
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in owners)
+        for directory in [d for d in records if d.startswith(prefixes) or d in owners]:
+            if directory not in seen:
+                del records[directory]
+                self._dirty = True
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """Persist the directory records"""
+        with self._lock:
+            if self._dirty and self.enabled:
+                self.storage.save({"version": CACHE_VERSION, "records": self._records})
+            self._dirty = False
+
+    @staticmethod
+    def _examine(directory: str, entries: List[os.DirEntry], owner: int,
+                 now: float) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        try:
+            st = os.lstat(directory)
+            stamp = [st.st_mtime_ns, st.st_ctime_ns]
+        except OSError:
+            stamp = None
+        findings = []
+        names = []
+        subdirs = []
+        for entry in entries:
+            try:
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            names.append(entry.name)
+            findings.extend(file_findings(entry.path, entry_stat, owner))
+            if stat.S_ISDIR(entry_stat.st_mode):
+                subdirs.append(entry.name)
+        record = {"stamp": stamp, "owner": owner, "checked": now, "entries": names, "subdirs": subdirs}
+        return record, findings
+
+    def _load(self) -> Dict[str, Dict]:
+        with self._lock:
+            if self._records is None:
+                data = (self.storage.load() or {}) if self.enabled else {}
+                self._records = data.get("records", {}) if data.get("version") == CACHE_VERSION else {}
+            return self._records
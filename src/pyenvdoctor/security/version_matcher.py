@@ -0,0 +1,115 @@
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from packaging.version import InvalidVersion, Version
+
+from ..scanner.inventory import canonicalize_name
+
+class CompiledRanges:
+    """Advisories of one package compiled into sorted, pre-parsed intervals"""
+
+    __slots__ = ("advisories", "starts", "intervals", "open_start", "explicit")
+
+    def __init__(self):
+        self.advisories: List[Dict[str, Any]] = []
+        # Intervals with a lower bound, sorted by it: starts[i] belongs to intervals[i]
+        self.starts: List[Version] = []
+        self.intervals: List[Tuple[Optional[Version], bool, int]] = []
+        # Intervals affecting everything below their upper bound
+        self.open_start: List[Tuple[Optional[Version], bool, int]] = []
+        self.explicit: Dict[Union[Version, str], List[int]] = defaultdict(list)
+
+    def affected(self, version: Union[Version, str]) -> List[int]:
+        """Indexes of the advisories affecting a version, in advisory order"""
+        hits = set(self.explicit.get(version, ()))
+        if isinstance(version, Version):
+            candidates = self.intervals[:bisect_right(self.starts, version)]
+            for end, inclusive, index in self.open_start + candidates:
+                if end is None or version < end or (inclusive and version == end):
+                    hits.add(index)
+        return sorted(hits)
+
+class VersionMatcher:
+    """Batched matching of installed package versions against advisory ranges.
+
+    Every version string is parsed once and interned, and each package's
+    advisories are compiled once into intervals sorted by lower bound, so a
+    match is a bisect plus a few comparisons of already parsed versions.
+    `match` takes every (package, version) pair of a scan or a fleet at
+    once and evaluates each distinct pair a single time.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, Union[Version, str]] = {}
+        self._compiled: Dict[str, CompiledRanges] = {}
+
+    def version(self, text: str) -> Union[Version, str]:
+        """The interned parsed version, or the raw string when it is not PEP 440"""
+        version = self._versions.get(text)
+        if version is None:
+            try:
+                version = Version(text)
+            except InvalidVersion:
+                version = text
+            self._versions[text] = version
+        return version
+
+    def compile(self, package: str, advisories: Iterable[Dict[str, Any]]) -> CompiledRanges:
+        """Compile advisories shaped like `AdvisoryDB.lookup` results for one package"""
+        compiled = CompiledRanges()
+        bounded = []
+        for advisory in advisories:
+            index = len(compiled.advisories)
+            fixed_in = sorted({r["fixed"] for r in advisory.get("ranges", ()) if r.get("fixed")},
+                              key=self._sort_key)
+            compiled.advisories.append({"id": advisory["id"], "aliases": advisory.get("aliases", []),
+                                        "summary": advisory.get("summary"), "fixed_in": fixed_in})
+            for version_range in advisory.get("ranges", ()):
+                start = self._bound(version_range.get("introduced"))
+                if version_range.get("fixed"):
+                    end, inclusive = self._bound(version_range["fixed"]), False
+                else:
+                    end, inclusive = self._bound(version_range.get("last_affected")), True
+                if isinstance(start, str) or isinstance(end, str):
+                    continue  # bounds outside PEP 440 cannot be ordered
+                if start is None:
+                    compiled.open_start.append((end, inclusive, index))
+                else:
+                    bounded.append((start, end, inclusive, index))
+            for version in advisory.get("versions", ()):
+                compiled.explicit[self.version(version)].append(index)
+        bounded.sort(key=lambda interval: interval[0])
+        compiled.starts = [start for start, _, _, _ in bounded]
+        compiled.intervals = [(end, inclusive, index) for _, end, inclusive, index in bounded]
+        self._compiled[canonicalize_name(package)] = compiled
+        return compiled
+
+    def match(self, pairs: Iterable[Tuple[str, str]],
+              load: Callable[[List[str]], Dict[str, List[Dict[str, Any]]]]) -> Dict[Tuple[str, str], List[Dict]]:
+        """Advisories per distinct (canonical package, version); `load` fetches uncompiled packages"""
+        wanted: Dict[Tuple[str, str], None] = {}
+        for package, version in pairs:
+            wanted[(canonicalize_name(package), version)] = None
+        missing = sorted({package for package, _ in wanted if package not in self._compiled})
+        if missing:
+            loaded = load(missing)
+            for package in missing:
+                self.compile(package, loaded.get(package, ()))
+
+        results = {}
+        for package, version in wanted:
+            compiled = self._compiled[package]
+            if not compiled.advisories:
+                results[(package, version)] = []
+                continue
+            results[(package, version)] = [compiled.advisories[index]
+                                           for index in compiled.affected(self.version(version))]
+        return results
+
+    def _bound(self, text: Optional[str]) -> Union[Version, str, None]:
+        return self.version(text) if text else None
+
+    def _sort_key(self, text: str):
+        version = self.version(text)
+        return (0, version, "") if isinstance(version, Version) else (1, Version("0"), version)
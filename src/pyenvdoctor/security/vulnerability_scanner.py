@@ -1,14 +1,28 @@
-import requests
-from packaging.version import parse
-from typing import List, Dict
+from typing import Any, List, Dict, Iterable, Optional, Tuple
 from ..core.models import PythonInstallation
+from ..scanner.inventory import canonicalize_name
+from .advisory_db import AdvisoryDB
+from .advisory_fetcher import AdvisoryFetcher
+from .version_matcher import VersionMatcher
 
 class VulnerabilityScanner:
-    def __init__(self):
-        self.db_url = "https://pypi.org/pypi/{package}/json"
+    def __init__(self, db: Optional[AdvisoryDB] = None, online: bool = True,
+                 fetcher: Optional[AdvisoryFetcher] = None):
+        self.db = db or AdvisoryDB()
+        self.online = online
+        self.fetcher = fetcher
+        self.matcher = VersionMatcher()
+        self.db_url = "https://pypi.org/pypi/{package}/{version}/json"
         self.cache = {}
 
+    def scan_installations(self, installations: Iterable[PythonInstallation]) -> Dict[str, Dict[str, List]]:
+        """Scan many installations, looking up each distinct (package, version) once"""
+        installations = list(installations)
+        self._lookup((pkg, version) for install in installations for pkg, version in install.packages.items())
+        return {install.path: self.scan_installation(install) for install in installations}
+
     def scan_installation(self, install: PythonInstallation) -> Dict[str, List]:
+        self._lookup(install.packages.items())
         results = {}
         for pkg, version in install.packages.items():
             vulns = self._check_package(pkg, version)
@@ -17,12 +31,41 @@ class VulnerabilityScanner:
         return results
 
     def _check_package(self, pkg: str, version: str):
-        try:
-            response = requests.get(self.db_url.format(package=pkg))
-            data = response.json()
-            return [
-                v for v in data.get('vulnerabilities', [])
-                if parse(version) <= parse(v['fixed_in'])
-            ]
-        except Exception:
+        key = (canonicalize_name(pkg), version)
+        if key not in self.cache:
+            self._lookup([(pkg, version)])
+        return self.cache.get(key, [])
+
+    def _lookup(self, packages: Iterable[Tuple[str, str]]):
+        """Resolve every uncached (package, version) in one batch, offline when the database has data"""
+        missing = {}
+        for pkg, version in packages:
+            key = (canonicalize_name(pkg), version)
+            if key not in self.cache:
+                missing[key] = None
+        if not missing:
+            return
+        if not self.db.is_empty():
+            self.cache.update(self.matcher.match(missing, self.db.lookup_many))
+        elif self.online:
+            self._fetch_online(list(missing))
+
+    def _fetch_online(self, keys: List[Tuple[str, str]]):
+        """Fetch the advisories of many releases concurrently from the PyPI JSON API"""
+        urls = {key: self.db_url.format(package=key[0], version=key[1]) for key in keys}
+        if self.fetcher is None:
+            self.fetcher = AdvisoryFetcher()
+        documents = self.fetcher.fetch_many(urls.values())
+        for key, url in urls.items():
+            self.cache[key] = self._parse_online(documents.get(url))
+
+    @staticmethod
+    def _parse_online(data: Optional[Dict[str, Any]]):
+        """Advisories of one release from a PyPI JSON API document"""
+        if not isinstance(data, dict):
             return []
+        return [
+            {"id": v.get("id"), "aliases": v.get("aliases", []), "summary": v.get("summary") or v.get("details"),
+             "fixed_in": v.get("fixed_in", [])}
+            for v in data.get('vulnerabilities') or []
+        ]
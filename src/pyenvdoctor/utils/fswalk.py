@@ -0,0 +1,127 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# visit(path, entries, depth) -> (result or None, subdirectories to descend into)
+Visitor = Callable[[str, List[os.DirEntry], int], Tuple[Any, Sequence[str]]]
+# shortcut(path, depth) -> same tuple to skip reading the directory, or None
+Shortcut = Callable[[str, int], Optional[Tuple[Any, Sequence[str]]]]
+
+DEFAULT_PRUNE = frozenset({"node_modules", ".git", ".hg", ".svn", "site-packages", "__pycache__"})
+
+class ParallelWalker:
+    """Directory walker running os.scandir calls on a thread pool.
+
+    The visitor decides what to descend into, so callers can stop at a
+    venv root or skip whole subtrees. Results are streamed back as soon as
+    each directory is read; their order is not deterministic.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_depth: Optional[int] = None,
+                 follow_symlinks: bool = False):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+
+    def walk(self, roots: Iterable[str], visit: Visitor, shortcut: Optional[Shortcut] = None) -> Iterator[Any]:
+        """Yield every non-None visitor result for the trees under roots.
+
+        When given, shortcut is consulted before a directory is read; a
+        non-None answer (typically from a cache) replaces scandir + visit.
+        """
+        results: "queue.Queue[Tuple[bool, Any]]" = queue.Queue()
+        lock = threading.Lock()
+        stopped = threading.Event()
+        pending = [1]  # held by the caller until every root is submitted
+        seen = set()
+
+        def release():
+            with lock:
+                pending[0] -= 1
+                done = pending[0] == 0
+            if done:
+                results.put((True, None))
+
+        def admit(path):
+            if not self.follow_symlinks:
+                return True
+            # Symlinked directories can form cycles; visit each inode once
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            with lock:
+                if (st.st_dev, st.st_ino) in seen:
+                    return False
+                seen.add((st.st_dev, st.st_ino))
+            return True
+
+        def spawn(pool, work):
+            with lock:
+                pending[0] += 1
+            pool.submit(task, pool, work)
+
+        def task(pool, work):
+            # Each task walks its share depth-first and hands half of its
+            # backlog to the pool whenever a worker is idle, which keeps
+            # per-directory scheduling overhead low on huge trees.
+            try:
+                while work and not stopped.is_set():
+                    path, depth = work.pop()
+                    answer = shortcut(path, depth) if shortcut else None
+                    if answer is None:
+                        try:
+                            with os.scandir(path) as it:
+                                entries = list(it)
+                        except OSError:
+                            entries = []
+                        answer = visit(path, entries, depth)
+                    result, subdirs = answer
+                    if result is not None:
+                        results.put((False, result))
+                    if self.max_depth is None or depth < self.max_depth:
+                        work.extend((subdir, depth + 1) for subdir in subdirs if admit(subdir))
+                    if len(work) > 1 and pending[0] < self.max_workers:
+                        half = len(work) // 2
+                        spawn(pool, work[:half])
+                        del work[:half]
+            except Exception as e:
+                results.put((True, e))
+            finally:
+                release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyenvdoctor-walk") as pool:
+            roots = [os.path.abspath(root) for root in roots if os.path.isdir(root)]
+            if not roots:
+                return
+            for root in roots:
+                if admit(root):
+                    spawn(pool, [(root, 0)])
+            release()
+            try:
+                while True:
+                    is_control, value = results.get()
+                    if not is_control:
+                        yield value
+                    elif value is None:
+                        break
+                    else:
+                        raise value
+            finally:
+                # Abandoned or failed walks drain the queue without more I/O
+                stopped.set()
+
+    def subdirectories(self, entries: List[os.DirEntry], prune: Iterable[str] = DEFAULT_PRUNE) -> List[str]:
+        """Directory entries worth descending into"""
+        subdirs = []
+        for entry in entries:
+            if entry.name in prune:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                    subdirs.append(entry.path)
+            except OSError:
+                continue
+        return subdirs
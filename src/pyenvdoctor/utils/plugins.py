@@ -0,0 +1,22 @@
+from typing import List
+
+from .logging import get_logger
+
+def load_entry_points(group: str) -> List[object]:
+    """Objects published by other packages under an entry point group"""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        selected = eps.select(group=group)
+    else:
+        selected = eps.get(group, [])
+    loaded = []
+    for entry_point in selected:
+        try:
+            loaded.append(entry_point.load())
+        except Exception as e:
+            get_logger(__name__).warning(f"Could not load {group} plugin {entry_point.name}: {e}")
+    return loaded
@@ -12,10 +12,12 @@ class Storage:
         
     def load(self) -> Optional[Dict]:
         """Thread-safe load with file locking"""
-        if not self.file_path.exists():
+        try:
+            f = open(self.file_path, 'r')
+        except FileNotFoundError:
             return None
             
-        with open(self.file_path, 'r') as f:
+        with f:
             fcntl.flock(f.fileno(), fcntl.LOCK_SH)
             try:
                 return json.load(f)
@@ -0,0 +1,29 @@
+from src.pyenvdoctor.ai.fix_oracle import FixOracle
+from src.pyenvdoctor.core.models import Issue
+
+def issues():
+    return [Issue(description=f"missing {i}", type="permission_error", details={"path": f"/opt/{i % 3}"})
+            for i in range(300)]
+
+class TestFixOracle:
+    def test_batch_computes_each_fingerprint_once(self, mocker):
+        oracle = FixOracle(persist=False)
+        compute = mocker.spy(oracle, "_compute_fixes")
+        batch = oracle.suggest_fixes_batch(issues())
+        assert compute.call_count == 3
+        assert [s[0].command for s in batch[:3]] == [["chmod", "755", f"/opt/{i}"] for i in range(3)]
+
+        # Results are copies: editing one leaves the cache intact
+        batch[0][0].command.append("--oops")
+        assert oracle.suggest_fixes(issues()[0])[0].command == ["chmod", "755", "/opt/0"]
+        assert compute.call_count == 3
+
+    def test_lru_is_bounded_and_persisted(self, tmp_path):
+        oracle = FixOracle(cache_size=2, persist=True, cache_path=tmp_path / "fixes.json")
+        oracle.suggest_fixes_batch(issues()[:3])
+        assert len(oracle._cache) == 2
+        oracle.flush()
+
+        reloaded = FixOracle(cache_size=2, persist=True, cache_path=tmp_path / "fixes.json")
+        assert list(reloaded._cache) == list(oracle._cache)
+        assert reloaded.fingerprint(issues()[0]) not in reloaded._cache  # evicted first
@@ -0,0 +1,39 @@
+from src.pyenvdoctor.ai.fix_rules import RuleIndex
+from src.pyenvdoctor.core.models import Issue
+
+LINUX = {"system": "Linux", "distro": "fedora", "python_implementation": "CPython"}
+DARWIN = {"system": "Darwin", "distro": "", "python_implementation": "CPython"}
+
+def commands(suggestions):
+    return [s.command for s in suggestions]
+
+class TestRuleIndex:
+    def test_bundled_rules_keep_builtin_behaviour(self):
+        rules = RuleIndex.load(paths=[])
+        missing = Issue(description="x", type="missing_dependency", details={"dependency_name": "libffi"})
+        assert commands(rules.suggest(missing, DARWIN)) == [["brew", "install", "libffi"]]
+        assert commands(rules.suggest(missing, LINUX)) == [["sudo", "apt", "install", "-y", "libffi"]]
+        assert commands(rules.suggest(missing, {"system": "Windows"})) == []
+        assert rules.suggest(Issue(description="x", type="missing_dependency"), DARWIN)[0].description == \
+            "Install unknown using Homebrew"
+        assert commands(rules.suggest(Issue(description="x", type="odd"), LINUX)) == [
+            ["echo", "Please investigate manually"]]
+
+    def test_index_dispatch_predicates_and_priority(self, tmp_path):
+        (tmp_path / "site.json").write_text("""{"rules": [
+            {"id": "dnf", "type": "missing_dependency", "os": "Linux", "distro": "fedora", "priority": 10,
+             "description": "dnf {dependency_name}", "command": ["sudo", "dnf", "install", "{dependency_name}"]},
+            {"id": "pypy", "type": "missing_dependency", "platform": {"python_implementation": "PyPy"},
+             "description": "pypy", "command": ["pypy-fix"]},
+            {"id": "ssl", "type": "missing_dependency", "details": {"dependency_name": ["openssl*", "libssl*"]},
+             "description": "ssl {dependency_name} on {system}", "command": ["fix-ssl"]}
+        ]}""")
+        rules = RuleIndex.load(paths=[str(tmp_path)])
+        ssl = Issue(description="x", type="missing_dependency", details={"dependency_name": "libssl-dev"})
+        assert commands(rules.suggest(ssl, LINUX)) == [
+            ["sudo", "dnf", "install", "libssl-dev"], ["sudo", "apt", "install", "-y", "libssl-dev"], ["fix-ssl"]]
+        assert rules.suggest(ssl, LINUX)[2].description == "ssl libssl-dev on Linux"
+        assert commands(rules.suggest(ssl, dict(LINUX, distro="debian")))[0][1] == "apt"
+        assert ["pypy-fix"] in commands(rules.suggest(ssl, dict(DARWIN, python_implementation="PyPy")))
+        assert rules.candidates("missing_dependency", "Linux", "fedora") is \
+            rules.candidates("missing_dependency", "Linux", "fedora")
@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+
+def fleet(count, packages=20, size=100.0):
+    return [PythonInstallation(path=f"/py{i}", version="3.12.1", size_mb=size + i % 7,
+                               packages={f"p{j}": "1.0" for j in range(packages + i % 5)}) for i in range(count)]
+
+def fleet_report(tmp_path, host, installations, day="2026-01-01"):
+    path = tmp_path / f"{host}-{day}.json"
+    path.write_text(json.dumps({"installations": [install.to_dict() for install in installations],
+                                "host": {"hostname": host, "scanned_at": f"{day}T00:00:00"}}))
+    return str(path)
+
+def test_import_is_light():
+    code = "import sys, src.pyenvdoctor.ai.predictors; print('numpy' in sys.modules or 'sklearn' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parents[3])
+    assert result.stdout.strip() == "False"
+
+class TestInstallationPredictor:
+    @pytest.fixture(autouse=True)
+    def _requires_ml(self):
+        pytest.importorskip("numpy")
+        pytest.importorskip("sklearn")
+
+    def test_fleet_model_is_persisted_and_scoring_has_no_side_effects(self, tmp_path, mocker):
+        from src.pyenvdoctor.ai.predictors import InstallationPredictor
+        from src.pyenvdoctor.analyzer.fleet import FleetStore
+        store = FleetStore(tmp_path / "fleet")
+        store.ingest([fleet_report(tmp_path, f"host{i}", fleet(7, packages=20 + i % 9)) for i in range(50)])
+        path = tmp_path / "model.pkl"
+        assert list(InstallationPredictor(fleet(7, packages=24), model_path=path, fleet=store).predict_anomalies()) \
+            == [1] * 7
+        assert path.exists()
+        stored = path.read_bytes()
+
+        # A host that really is anomalous stays anomalous and does not move the baseline
+        odd = fleet(2, packages=900, size=5000.0)
+        predictor = InstallationPredictor(odd, model_path=path, fleet=store)
+        fit = mocker.spy(predictor, "fit")
+        assert list(predictor.predict_anomalies()) == [-1, -1]
+        assert fit.call_count == 0
+        assert path.read_bytes() == stored
+
+        # Only a drifted fleet table refits
+        assert predictor.update() is False
+        store.ingest([fleet_report(tmp_path, f"host{i}", fleet(7, packages=400, size=5000.0), "2026-02-01")
+                      for i in range(50)])
+        assert predictor.update() is True
+        assert fit.call_count == 1
+        assert predictor.baseline["rows"] == 350
+
+    def test_outlier_is_flagged(self, tmp_path):
+        from src.pyenvdoctor.ai.predictors import InstallationPredictor
+        installs = fleet(200) + [PythonInstallation(path="/odd", version="3.12.1", size_mb=90000.0,
+                                                    packages={f"p{j}": "1" for j in range(3000)})]
+        assert InstallationPredictor(installs, model_path=tmp_path / "m.pkl").predict_anomalies()[-1] == -1
@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from src.pyenvdoctor.ai.recommender import OptimizationRecommender
+from src.pyenvdoctor.ai.usage import UsageTracker, read_atime, resolve_version
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.scanner.cache import ProbeCache
+
+def install_version(root, name):
+    prefix = root / "versions" / name
+    (prefix / "bin").mkdir(parents=True)
+    (prefix / "bin" / "python").write_text("")
+    pycache = prefix / "lib" / f"python{'.'.join(name.split('.')[:2])}" / "__pycache__"
+    pycache.mkdir(parents=True)
+    (pycache / "os.cpython-312.pyc").write_text("")
+    (pycache / "json.cpython-312.pyc").write_text("")
+    return PythonInstallation(path=str(prefix / "bin" / "python"), version=name, provider="pyenv",
+                              prefix=str(prefix), base_prefix=str(prefix))
+
+def read_later(path, delay):
+    """Simulate a read `delay` seconds after the file was installed"""
+    st = os.stat(path)
+    os.utime(path, (time.time() + delay, st.st_mtime))
+
+def tracker(tmp_path, **kwargs):
+    kwargs.setdefault("project_roots", [])
+    return UsageTracker(pyenv_root=tmp_path / "pyenv", cache_path=tmp_path / "usage.json",
+                        log_path=str(tmp_path / "usage.log"), environ={},
+                        probe_cache=ProbeCache(path=tmp_path / "probes.json"), **kwargs)
+
+def test_read_atime_ignores_installer_reads(tmp_path):
+    path = tmp_path / "python"
+    path.write_text("")
+    assert read_atime(str(path)) is None
+    read_later(path, 3600)
+    assert read_atime(str(path)) == os.stat(path).st_atime
+
+def test_resolve_version_prefers_exact_then_latest_prefix():
+    names = ["3.12.1", "3.12.10", "3.12.9", "3.1.4", "pypy3.10-7.3"]
+    assert resolve_version("3.12", names) == "3.12.10"
+    assert resolve_version("3.1", names) == "3.1.4"
+    assert resolve_version("pypy3.10-7.3", names) == "pypy3.10-7.3"
+    assert resolve_version("2.7", names) is None
+
+def test_signals_are_combined_and_cached(tmp_path):
+    root = tmp_path / "pyenv"
+    old, new, idle = (install_version(root, name) for name in ("3.10.4", "3.12.1", "3.13.0"))
+    read_later(os.path.join(old.prefix, "lib", "python3.10", "__pycache__", "os.cpython-312.pyc"), 3600)
+    (root / "version").write_text("3.12  # global\n")
+    project = tmp_path / "src" / "app"
+    project.mkdir(parents=True)
+    (project / ".python-version").write_text("3.10.4\nsystem\n")
+    (tmp_path / "usage.log").write_text(f"100 {new.path}\n200 {new.path}\n300 /elsewhere/python\n")
+
+    usage = tracker(tmp_path, project_roots=[str(tmp_path / "src")])
+    signals = usage.signals([old, new, idle])
+    assert set(signals[old.path]) == {"atime", "pyenv"}
+    assert signals[new.path]["log"] == 200
+    assert signals[new.path]["pyenv"] == max(os.stat(root / "version").st_atime, os.stat(root / "version").st_mtime)
+    assert signals[idle.path] == {}
+    read_later(os.path.join(idle.prefix, "lib", "python3.13", "__pycache__", "os.cpython-312.pyc"), 3600)
+    assert usage.signals([idle])[idle.path] == {}  # frozen at startup, so never read
+    usage.flush()
+
+    # Later runs read only new log lines and reuse the project discovery
+    with open(tmp_path / "usage.log", "a") as f:
+        f.write(f"250 {new.path}\n400 {new.path}")  # the last line is still being written
+    (project / ".python-version").unlink()
+    usage = tracker(tmp_path, project_roots=[str(tmp_path / "src")])
+    last_used = usage.last_used([old, new, idle])
+    assert usage.signals([new])[new.path]["log"] == 250
+    assert last_used[idle.path] is None
+    assert usage._data["projects"]["files"] == [str(project / ".python-version")]
+
+def test_probe_reads_are_not_usage(tmp_path):
+    install = install_version(tmp_path / "pyenv", "3.12.1")
+    read_later(install.path, 3600)
+    usage = tracker(tmp_path)
+    usage.probe_cache._load()[install.path] = {"probed_at": os.stat(install.path).st_atime - 30}
+    assert usage.signals([install])[install.path] == {}
+
+def test_probe_reads_are_not_usage_without_a_cache(tmp_path, monkeypatch):
+    install = install_version(tmp_path / "pyenv", "3.12.1")
+    read_later(install.path, 3600)
+    cache = ProbeCache(path=tmp_path / "probes.json", enabled=False)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: os.stat(install.path).st_atime)
+    cache.put(install.path, {"ok": True})  # scan --no-cache
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.flush()
+    usage = tracker(tmp_path)
+    usage.probe_cache = ProbeCache(path=tmp_path / "probes.json", enabled=False)
+    assert usage.signals([install])[install.path] == {}
+
+def test_recommender_only_flags_known_idle_installations(tmp_path):
+    stale = PythonInstallation(path="/stale", version="3.8.0", last_used=datetime.now() - timedelta(days=200))
+    recent = PythonInstallation(path="/recent", version="3.12.0", last_used=datetime.now() - timedelta(days=2))
+    unknown = install_version(tmp_path / "pyenv", "3.9.0")
+    recommender = OptimizationRecommender(tracker=tracker(tmp_path))
+    recommendations = recommender.generate_recommendations([stale, recent, unknown])
+    assert [r["target"] for r in recommendations] == ["/stale"]
+
+def test_install_hook_logs_to_the_configured_usage_log(tmp_path):
+    site = tmp_path / "site-packages"
+    install = PythonInstallation(path=sys.executable, version="3", site_packages=[str(site)])
+    usage = tracker(tmp_path)
+    site.mkdir()
+    hook = usage.install_hook(install)
+    assert usage.install_hook(install) == hook  # reinstalling is fine
+    subprocess.run([sys.executable, hook], check=True)
+    assert usage.signals([install])[install.path]["log"] > 0
+
+    (site / "usercustomize.py").write_text("import mine\n")
+    with pytest.raises(FileExistsError):
+        usage.install_hook(install)
@@ -0,0 +1,59 @@
+import pytest
+from packaging.requirements import Requirement
+from src.pyenvdoctor.analyzer.dependency_analyzer import DependencyAnalyzer, RequirementIndex, marker_environment
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.scanner.inventory import InventoryReader
+
+def add_dist(site, name, version, *requires):
+    dist_info = site / f"{name}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    lines = "".join(f"Requires-Dist: {requirement}\n" for requirement in requires)
+    (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n{lines}\nbody\n")
+
+def environment(python_version, sys_platform="linux"):
+    return {"marker_environment": dict(marker_environment(PythonInstallation(path="", version=python_version)),
+                                       sys_platform=sys_platform)}
+
+@pytest.fixture
+def site(tmp_path):
+    site = tmp_path / "site-packages"
+    add_dist(site, "app", "1.0", "requests[socks]>=2", "tomli; python_version < '3.11'",
+             "pywin32; sys_platform == 'win32'", "bad requirement !!")
+    add_dist(site, "requests", "2.31.0", "urllib3<3,>=1.21.1", "PySocks!=1.5.7,>=1.5.6; extra == 'socks'")
+    add_dist(site, "urllib3", "3.0.0")
+    return site
+
+def analyzer(tmp_path, installations, index=None):
+    reader = InventoryReader(cache_path=tmp_path / "inventory.json", enabled=False)
+    return DependencyAnalyzer(installations, reader=reader, index=index)
+
+class TestDependencyAnalyzer:
+    def test_reports_missing_and_conflicting_requirements(self, tmp_path, site):
+        install = PythonInstallation(path="/py310", version="3.10.4", site_packages=[str(site)],
+                                     probe=environment("3.10.4"))
+        conflicts = analyzer(tmp_path, [install]).find_conflicts()
+        assert conflicts == {"/py310": [
+            "app 1.0 requires tomli, which is not installed",
+            "requests 2.31.0 requires PySocks!=1.5.7,>=1.5.6, which is not installed",
+            "requests 2.31.0 requires urllib3<3,>=1.21.1, but urllib3 3.0.0 is installed",
+        ]}
+
+    def test_markers_follow_each_interpreter(self, tmp_path, site):
+        add_dist(site, "pysocks", "1.7.1")
+        py312 = PythonInstallation(path="/py312", version="3.12.1", site_packages=[str(site)],
+                                   probe=environment("3.12.1", "win32"))
+        results = analyzer(tmp_path, [py312]).analyze()["/py312"]
+        assert [(p["kind"], p["package"]) for p in results] == [("missing", "pywin32"), ("conflict", "urllib3")]
+
+    def test_environments_share_parsing_and_results(self, tmp_path, site, mocker):
+        index = RequirementIndex()
+        parse = mocker.patch("src.pyenvdoctor.analyzer.dependency_analyzer.Requirement", wraps=Requirement)
+        venvs = [PythonInstallation(path=f"/venv{i}", version="3.10.4", site_packages=[str(site)],
+                                    probe=environment("3.10.4")) for i in range(50)]
+        other = PythonInstallation(path="/py313", version="3.13.0", site_packages=[str(site)],
+                                   probe=environment("3.13.0"))
+        results = analyzer(tmp_path, venvs + [other], index=index).analyze()
+        assert len({len(problems) for path, problems in results.items() if path != "/py313"}) == 1
+        assert len(results["/py313"]) == 2
+        assert parse.call_count == 6  # each distinct string once, across 51 environments
+        assert len(index._environments) == 2
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from src.pyenvdoctor.analyzer.disk_usage import DiskUsageEngine
+from src.pyenvdoctor.core.models import PythonInstallation
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "versions"
+    (root / "3.12.1" / "lib").mkdir(parents=True)
+    (root / "3.12.1" / "lib" / "a.py").write_bytes(b"x" * 1000)
+    (root / "3.12.1" / "lib" / "b.py").write_bytes(b"y" * 500)
+    return root
+
+def make_engine(tmp_path):
+    return DiskUsageEngine(cache_path=tmp_path / "du.json", enabled=True, max_workers=4)
+
+class TestDiskUsageEngine:
+    def test_apparent_size(self, tmp_path, tree):
+        usage = make_engine(tmp_path).measure(str(tree))
+        dirs = sum(os.stat(d).st_size for d in [tree, tree / "3.12.1", tree / "3.12.1" / "lib"])
+        assert usage.apparent_bytes == 1500 + dirs
+        assert usage.files == 2
+        assert usage.allocated_bytes > 0
+
+    def test_hardlinks_counted_once(self, tmp_path, tree):
+        os.link(tree / "3.12.1" / "lib" / "a.py", tree / "3.12.1" / "a-link.py")
+        usage = make_engine(tmp_path).measure(str(tree / "3.12.1"))
+        assert usage.files == 2
+        assert usage.reclaimable_bytes == usage.allocated_bytes
+
+    def test_shared_hardlink_is_not_reclaimable(self, tmp_path, tree):
+        shared = tmp_path / "shared.whl"
+        shared.write_bytes(b"z" * 100000)
+        os.link(shared, tree / "3.12.1" / "lib" / "shared.whl")
+        usage = make_engine(tmp_path).measure(str(tree))
+        assert usage.reclaimable_bytes == usage.allocated_bytes - os.stat(shared).st_blocks * 512
+
+    def test_unchanged_directories_are_not_reread(self, tmp_path, tree, mocker):
+        make_engine(tmp_path).measure(str(tree))
+        engine = make_engine(tmp_path)
+        summarise = mocker.spy(DiskUsageEngine, "_summarise")
+        first = engine.measure(str(tree))
+        assert summarise.call_count == 0
+
+        (tree / "3.12.1" / "lib" / "c.py").write_bytes(b"c" * 10)
+        second = engine.measure(str(tree))
+        assert summarise.call_count == 1
+        assert second.apparent_bytes >= first.apparent_bytes + 10
+        assert second.files == 3
+
+    def test_removed_directory_is_forgotten(self, tmp_path, tree):
+        engine = make_engine(tmp_path)
+        (tree / "old").mkdir()
+        (tree / "old" / "big").write_bytes(b"o" * 5000)
+        before = engine.measure(str(tree))
+        (tree / "old" / "big").unlink()
+        (tree / "old").rmdir()
+        assert engine.measure(str(tree)).files == before.files - 1
+
+    def test_size_installations(self, tmp_path, tree):
+        install = PythonInstallation(path=str(tree / "3.12.1" / "bin" / "python"), version="3.12.1",
+                                     provider="pyenv", prefix=str(tree / "3.12.1"))
+        make_engine(tmp_path).size_installations([install])
+        assert install.size_mb is not None and install.size_mb >= 0
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from src.pyenvdoctor.analyzer.fleet import FleetStore
+
+def report(tmp_path, host, when, versions, issues=(), invalid=()):
+    path = tmp_path / f"{host}-{when[:10]}.json"
+    path.write_text(json.dumps({
+        "installations": [{"path": f"/usr/bin/python{v}", "version": v, "provider": "system",
+                           "is_valid": v not in invalid, "status": "ok"} for v in versions],
+        "issues": [{"description": d, "type": t, "severity": s} for t, s, d in issues],
+        "host": {"hostname": host, "scanned_at": when}
+    }))
+    return str(path)
+
+@pytest.fixture
+def store(tmp_path):
+    store = FleetStore(tmp_path / "fleet")
+    store.ingest([
+        report(tmp_path, "web1", "2026-01-01T00:00:00+00:00", ["3.8.18", "3.11.7"],
+               issues=[("missing_dependency", "medium", "Missing dependency: gcc")]),
+        report(tmp_path, "web2", "2026-01-01T00:00:00+00:00", ["3.12.1"], invalid=["3.12.1"]),
+        report(tmp_path, "db1", "2026-01-01T00:00:00+00:00", ["3.8.10"],
+               issues=[("missing_dependency", "medium", "Missing dependency: gcc"),
+                       ("permission_error", "high", "Permission denied: /opt")]),
+    ])
+    return store
+
+class TestFleetStore:
+    def test_queries(self, store):
+        assert store.hosts() == ["db1", "web1", "web2"]
+        assert store.hosts_with_version("3.8") == ["db1", "web1"]
+        assert store.hosts_with_invalid() == ["web2"]
+        assert store.issue_counts() == {"missing_dependency": 2, "permission_error": 1}
+        assert store.issue_counts(by="severity") == {"medium": 2, "high": 1}
+
+    def test_incremental_append_uses_latest_report(self, store, tmp_path):
+        newer = report(tmp_path, "db1", "2026-02-01T00:00:00+00:00", ["3.12.1"])
+        assert store.ingest([newer]) == 1
+        assert store.ingest([newer]) == 0  # already ingested
+        reopened = FleetStore(tmp_path / "fleet")
+        assert reopened.hosts_with_version("3.8") == ["web1"]
+        assert reopened.issue_counts() == {"missing_dependency": 1}
+
+    def test_interrupted_append_is_ignored(self, store, tmp_path):
+        with open(tmp_path / "fleet" / "installations.version.bin", "ab") as f:
+            f.write(b"\xff" * 12)  # rows written without a meta.json commit
+        reopened = FleetStore(tmp_path / "fleet")
+        assert reopened.hosts_with_version("3.12") == ["web2"]
+        reopened.ingest([report(tmp_path, "web3", "2026-01-02T00:00:00+00:00", ["3.12.2"])])
+        assert FleetStore(tmp_path / "fleet").hosts_with_version("3.12") == ["web2", "web3"]
+
+    def test_reads_ndjson_reports(self, tmp_path):
+        path = tmp_path / "host.ndjson"
+        path.write_text("\n".join(json.dumps(record) for record in [
+            {"kind": "installation", "path": "/usr/bin/python3", "version": "3.11.2", "is_valid": True},
+            {"kind": "summary", "host": {"hostname": "edge1", "scanned_at": "2026-01-01T00:00:00"}},
+        ]))
+        store = FleetStore(tmp_path / "fleet")
+        assert store.ingest([str(path)]) == 1
+        assert store.hosts_with_version("3.11") == ["edge1"]
+
+    def test_bad_input_is_skipped_and_reported(self, tmp_path):
+        stream = tmp_path / "edge2.ndjson"
+        stream.write_text("\n".join([
+            json.dumps({"kind": "installation", "path": "/usr/bin/python3", "version": "3.12.1"}),
+            '{"kind": "installation", "path": "/opt/py',  # cut off mid-write
+            json.dumps({"kind": "summary", "host": {"hostname": "edge2", "scanned_at": "2026-01-01T00:00:00"}}),
+        ]))
+        pretty = tmp_path / "edge3.json"
+        pretty.write_text(json.dumps({"installations": [{"path": "/usr/bin/python3", "version": "3.13.0"}],
+                                      "host": {"hostname": "edge3"}}, indent=2))
+        broken = tmp_path / "edge4.json"
+        broken.write_text('{"installations": [')
+        store = FleetStore(tmp_path / "fleet")
+        assert store.ingest([str(stream), str(pretty), str(broken)]) == 2
+        assert store.hosts() == ["edge2", "edge3"]
+        assert [error.split(": ")[0] for error in store.errors] == [f"{stream}:2", str(broken)]
+
+    def test_installation_columns_and_stores_without_them(self, store, tmp_path):
+        unmeasured = store.installation_columns(["packages"])["packages"]
+        assert len(unmeasured) == 4 and all(value != value for value in unmeasured)  # NaN
+        for column in ("packages", "size_mb"):
+            (tmp_path / "fleet" / f"installations.{column}.bin").unlink()  # written before these columns
+        reopened = FleetStore(tmp_path / "fleet")
+        path = tmp_path / "web9.json"
+        path.write_text(json.dumps({
+            "installations": [{"path": "/usr/bin/python3", "version": "3.12.1", "packages": {"pip": "24.0"},
+                               "size_mb": 42.5}],
+            "host": {"hostname": "web9", "scanned_at": "2026-01-03T00:00:00+00:00"}}))
+        assert reopened.ingest([str(path)]) == 1
+        columns = FleetStore(tmp_path / "fleet").installation_columns(["packages", "size_mb"])
+        assert columns["packages"][-1] == 1 and columns["size_mb"][-1] == 42.5
+        assert len(columns["packages"]) == 5 and all(value != value for value in columns["packages"][:-1])
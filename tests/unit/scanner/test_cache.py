@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+import pytest
+from src.pyenvdoctor.core.config import parse_duration
+from src.pyenvdoctor.scanner.cache import ProbeCache
+from src.pyenvdoctor.scanner.system_scanner import SystemScanner
+
+@pytest.fixture
+def interpreter(tmp_path):
+    prefix = tmp_path / "3.9.18"
+    (prefix / "bin").mkdir(parents=True)
+    (prefix / "lib" / "python3.9").mkdir(parents=True)
+    python = prefix / "bin" / "python"
+    python.write_text("#!/bin/sh\n")
+    return python
+
+@pytest.fixture
+def probe(interpreter):
+    prefix = str(interpreter.parent.parent)
+    return {"ok": True, "version": "3.9.18", "version_info": [3, 9, 18],
+            "prefix": prefix, "base_prefix": prefix}
+
+def make_cache(tmp_path, **kwargs):
+    return ProbeCache(path=tmp_path / "probes.json", **kwargs)
+
+class TestProbeCache:
+    def test_round_trip_through_disk(self, tmp_path, interpreter, probe):
+        cache = make_cache(tmp_path, ttl=3600, enabled=True)
+        cache.put(str(interpreter), probe)
+        cache.flush()
+        assert make_cache(tmp_path, ttl=3600, enabled=True).get(str(interpreter)) == probe
+
+    def test_interpreter_change_invalidates(self, tmp_path, interpreter, probe):
+        cache = make_cache(tmp_path, ttl=3600, enabled=True)
+        cache.put(str(interpreter), probe)
+        interpreter.write_text("#!/bin/sh\nexit 0\n")
+        assert cache.get(str(interpreter)) is None
+
+    def test_stdlib_change_invalidates(self, tmp_path, interpreter, probe):
+        cache = make_cache(tmp_path, ttl=3600, enabled=True)
+        cache.put(str(interpreter), probe)
+        lib_dir = interpreter.parent.parent / "lib" / "python3.9"
+        os.utime(lib_dir, ns=(0, lib_dir.stat().st_mtime_ns + 10**9))
+        assert cache.get(str(interpreter)) is None
+
+    def test_ttl_expiry(self, tmp_path, interpreter, probe, monkeypatch):
+        cache = make_cache(tmp_path, ttl=60, enabled=True)
+        cache.put(str(interpreter), probe)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        assert cache.get(str(interpreter)) is None
+
+    def test_disabled_and_refresh(self, tmp_path, interpreter, probe):
+        cache = make_cache(tmp_path, ttl=3600, enabled=True)
+        cache.put(str(interpreter), probe)
+        cache.flush()
+        assert make_cache(tmp_path, ttl=3600, enabled=False).get(str(interpreter)) is None
+        assert make_cache(tmp_path, ttl=3600, enabled=True, refresh=True).get(str(interpreter)) is None
+
+    def test_warm_scan_does_not_spawn(self, tmp_path, mocker):
+        cache = make_cache(tmp_path, ttl=3600, enabled=True)
+        cold, = SystemScanner(cache=cache).probe([(sys.executable, "system", None)])
+        assert cold.is_valid
+
+        run = mocker.patch("subprocess.run")
+        warm, = SystemScanner(cache=make_cache(tmp_path, ttl=3600, enabled=True)).probe(
+            [(sys.executable, "system", None)])
+        run.assert_not_called()
+        assert warm.to_dict() == cold.to_dict()
+
+@pytest.mark.parametrize("value,seconds", [("1h", 3600), ("7d", 604800), ("90s", 90), (5, 5), ("2m", 120)])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == seconds
+
+def test_parse_duration_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_duration("soon")
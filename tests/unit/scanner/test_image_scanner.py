@@ -0,0 +1,117 @@
+import gzip
+import io
+import json
+import os
+import sys
+import tarfile
+
+import pytest
+from src.pyenvdoctor.scanner.image_scanner import ImageScanner
+
+MAJOR, MINOR = sys.version_info[:2]
+STDLIB = f"usr/lib/python{MAJOR}.{MINOR}"
+
+def layer(entries, compress=False):
+    """Build a layer tarball from (name, content) pairs; content None = dir, 'link:x' = symlink"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, content in entries:
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                tar.addfile(info)
+            elif isinstance(content, str) and content.startswith("link:"):
+                info.type = tarfile.SYMTYPE
+                info.linkname = content[5:]
+                tar.addfile(info)
+            else:
+                data = content if isinstance(content, bytes) else content.encode()
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+    data = buffer.getvalue()
+    return gzip.compress(data) if compress else data
+
+def archive(path, members):
+    with tarfile.open(path, mode="w") as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+@pytest.fixture
+def layers():
+    with open(os.path.realpath(sys.executable), "rb") as f:
+        binary = f.read()
+    if binary[:4] != b"\x7fELF":
+        pytest.skip("needs an ELF interpreter")
+    base = layer([
+        ("usr/bin", None),
+        (f"usr/bin/python{MAJOR}.{MINOR}", binary),
+        ("usr/bin/python3", f"link:/usr/bin/python{MAJOR}.{MINOR}"),
+        (f"{STDLIB}/os.py", ""),
+        (f"usr/include/python{MAJOR}.{MINOR}/patchlevel.h", f'#define PY_VERSION "{MAJOR}.{MINOR}.42"\n'),
+        (f"{STDLIB}/site-packages/old-1.0.dist-info/METADATA", "Name: old\nVersion: 1.0\n\nlong text\n"),
+        (f"{STDLIB}/site-packages/keep-2.0.dist-info/METADATA", "Name: Keep_Me\nVersion: 2.0\n"),
+        ("app/cache/stale.txt", "x"),
+    ])
+    upper = layer([
+        (f"{STDLIB}/site-packages/.wh.old-1.0.dist-info", ""),
+        (f"{STDLIB}/site-packages/new-3.0.dist-info/METADATA", "Name: new\nVersion: 3.0\n"),
+        ("app/cache/.wh..wh..opq", ""),
+        ("app/venv/pyvenv.cfg", "home = /usr/bin\nversion = 3.99.1\n"),
+        ("app/venv/bin/python", "link:/usr/bin/python3"),
+    ], compress=True)
+    return base, upper
+
+class TestImageScanner:
+    def test_docker_save_archive(self, tmp_path, layers):
+        base, upper = layers
+        manifest = json.dumps([{"Config": "config.json", "Layers": ["aaa/layer.tar", "bbb/layer.tar"]}]).encode()
+        # docker save writes the manifest last, after the layers
+        path = archive(tmp_path / "image.tar", [("bbb/layer.tar", upper), ("aaa/layer.tar", base),
+                                               ("config.json", b"{}"), ("manifest.json", manifest)])
+        scanner = ImageScanner(path)
+        assert scanner.scan() == []
+        interpreter, venv = scanner.get_installations()
+        assert interpreter.path == "/usr/bin/python3"
+        assert interpreter.version == f"{MAJOR}.{MINOR}.42"
+        assert interpreter.packages == {"keep-me": "2.0", "new": "3.0"}
+        assert venv.provider == "virtualenv"
+        assert venv.version == "3.99.1"
+        assert venv.base_interpreter == "/usr/bin/python3"
+
+    def test_oci_layout_and_opaque_whiteout(self, tmp_path, layers):
+        base, upper = layers
+        manifest = json.dumps({"layers": [{"digest": "sha256:aaa"}, {"digest": "sha256:bbb"}]}).encode()
+        index = json.dumps({"manifests": [{"digest": "sha256:mmm"}]}).encode()
+        path = archive(tmp_path / "oci.tar", [("index.json", index), ("blobs/sha256/mmm", manifest),
+                                             ("blobs/sha256/aaa", base), ("blobs/sha256/bbb", upper)])
+        scanner = ImageScanner(path)
+        fs = scanner.load()
+        assert fs.listdir("/app/cache") == []
+        assert not fs.isdir(f"/{STDLIB}/site-packages/old-1.0.dist-info")
+
+    def test_missing_manifest_is_an_issue(self, tmp_path, layers):
+        path = archive(tmp_path / "broken.tar", [("aaa/layer.tar", layers[0])])
+        issues = ImageScanner(path).scan()
+        assert [issue.type for issue in issues] == ["image_error"]
+
+    def test_venvs_follow_pyvenv_cfg_and_need_their_interpreter(self, tmp_path, layers):
+        venvs = layer([
+            ("srv/env/pyvenv.cfg", f"home = /opt/gone\nexecutable = /usr/bin/python{MAJOR}.{MINOR}\n"),
+            ("srv/env/bin/python", f"link:/usr/bin/python{MAJOR}.{MINOR}"),
+            ("srv/broken/pyvenv.cfg", "home = /usr/bin\n"),
+            ("srv/broken/bin/python", "link:/usr/bin/python2"),
+        ])
+        manifest = json.dumps([{"Layers": ["a.tar", "b.tar", "c.tar"]}]).encode()
+        path = archive(tmp_path / "image.tar", [("a.tar", layers[0]), ("b.tar", layers[1]), ("c.tar", venvs),
+                                               ("manifest.json", manifest)])
+        scanner = ImageScanner(path)
+        scanner.scan(packages=False)
+        venvs = {install.prefix: install for install in scanner.get_installations()
+                 if install.provider == "virtualenv"}
+        assert venvs["/srv/env"].base_interpreter == f"/usr/bin/python{MAJOR}.{MINOR}"
+        assert venvs["/srv/env"].is_valid
+        assert venvs["/srv/broken"].base_interpreter == "/usr/bin/python3"
+        assert not venvs["/srv/broken"].is_valid
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.scanner.introspect import introspect, parse_probe_output
+from src.pyenvdoctor.scanner.probe import ProbeEngine
+
+class TestIntrospection:
+    def test_probe_running_interpreter(self):
+        """A single spawn returns the full probe report"""
+        report = introspect(sys.executable, ProbeEngine(max_workers=1, timeout=10))
+        assert report is not None
+        assert report["ok"] is True
+        assert report["version_info"] == list(sys.version_info[:3])
+        assert report["prefix"] == sys.prefix
+        assert isinstance(report["site_packages"], list)
+        assert "build_flags" in report
+
+    def test_probe_reports_venv_prefix_and_site_packages(self, tmp_path):
+        """-S keeps site.venv() from running; the probe must still see the venv"""
+        venv = tmp_path / "venv"
+        subprocess.run([sys.executable, "-m", "venv", "--without-pip", str(venv)], check=True)
+        report = introspect(str(venv / "bin" / "python"), ProbeEngine(max_workers=1, timeout=10))
+        assert report["prefix"] == str(venv)
+        assert report["base_prefix"] == sys.base_prefix
+        assert report["site_packages"]
+        assert all(path.startswith(str(venv) + "/") for path in report["site_packages"])
+
+    def test_probe_missing_interpreter(self):
+        assert introspect("/nonexistent/bin/python", ProbeEngine(max_workers=1, timeout=5)) is None
+
+    @pytest.mark.parametrize("output", ["", "OK", "[]", '{"ok": false}'])
+    def test_parse_rejects_non_reports(self, output):
+        assert parse_probe_output(output) is None
+
+    def test_installation_from_probe(self):
+        report = introspect(sys.executable, ProbeEngine(max_workers=1, timeout=30))
+        install = PythonInstallation.from_probe(sys.executable, "system", report)
+        assert install.is_valid
+        assert install.version == report["version"]
+        assert install.implementation == report["implementation"]
+        assert install.to_dict()["site_packages"] == report["site_packages"]
+
+    def test_installation_from_failed_probe(self):
+        install = PythonInstallation.from_probe("/x/bin/python", "pyenv", None, version="3.9.1")
+        assert not install.is_valid
+        assert install.version == "3.9.1"
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.scanner.inventory import InventoryReader, read_metadata_headers, read_site_packages
+
+def add_dist_info(site_packages, name, version, record=""):
+    dist_info = site_packages / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        "Summary: something\n  folded\n\nName: not-a-header\n")
+    (dist_info / "RECORD").write_text(record)
+    return dist_info
+
+@pytest.fixture
+def site_packages(tmp_path):
+    site = tmp_path / "lib" / "python3.12" / "site-packages"
+    add_dist_info(site, "Requests", "2.31.0", "requests/__init__.py,sha256=abc,123\nrequests-2.31.0.dist-info/RECORD,,\n")
+    add_dist_info(site, "zope.interface", "6.0")
+    (site / "legacy.egg-info").write_text("Metadata-Version: 1.0\nName: legacy\nVersion: 0.1\n")
+    (site / "old-1.0.egg-info").mkdir()
+    (site / "old-1.0.egg-info" / "PKG-INFO").write_text("Name: old\nVersion: 1.0\n")
+    return site
+
+class TestInventoryReader:
+    def test_reads_dist_info_and_egg_info(self, site_packages):
+        dists = {dist.name: dist.version for dist in read_site_packages(str(site_packages))}
+        assert dists == {"Requests": "2.31.0", "zope.interface": "6.0", "legacy": "0.1", "old": "1.0"}
+
+    def test_headers_stop_at_body(self, site_packages):
+        metadata = site_packages / "Requests-2.31.0.dist-info" / "METADATA"
+        assert read_metadata_headers(str(metadata)) == {"name": ["Requests"], "version": ["2.31.0"]}
+
+    def test_fills_packages_without_spawning(self, tmp_path, site_packages, mocker):
+        run = mocker.patch("subprocess.run")
+        install = PythonInstallation(path="/x/bin/python", version="3.12.1", site_packages=[str(site_packages)])
+        InventoryReader(cache_path=tmp_path / "inv.json", enabled=True).inventory([install])
+        run.assert_not_called()
+        assert install.packages == {"requests": "2.31.0", "zope-interface": "6.0", "legacy": "0.1", "old": "1.0"}
+
+    def test_cache_is_reused_until_directory_changes(self, tmp_path, site_packages, mocker):
+        warm = InventoryReader(cache_path=tmp_path / "inv.json", enabled=True)
+        warm.distributions(str(site_packages))
+        warm.flush()
+
+        reader = InventoryReader(cache_path=tmp_path / "inv.json", enabled=True)
+        parse = mocker.patch("src.pyenvdoctor.scanner.inventory.read_site_packages")
+        assert len(reader.distributions(str(site_packages))) == 4
+        parse.assert_not_called()
+
+        add_dist_info(site_packages, "newpkg", "1.0")
+        os.utime(site_packages, ns=(0, site_packages.stat().st_mtime_ns + 10**9))
+        parse.return_value = []
+        reader.distributions(str(site_packages))
+        parse.assert_called_once()
+
+    def test_record_entries(self, site_packages):
+        [dist] = [d for d in read_site_packages(str(site_packages)) if d.name == "Requests"]
+        entries = list(dist.read_record())
+        assert entries[0].path == str(site_packages / "requests" / "__init__.py")
+        assert (entries[0].algorithm, entries[0].digest, entries[0].size) == ("sha256", "abc", 123)
+        assert entries[1].digest is None
+
+    def test_requirements_from_metadata_and_requires_txt(self, tmp_path, site_packages):
+        metadata = site_packages / "Requests-2.31.0.dist-info" / "METADATA"
+        metadata.write_text("Name: Requests\nVersion: 2.31.0\nRequires-Dist: idna<4,>=2.5\n"
+                            "Requires-Dist: PySocks; extra == 'socks'\n\nbody\n")
+        (site_packages / "old-1.0.egg-info" / "requires.txt").write_text(
+            "six\n\n[:sys_platform == 'win32']\npywin32\n\n[docs]\nsphinx\n")
+        reader = InventoryReader(cache_path=tmp_path / "inv.json", enabled=True)
+        for _ in range(2):  # fresh, then from the cache
+            requires = {dist.name: dist.requires for dist in reader.distributions(str(site_packages))}
+            reader.flush()
+            reader = InventoryReader(cache_path=tmp_path / "inv.json", enabled=True)
+        assert requires["Requests"] == ["idna<4,>=2.5", "PySocks; extra == 'socks'"]
+        assert requires["old"] == ["six", "pywin32; (sys_platform == 'win32')", 'sphinx; extra == "docs"']
+        assert requires["legacy"] == []
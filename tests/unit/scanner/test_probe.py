@@ -0,0 +1,91 @@
+import sys
+import threading
+import time
+
+from src.pyenvdoctor.scanner.cache import ProbeCache
+from src.pyenvdoctor.scanner.probe import ProbeEngine
+from src.pyenvdoctor.scanner.system_scanner import SystemScanner
+
+class TestProbeEngine:
+    def test_map_preserves_input_order(self):
+        """Results come back in submission order, not completion order"""
+        engine = ProbeEngine(max_workers=4, timeout=5)
+        delays = [0.05, 0.0, 0.03, 0.01]
+
+        def probe(delay, deadline):
+            time.sleep(delay)
+            return delay
+
+        assert engine.map(probe, delays) == delays
+
+    def test_map_bounds_concurrency(self):
+        """No more than max_workers probes run at the same time"""
+        engine = ProbeEngine(max_workers=2, timeout=5)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def probe(item, deadline):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            return item
+
+        engine.map(probe, range(8))
+        assert state["peak"] <= 2
+
+    def test_run_enforces_deadline(self):
+        """A hung interpreter is killed once its probe deadline passes"""
+        engine = ProbeEngine(max_workers=1, timeout=0.2)
+        start = time.monotonic()
+        result = engine.run([sys.executable, "-c", "import time; time.sleep(10)"])
+        assert result is None
+        assert time.monotonic() - start < 5
+
+    def test_run_past_deadline_does_not_spawn(self):
+        engine = ProbeEngine(max_workers=1, timeout=5)
+        assert engine.run([sys.executable, "--version"], time.monotonic() - 1) is None
+
+    def test_scanner_uses_engine_order(self):
+        """Scanner installations follow candidate order"""
+        scanner = SystemScanner(probe_engine=ProbeEngine(max_workers=4, timeout=5))
+        candidates = [("/a/python", "pyenv", "3.9"), ("/b/python", "pyenv", "3.10")]
+        assert [inst.path for inst in scanner.probe(candidates)] == ["/a/python", "/b/python"]
+
+    def test_imap_yields_in_completion_order(self):
+        """A fast probe is not held back by a slow one submitted earlier"""
+        engine = ProbeEngine(max_workers=2, timeout=5)
+
+        def probe(delay, deadline):
+            time.sleep(delay)
+            return delay
+
+        assert list(engine.imap(probe, [0.2, 0.0])) == [0.0, 0.2]
+        assert list(engine.imap(probe, [0.2, 0.0], ordered=True)) == [0.2, 0.0]
+
+    def test_imap_consumes_items_lazily(self):
+        """Only a bounded window of items is pulled ahead of the consumer"""
+        engine = ProbeEngine(max_workers=2, timeout=5)
+        pulled = []
+
+        def items():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        results = engine.imap(lambda item, deadline: item, items())
+        next(results)
+        assert len(pulled) <= 5
+        results.close()
+
+    def test_iter_scan_streams_records(self, tmp_path, monkeypatch):
+        scanner = SystemScanner(probe_engine=ProbeEngine(max_workers=2, timeout=5),
+                                cache=ProbeCache(path=tmp_path / "probes.json", enabled=False))
+        candidates = [("/a/python", "pyenv", "3.9"), ("/b/python", "pyenv", "3.10")]
+        monkeypatch.setattr(scanner, "discover", lambda: candidates)
+        monkeypatch.setattr(scanner, "_command_exists", lambda command: True)
+        records = list(scanner.iter_scan(comprehensive=True))
+        assert sorted(record.path for kind, record in records if kind == "installation") == ["/a/python", "/b/python"]
+        assert scanner.installations == []
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+from src.pyenvdoctor.scanner.base_scanner import BaseScanner, InstallationCandidate
+from src.pyenvdoctor.scanner.providers import VirtualenvScanner
+from src.pyenvdoctor.scanner.pyenv_scanner import PyenvScanner
+from src.pyenvdoctor.scanner.registry import ProviderRegistry
+
+class StaticProvider(BaseScanner):
+    def __init__(self, name, paths, delay=0.0, timeout=None):
+        super().__init__()
+        self.name = name
+        self.paths = paths
+        self.delay = delay
+        self.timeout = timeout
+
+    def scan(self):
+        time.sleep(self.delay)
+        return [InstallationCandidate(path, self.name) for path in self.paths]
+
+class FailingProvider(BaseScanner):
+    name = "broken"
+
+    def scan(self):
+        raise RuntimeError("boom")
+
+@pytest.fixture
+def interpreter(tmp_path):
+    python = tmp_path / "python3.12"
+    python.write_text("")
+    link = tmp_path / "python3"
+    link.symlink_to(python)
+    return python, link
+
+class TestProviderRegistry:
+    def test_deduplicates_by_real_path(self, interpreter):
+        python, link = interpreter
+        registry = ProviderRegistry(providers=[
+            StaticProvider("pyenv", [str(link)]),
+            StaticProvider("system", [str(python)]),
+        ])
+        assert registry.discover() == [InstallationCandidate(str(link), "pyenv")]
+
+    def test_slow_provider_times_out_without_blocking_others(self):
+        registry = ProviderRegistry(providers=[
+            StaticProvider("slow", ["/slow/python"], delay=2.0, timeout=0.1),
+            StaticProvider("fast", ["/fast/python"]),
+        ])
+        start = time.monotonic()
+        candidates = registry.discover()
+        assert time.monotonic() - start < 1.5
+        assert [candidate.provider for candidate in candidates] == ["fast"]
+        assert registry.timings["slow"]["status"] == "timeout"
+        assert registry.timings["fast"]["status"] == "ok"
+        assert registry.timings["fast"]["count"] == 1
+
+    def test_hung_provider_does_not_block_exit(self):
+        registry = ProviderRegistry(providers=[StaticProvider("hung", ["/hung/python"], delay=1.0, timeout=0.05)])
+        assert registry.discover() == []
+        hung, = [thread for thread in threading.enumerate() if thread.name == "pyenvdoctor-provider-hung"]
+        assert hung.daemon
+
+    def test_failing_provider_is_reported(self):
+        registry = ProviderRegistry(providers=[FailingProvider(), StaticProvider("ok", ["/x/python"])])
+        assert len(registry.discover()) == 1
+        assert registry.timings["broken"] == {"status": "error", "error": "boom", "count": 0,
+                                              "duration_ms": registry.timings["broken"]["duration_ms"]}
+
+    def test_entry_point_providers_are_loaded(self, mocker):
+        mocker.patch("src.pyenvdoctor.scanner.registry._entry_point_providers",
+                     return_value=[lambda: StaticProvider("inhouse", ["/inhouse/python"])])
+        registry = ProviderRegistry()
+        assert "inhouse" in [provider.name for provider in registry.providers]
+
+    def test_broken_plugin_constructor_is_skipped(self, mocker):
+        class BrokenPlugin(BaseScanner):
+            name = "broken-plugin"
+
+            def __init__(self):
+                raise ImportError("missing dependency")
+
+            def scan(self):
+                return []
+
+        mocker.patch("src.pyenvdoctor.scanner.registry._entry_point_providers", return_value=[BrokenPlugin])
+        registry = ProviderRegistry()
+        assert "broken-plugin" not in [provider.name for provider in registry.providers]
+        registry.discover()
+        assert registry.timings["broken-plugin"]["error"] == "missing dependency"
+
+    def test_venv_is_not_merged_into_its_base(self, tmp_path, monkeypatch):
+        pyenv_root = tmp_path / "pyenv"
+        base_bin = pyenv_root / "versions" / "3.12.1" / "bin"
+        base_bin.mkdir(parents=True)
+        (base_bin / "python").write_text("")
+        venv = tmp_path / "venvs" / "app"
+        (venv / "bin").mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text(f"home = {base_bin}\n")
+        (venv / "bin" / "python").symlink_to(base_bin / "python")
+
+        registry = ProviderRegistry(providers=[PyenvScanner(pyenv_root),
+                                               VirtualenvScanner(roots=[str(tmp_path / "venvs")])])
+        assert [candidate.provider for candidate in registry.discover()] == ["pyenv", "virtualenv"]
@@ -0,0 +1,81 @@
+import sys
+import time
+
+import pytest
+from src.pyenvdoctor.scanner.cache import ProbeCache
+from src.pyenvdoctor.scanner.probe import ProbeEngine
+from src.pyenvdoctor.scanner.scheduler import DeadlineScheduler, ProbeTimes
+from src.pyenvdoctor.scanner.system_scanner import SystemScanner
+
+@pytest.fixture
+def times(tmp_path):
+    return ProbeTimes(path=tmp_path / "probe_times.json", enabled=True)
+
+class TestProbeTimes:
+    def test_ewma_round_trip(self, tmp_path, times):
+        times.record("/a/python", 1.0)
+        times.record("/a/python", 2.0)
+        times.flush()
+        assert ProbeTimes(path=tmp_path / "probe_times.json", enabled=True).expected("/a/python") == pytest.approx(1.3)
+
+class TestDeadlineScheduler:
+    def test_orders_cheapest_first(self, times):
+        times.record("/slow/python", 2.0)
+        times.record("/fast/python", 0.1)
+        times.record("/mid/python", 0.5)
+        scheduler = DeadlineScheduler(times=times)
+        candidates = [("/slow/python",), ("/new/python",), ("/fast/python",)]
+        assert scheduler.order(candidates) == [("/fast/python",), ("/new/python",), ("/slow/python",)]
+
+    def test_timeout_adapts_to_learned_duration(self, times):
+        times.record("/a/python", 0.2)
+        times.record("/slow/python", 3.0)
+        scheduler = DeadlineScheduler(budget=100, times=times, default_timeout=5)
+        scheduler.start()
+        assert scheduler.deadline_for(("/a/python",)) - time.monotonic() == pytest.approx(0.6, abs=0.05)
+        assert scheduler.deadline_for(("/b/python",)) - time.monotonic() == pytest.approx(5, abs=0.05)
+
+    def test_unbounded_scans_never_cut_below_the_configured_timeout(self, times):
+        times.record("/a/python", 0.2)
+        times.record("/slow/python", 3.0)
+        scheduler = DeadlineScheduler(times=times, default_timeout=5)
+        scheduler.start()
+        assert scheduler.deadline_for(("/a/python",)) - time.monotonic() == pytest.approx(5, abs=0.05)
+        assert scheduler.deadline_for(("/slow/python",)) - time.monotonic() == pytest.approx(9, abs=0.05)
+
+    def test_timeouts_back_off(self, times):
+        times.record("/a/python", 0.2)
+        times.record_timeout("/a/python", 0.6)
+        assert times.expected("/a/python") == pytest.approx(0.6)
+        times.record_timeout("/a/python", 0.6)
+        assert times.expected("/a/python") == pytest.approx(1.2)
+
+    def test_budget_is_shared_between_pending_probes(self, times):
+        scheduler = DeadlineScheduler(budget=10, max_workers=1, times=times, default_timeout=5)
+        scheduler.start()
+        scheduler.order([("/a",), ("/b",), ("/c",), ("/d",)])
+        assert scheduler.deadline_for(("/a",)) - time.monotonic() == pytest.approx(2.5, abs=0.05)
+        assert scheduler.deadline_for(("/b",)) - time.monotonic() == pytest.approx(10 / 3, abs=0.05)
+
+    def test_late_probe_is_reported_unknown(self, times, tmp_path, monkeypatch):
+        scheduler = DeadlineScheduler(budget=0.001, times=times)
+        scanner = SystemScanner(probe_engine=ProbeEngine(max_workers=1, timeout=5),
+                                cache=ProbeCache(path=tmp_path / "probes.json", enabled=False), scheduler=scheduler)
+        monkeypatch.setattr(scanner.registry, "discover", lambda deadline=None: [(sys.executable, "system", None)])
+        monkeypatch.setattr(scheduler, "deadline_for", lambda item: time.monotonic() - 1)  # budget used up
+        times.record(sys.executable, 0.1)
+        scanner.scan()
+        assert [inst.status for inst in scanner.installations] == ["unknown"]
+        assert times.expected(sys.executable) == 0.1  # never started, so nothing learned
+
+    def test_killed_probe_backs_off(self, times, tmp_path, monkeypatch):
+        hung = tmp_path / "python"
+        hung.write_text("#!/bin/sh\nsleep 5\n")
+        hung.chmod(0o755)
+        scheduler = DeadlineScheduler(budget=0.3, times=times)
+        scanner = SystemScanner(probe_engine=ProbeEngine(max_workers=1, timeout=5),
+                                cache=ProbeCache(path=tmp_path / "probes.json", enabled=False), scheduler=scheduler)
+        monkeypatch.setattr(scanner.registry, "discover", lambda deadline=None: [(str(hung), "system", None)])
+        scanner.scan()
+        assert [inst.status for inst in scanner.installations] == ["unknown"]
+        assert times.expected(str(hung)) == pytest.approx(0.3, abs=0.2)  # the next scan allows it longer
@@ -0,0 +1,104 @@
+import os
+import shutil
+import sys
+
+import pytest
+from src.pyenvdoctor.scanner.cache import ProbeCache
+from src.pyenvdoctor.scanner.static_probe import (RootFS, StaticFS, StaticScanner, embedded_versions,
+                                                  find_interpreters, identify, parse_elf, parse_libpython,
+                                                  parse_patchlevel, parse_sysconfigdata, parse_sysconfigdata_name)
+
+MAJOR, MINOR = sys.version_info[:2]
+
+def is_elf(path):
+    with open(path, "rb") as f:
+        return f.read(4) == b"\x7fELF"
+
+@pytest.fixture
+def rootfs(tmp_path):
+    """A tiny image: /usr/bin/python3 -> /usr/bin/pythonX.Y (absolute link), stdlib, headers"""
+    executable = os.path.realpath(sys.executable)
+    if not is_elf(executable):
+        pytest.skip("needs an ELF interpreter")
+    bin_dir = tmp_path / "usr" / "bin"
+    bin_dir.mkdir(parents=True)
+    shutil.copy(executable, bin_dir / f"python{MAJOR}.{MINOR}")
+    os.symlink(f"/usr/bin/python{MAJOR}.{MINOR}", bin_dir / "python3")
+    stdlib = tmp_path / "usr" / "lib" / f"python{MAJOR}.{MINOR}"
+    (stdlib / "site-packages").mkdir(parents=True)
+    (stdlib / "os.py").write_text("")
+    (stdlib / "_sysconfigdata__linux_x86_64-linux-gnu.py").write_text(
+        "build_time_vars = {'SOABI': 'cpython-3xx-test', 'Py_DEBUG': 0, 'MULTIARCH': 'x86_64-linux-gnu'}\n")
+    include = tmp_path / "usr" / "include" / f"python{MAJOR}.{MINOR}"
+    include.mkdir(parents=True)
+    (include / "patchlevel.h").write_text(f'#define PY_VERSION              "{MAJOR}.{MINOR}.99"\n')
+    return tmp_path
+
+class TestParsers:
+    def test_parse_libpython(self):
+        assert parse_libpython("libpython3.13t.so.1.0") == (3, 13, "t")
+        assert parse_libpython("/usr/lib/libpython2.7.so") == (2, 7, "")
+        assert parse_libpython("libc.so.6") is None
+
+    def test_parse_patchlevel(self):
+        assert parse_patchlevel('#define PY_VERSION      "3.12.0rc1"') == "3.12.0rc1"
+
+    def test_parse_sysconfigdata(self):
+        assert parse_sysconfigdata_name("_sysconfigdata_t_linux_aarch64-linux-gnu.py") == {
+            "abiflags": "t", "platform": "linux", "multiarch": "aarch64-linux-gnu"}
+        assert parse_sysconfigdata("build_time_vars = {'SOABI': 'x'}")["SOABI"] == "x"
+        assert parse_sysconfigdata("build_time_vars = open('x')") == {}
+
+    def test_embedded_versions(self):
+        data = b"junk\x003.11.2\x00\x001.2.13\x00\x003.12.0rc1\x00"
+        assert embedded_versions(data, 3, 11) == ["3.11.2"]
+        assert "3.12.0rc1" in embedded_versions(data)
+
+    def test_parse_elf_rejects_scripts(self):
+        assert parse_elf(b"#!/bin/sh\nexec python3 \"$@\"\n") is None
+
+class TestStaticIdentification:
+    def test_identify_without_executing(self, rootfs, mocker):
+        run = mocker.patch("subprocess.run")
+        fs = RootFS(str(rootfs))
+        report = identify(fs, "/usr/bin/python3")
+        run.assert_not_called()
+        assert report["version"] == f"{MAJOR}.{MINOR}.99"
+        assert report["abi"] == "cpython-3xx-test"
+        assert report["prefix"] == "/usr"
+        assert report["site_packages"] == [f"/usr/lib/python{MAJOR}.{MINOR}/site-packages"]
+
+    def test_identify_reads_only_the_elf_headers(self, rootfs, mocker):
+        fs = RootFS(str(rootfs))
+        read = mocker.spy(fs, "read")
+        identify(fs, "/usr/bin/python3")
+        binary = f"/usr/bin/python{MAJOR}.{MINOR}"
+        reads = [c.kwargs.get("limit") for c in read.call_args_list if c.args[0] == binary]
+        assert reads and None not in reads
+        assert sum(reads) < os.path.getsize(rootfs / binary.lstrip("/"))
+
+    def test_find_interpreters_dedups_links(self, rootfs):
+        assert find_interpreters(RootFS(str(rootfs))) == ["/usr/bin/python3"]
+
+    def test_scanner_reports_host_paths(self, rootfs, tmp_path):
+        cache = ProbeCache(path=tmp_path / "probes.json", enabled=False)
+        scanner = StaticScanner(roots=[str(rootfs)], probe_cache=cache)
+        scanner.scan()
+        installation, = scanner.get_installations()
+        assert installation.path == str(rootfs / "usr" / "bin" / "python3")
+        assert installation.prefix == str(rootfs / "usr")
+        assert installation.is_valid
+        assert cache.probe_times(installation.path)  # its reads are not usage
+
+    def test_static_fs_is_abstract(self):
+        with pytest.raises(TypeError):
+            StaticFS()
+
+    def test_absolute_links_stay_inside_the_root(self, rootfs):
+        os.symlink("/usr/lib", rootfs / "usr" / "lib64")
+        os.symlink("/", rootfs / "usr" / "include" / "host")
+        fs = RootFS(str(rootfs))
+        assert fs.listdir("/usr/lib64") == [f"python{MAJOR}.{MINOR}"]
+        assert fs.isdir(f"/usr/lib64/python{MAJOR}.{MINOR}/site-packages")
+        assert sorted(fs.listdir("/usr/include/host")) == ["usr"]
+        assert fs.read("/usr/include/host/etc/passwd") is None
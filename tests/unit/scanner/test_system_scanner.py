@@ -1,6 +1,5 @@
 import pytest
-import subprocess
-from unittest.mock import patch, MagicMock
+from src.pyenvdoctor.scanner.cache import ProbeCache
 from src.pyenvdoctor.scanner.system_scanner import SystemScanner
 
 class TestSystemScanner:
@@ -10,32 +9,19 @@ class TestSystemScanner:
         
     def test_detect_system_python(self, scanner):
         """Test system Python detection"""
-        scanner._detect_system_python()
+        scanner.scan()
         assert len(scanner.installations) > 0
         
-    @patch('subprocess.run')
-    def test_verify_installation_success(self, mock_run, scanner):
-        """Test successful Python installation verification"""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="OK\n",
-            stderr=""
-        )
-        
-        result = scanner._verify_installation("/usr/bin/python3")
-        assert result is True
-        
-    @patch('subprocess.run')
-    def test_verify_installation_failure(self, mock_run, scanner):
-        """Test failed Python installation verification"""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="Error"
-        )
-        
-        result = scanner._verify_installation("/usr/bin/python3")
-        assert result is False
+    def test_failing_probe_gives_invalid_installation(self, tmp_path):
+        """An interpreter whose probe fails is reported, but as invalid"""
+        broken = tmp_path / "python3"
+        broken.write_text("#!/bin/sh\necho 'libpython3.12.so: cannot open shared object file' >&2\nexit 127\n")
+        broken.chmod(0o755)
+        scanner = SystemScanner(cache=ProbeCache(path=tmp_path / "probes.json", enabled=False))
+        installation, = scanner.probe([(str(broken), "pyenv", "3.12.1")])
+        assert not installation.is_valid
+        assert installation.status == "invalid"
+        assert installation.version == "3.12.1"
         
     def test_comprehensive_scan(self, scanner):
         """Test comprehensive scan functionality"""
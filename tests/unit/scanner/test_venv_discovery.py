@@ -0,0 +1,76 @@
+import os
+
+import pytest
+from src.pyenvdoctor.scanner.venv_discovery import VenvDiscovery, base_interpreter, read_pyvenv_cfg
+
+def make_venv(path, home, version="3.12.1"):
+    (path / "bin").mkdir(parents=True)
+    (path / "bin" / "python").write_text("")
+    (path / "lib" / "python3.12" / "site-packages").mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(
+        f"home = {home}\ninclude-system-site-packages = false\nversion = {version}\n")
+    return path
+
+@pytest.fixture
+def base_home(tmp_path):
+    home = tmp_path / "base" / "bin"
+    home.mkdir(parents=True)
+    (home / "python3.12").write_text("")
+    return home
+
+class TestVenvDiscovery:
+    def test_finds_nested_venvs_and_links_base(self, tmp_path, base_home, mocker):
+        run = mocker.patch("subprocess.run")
+        make_venv(tmp_path / "srv" / "app" / ".venv", base_home)
+        make_venv(tmp_path / "home" / "alice" / "proj" / "venv", base_home, version="3.12.2")
+
+        venvs = sorted(VenvDiscovery().discover([str(tmp_path / "srv"), str(tmp_path / "home")]),
+                       key=lambda venv: venv.path)
+
+        run.assert_not_called()
+        assert [venv.version for venv in venvs] == ["3.12.2", "3.12.1"]
+        assert all(venv.base_interpreter == str(base_home / "python3.12") for venv in venvs)
+        assert all(venv.is_valid and venv.provider == "virtualenv" for venv in venvs)
+        assert venvs[0].site_packages == [str(tmp_path / "home/alice/proj/venv/lib/python3.12/site-packages")]
+
+    def test_prunes_and_does_not_descend_into_venvs(self, tmp_path, base_home):
+        make_venv(tmp_path / "node_modules" / "venv", base_home)
+        make_venv(tmp_path / ".git" / "venv", base_home)
+        outer = make_venv(tmp_path / "outer", base_home)
+        make_venv(outer / "nested", base_home)
+
+        assert [venv.prefix for venv in VenvDiscovery().discover([str(tmp_path)])] == [str(outer)]
+
+    def test_depth_limit(self, tmp_path, base_home):
+        make_venv(tmp_path / "a" / "b" / "c" / "venv", base_home)
+        assert list(VenvDiscovery(max_depth=2).discover([str(tmp_path)])) == []
+        assert len(list(VenvDiscovery(max_depth=4).discover([str(tmp_path)]))) == 1
+
+    def test_symlink_loops_are_walked_once(self, tmp_path, base_home):
+        make_venv(tmp_path / "real" / "venv", base_home)
+        os.symlink(tmp_path / "real", tmp_path / "real" / "loop")
+        os.symlink(tmp_path / "real", tmp_path / "alias")
+
+        assert len(list(VenvDiscovery().discover([str(tmp_path)]))) == 1
+        assert len(list(VenvDiscovery(follow_symlinks=True).discover([str(tmp_path)]))) == 1
+
+    def test_broken_base_is_invalid(self, tmp_path):
+        venv = make_venv(tmp_path / "venv", tmp_path / "missing")
+        [found] = VenvDiscovery().discover([str(tmp_path)])
+        assert found.base_interpreter is None
+        assert not found.is_valid
+
+    def test_venv_with_removed_interpreter_is_found_invalid(self, tmp_path, base_home):
+        venv = make_venv(tmp_path / "venv", base_home)
+        (venv / "bin" / "python").unlink()
+        (venv / "bin" / "python").symlink_to(tmp_path / "uninstalled" / "python3.12")
+        (venv / "lib" / "python3.12" / "site-packages" / "pkg").mkdir()
+        (venv / "lib" / "python3.12" / "site-packages" / "pkg" / "pyvenv.cfg").write_text("")
+        [found] = VenvDiscovery().discover([str(tmp_path)])
+        assert found.path == str(venv / "bin" / "python")
+        assert not found.is_valid
+
+def test_base_interpreter_prefers_executable_key(tmp_path, base_home):
+    cfg = tmp_path / "pyvenv.cfg"
+    cfg.write_text(f"home = /nowhere\nexecutable = {base_home / 'python3.12'}\nversion_info = 3.12.1.final.0\n")
+    assert base_interpreter(read_pyvenv_cfg(str(cfg))) == str(base_home / "python3.12")
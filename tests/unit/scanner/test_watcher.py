@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.scanner.cache import ProbeCache
+from src.pyenvdoctor.scanner.pyenv_scanner import PyenvScanner
+from src.pyenvdoctor.scanner.registry import ProviderRegistry
+from src.pyenvdoctor.scanner.system_scanner import SystemScanner
+from src.pyenvdoctor.scanner.watcher import InstallationWatcher, PollingBackend
+
+def make_version(versions_dir, name):
+    bin_dir = versions_dir / name / "bin"
+    bin_dir.mkdir(parents=True)
+    (bin_dir / "python").write_text(name)
+    (versions_dir / name / "lib").mkdir()
+    return bin_dir / "python"
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    versions_dir = tmp_path / "pyenv" / "versions"
+    versions_dir.mkdir(parents=True)
+    monkeypatch.setenv("PYENV_ROOT", str(tmp_path / "pyenv"))
+
+    scanner = SystemScanner(cache=ProbeCache(path=tmp_path / "cache.json", enabled=False),
+                            registry=ProviderRegistry(providers=[PyenvScanner()]))
+    probed = []
+
+    def fake_probe(candidate, deadline=None, use_cache=True):
+        path = candidate[0]
+        probed.append(path)
+        with open(path) as f:
+            return PythonInstallation(path=path, version=f.read(), provider=candidate[1])
+
+    monkeypatch.setattr(scanner, "_probe_installation", fake_probe)
+    watcher = InstallationWatcher(scanner=scanner, venv_roots=[], backend=PollingBackend(interval=0))
+    watcher.versions_dir = versions_dir
+    watcher.probed = probed
+    return watcher
+
+class TestInstallationWatcher:
+    def test_initial_model_is_reported_as_added(self, watcher):
+        make_version(watcher.versions_dir, "3.9.18")
+        events = watcher.refresh()
+        assert [event["event"] for event in events] == ["added"]
+        assert events[0]["installation"]["version"] == "3.9.18"
+
+    def test_add_and_remove(self, watcher):
+        make_version(watcher.versions_dir, "3.9.18")
+        watcher.refresh()
+        python = make_version(watcher.versions_dir, "3.12.1")
+        changed = watcher.backend.wait(0)
+        events = watcher.refresh(changed)
+        assert [(event["event"], event["path"]) for event in events] == [("added", str(python))]
+
+        os.remove(python)
+        events = watcher.refresh(watcher.backend.wait(0))
+        assert [(event["event"], event["path"]) for event in events] == [("removed", str(python))]
+
+    def test_only_changed_installation_is_reprobed(self, watcher):
+        first = make_version(watcher.versions_dir, "3.9.18")
+        second = make_version(watcher.versions_dir, "3.10.13")
+        watcher.refresh()
+        watcher.probed.clear()
+
+        first.write_text("3.9.19")
+        stat = first.stat()
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        events = watcher.refresh(watcher.backend.wait(0))
+
+        assert watcher.probed == [str(first)]
+        assert [(event["event"], event["installation"]["version"]) for event in events] == [("changed", "3.9.19")]
+
+    def test_unrelated_change_is_ignored(self, watcher):
+        make_version(watcher.versions_dir, "3.9.18")
+        watcher.refresh()
+        watcher.probed.clear()
+        assert watcher.refresh({"/somewhere/else"}) == []
+        assert watcher.probed == []
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/mounts"), reason="inotify is Linux-only")
+def test_inotify_backend_reports_created_file(tmp_path):
+    from src.pyenvdoctor.scanner.watcher import InotifyBackend
+
+    backend = InotifyBackend()
+    try:
+        backend.watch([str(tmp_path)])
+        (tmp_path / "python3.13").write_text("")
+        assert str(tmp_path / "python3.13") in backend.wait(2)
+    finally:
+        backend.close()
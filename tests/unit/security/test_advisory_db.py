@@ -0,0 +1,65 @@
+import json
+import zipfile
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.advisory_db import AdvisoryDB, osv_intervals
+from src.pyenvdoctor.security.vulnerability_scanner import VulnerabilityScanner
+
+def advisory(advisory_id, package, events, modified="2026-01-01T00:00:00Z", versions=()):
+    return {"id": advisory_id, "modified": modified, "summary": f"{advisory_id} summary",
+            "affected": [{"package": {"ecosystem": "PyPI", "name": package},
+                          "ranges": [{"type": "ECOSYSTEM", "events": events}], "versions": list(versions)}]}
+
+@pytest.fixture
+def db(tmp_path):
+    dump = tmp_path / "all.zip"
+    with zipfile.ZipFile(dump, "w") as archive:
+        archive.writestr("PYSEC-1.json", json.dumps(advisory(
+            "PYSEC-1", "Requests", [{"introduced": "0"}, {"fixed": "2.31.0"}])))
+        archive.writestr("PYSEC-2.json", json.dumps(advisory(
+            "PYSEC-2", "django", [{"introduced": "4.0"}, {"fixed": "4.2.1"}, {"introduced": "5.0"},
+                                  {"last_affected": "5.0.3"}])))
+    db = AdvisoryDB(tmp_path / "advisories.db")
+    assert db.import_path(str(dump)) == 2
+    return db
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+class TestAdvisoryDB:
+    def test_osv_intervals(self):
+        events = [{"introduced": "0"}, {"fixed": "1.0"}, {"introduced": "2.0"}]
+        assert osv_intervals([{"type": "ECOSYSTEM", "events": events}]) == [(None, "1.0", None), ("2.0", None, None)]
+        assert osv_intervals([{"type": "GIT", "events": events}]) == []
+
+    def test_offline_scan(self, db):
+        scanner = VulnerabilityScanner(db=db, online=False)
+        install = PythonInstallation(path="/venv/bin/python", version="3.11.7",
+                                     packages={"requests": "2.30.0", "django": "4.2.1", "flask": "3.0.0"})
+        assert {pkg: [v["id"] for v in vulns] for pkg, vulns in scanner.scan_installation(install).items()} == {
+            "requests": ["PYSEC-1"]}
+        assert [v["id"] for v in scanner._check_package("Django", "5.0.3")] == ["PYSEC-2"]
+        assert scanner._check_package("django", "5.0.4") == []
+        found = db.lookup_many(["Django", "flask"])
+        assert [a["id"] for a in found["django"]] == ["PYSEC-2"] and found["flask"] == []
+        assert len(found["django"][0]["ranges"]) == 2
+
+    def test_incremental_update(self, db, mocker):
+        db._set_meta("last_sync", "2026-01-01T00:00:00Z")
+        changed = advisory("PYSEC-1", "requests", [{"introduced": "0"}, {"fixed": "2.32.0"}],
+                           modified="2026-03-01T00:00:00Z")
+        session = mocker.Mock()
+        session.get.side_effect = lambda url, timeout: FakeResponse(
+            "2026-03-01T00:00:00Z,PYSEC-1\n2026-01-01T00:00:00Z,PYSEC-2\n" if url.endswith(".csv")
+            else json.dumps(changed))
+        assert db.update(session=session) == 1
+        assert session.get.call_count == 2  # the CSV, then only the changed advisory
+        assert [r["fixed"] for r in db.lookup("requests")[0]["ranges"]] == ["2.32.0"]
@@ -0,0 +1,91 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.advisory_db import AdvisoryDB
+from src.pyenvdoctor.security.advisory_fetcher import AdvisoryFetcher
+from src.pyenvdoctor.security.vulnerability_scanner import VulnerabilityScanner
+
+class PyPIHandler(BaseHTTPRequestHandler):
+    """Stand-in for the PyPI JSON API that counts requests and honours ETags"""
+
+    requests = []
+    failures = {}
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.failures.get(self.path, 0) > 0:
+            self.failures[self.path] -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        package = self.path.split("/")[2]
+        etag = f'"{package}-1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        vulnerabilities = [{"id": f"PYSEC-{package}", "aliases": [], "fixed_in": ["99"]}] if package == "bad" else []
+        body = json.dumps({"info": {"name": package}, "vulnerabilities": vulnerabilities}).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    PyPIHandler.requests = []
+    PyPIHandler.failures = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PyPIHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def make_scanner(tmp_path, server):
+    fetcher = AdvisoryFetcher(cache_dir=tmp_path / "http", max_workers=4, timeout=5, backoff=0)
+    scanner = VulnerabilityScanner(db=AdvisoryDB(tmp_path / "empty.db"), fetcher=fetcher)
+    scanner.db_url = server + "/pypi/{package}/{version}/json"
+    return scanner
+
+class TestAdvisoryFetcher:
+    def test_shared_packages_fetched_once_then_revalidated(self, tmp_path, server):
+        packages = {f"pkg{i}": "1.0" for i in range(20)}
+        packages["bad"] = "0.1"
+        venvs = [PythonInstallation(path=f"/venv{i}/bin/python", version="3.11.7", packages=dict(packages))
+                 for i in range(10)]
+
+        results = make_scanner(tmp_path, server).scan_installations(venvs)
+        assert len(PyPIHandler.requests) == 21
+        assert all(found == {"bad": [{"id": "PYSEC-bad", "aliases": [], "summary": None, "fixed_in": ["99"]}]}
+                   for found in results.values())
+
+        # A fresh scanner revalidates from the disk cache instead of downloading again
+        PyPIHandler.requests = []
+        scanner = make_scanner(tmp_path, server)
+        assert scanner.scan_installations(venvs) == results
+        assert len(PyPIHandler.requests) == 21
+        assert all(etag for _, etag in PyPIHandler.requests)
+        assert scanner.fetcher.stats["not_modified"] == 21
+
+    def test_retries_transient_errors(self, tmp_path, server):
+        PyPIHandler.failures = {"/pypi/flaky/1.0/json": 2}
+        fetcher = AdvisoryFetcher(cache_dir=tmp_path, max_workers=1, timeout=5, retries=3, backoff=0)
+        assert fetcher.fetch(server + "/pypi/flaky/1.0/json")["info"] == {"name": "flaky"}
+        assert len(PyPIHandler.requests) == 3
+
+    def test_unreachable_falls_back_to_cache(self, tmp_path, server):
+        fetcher = AdvisoryFetcher(cache_dir=tmp_path, max_workers=1, timeout=5, retries=0)
+        url = server + "/pypi/requests/2.0/json"
+        document = fetcher.fetch(url)
+        PyPIHandler.failures = {"/pypi/requests/2.0/json": 1}
+        assert fetcher.fetch(url) == document
+        assert fetcher.fetch("http://127.0.0.1:1/pypi/x/1/json") is None
@@ -0,0 +1,28 @@
+import pytest
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.auditor import SecurityAuditor
+
+@pytest.fixture
+def installations():
+    return [
+        PythonInstallation(path="/usr/bin/python3", version="3.11.2", openssl_version="OpenSSL 3.0.17"),
+        PythonInstallation(path="/opt/py/bin/python", version="3.8.18", provider="pyenv"),
+    ]
+
+class TestSecurityAuditor:
+    def test_reuses_probed_installations(self, installations, mocker):
+        """Audit checks read probe results instead of spawning interpreters"""
+        run = mocker.patch("subprocess.run")
+        auditor = SecurityAuditor(installations=installations)
+
+        config = auditor._check_cis_compliance()["python_config"]
+        versions = auditor._get_installed_python_versions()
+
+        run.assert_not_called()
+        assert versions == ["3.11.2", "3.8.18"]
+        assert config["checks"] == [{
+            "name": "OpenSSL Version",
+            "interpreter": "/usr/bin/python3",
+            "result": "OpenSSL 3.0.17",
+            "status": "info"
+        }]
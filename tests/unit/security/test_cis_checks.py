@@ -0,0 +1,54 @@
+import threading
+import time
+from pathlib import Path
+
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.cis_checks import CheckContext, CheckRegistry, CISCheck
+
+class SlowCheck(CISCheck):
+    cost = "expensive"
+
+    def __init__(self, name, barrier):
+        self.name = name
+        self.barrier = barrier
+
+    def run(self, context):
+        # Only passes when both checks run at the same time
+        self.barrier.wait(timeout=5)
+        return {"status": "pass", "interpreters": len(context.installations)}
+
+class BrokenCheck(CISCheck):
+    name = "broken"
+
+    def run(self, context):
+        raise RuntimeError("boom")
+
+class TestCheckRegistry:
+    def test_runs_concurrently_and_shares_probe_results(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.05)
+            return [PythonInstallation(path="/usr/bin/python3", version="3.11.2")]
+
+        barrier = threading.Barrier(2)
+        registry = CheckRegistry([SlowCheck("a", barrier), SlowCheck("b", barrier), BrokenCheck()])
+        results = registry.run(CheckContext(Path("/nonexistent"), load, environ={}))
+
+        assert list(results) == ["a", "b", "broken"]
+        assert results["a"]["status"] == results["b"]["status"] == "pass"
+        assert results["a"]["interpreters"] == 1
+        assert loads == [1]
+        assert results["broken"] == {"status": "error", "error": "boom", "cost": "cheap",
+                                     "duration_ms": results["broken"]["duration_ms"]}
+        assert all(result["duration_ms"] >= 0 for result in results.values())
+
+    def test_builtin_and_plugin_checks(self, mocker):
+        mocker.patch("src.pyenvdoctor.security.cis_checks._entry_point_checks", return_value=[BrokenCheck])
+        registry = CheckRegistry()
+        assert [check.name for check in registry.checks] == [
+            "directory_permissions", "python_config", "environment_vars", "broken"]
+        results = registry.run(CheckContext(Path("/nonexistent"), list, environ={"PYTHONPATH": "/tmp"}))
+        assert results["environment_vars"]["status"] == "fail"
+        assert results["environment_vars"]["issues"][0]["variable"] == "PYTHONPATH"
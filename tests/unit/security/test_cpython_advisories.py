@@ -0,0 +1,74 @@
+import json
+import time
+
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.auditor import SecurityAuditor
+from src.pyenvdoctor.security.cpython_advisories import CPythonAdvisories, IntervalTree, version_key
+
+def cpython(path, version, **kwargs):
+    """A probed CPython installation"""
+    return PythonInstallation(path=path, version=version, implementation="CPython", probe={"version": version},
+                              **kwargs)
+
+def ids(found):
+    return sorted(advisory["id"] for advisory in found)
+
+class TestCPythonAdvisories:
+    def test_version_keys(self):
+        assert version_key("cpython", "3.12.0rc1") == version_key("cpython", "3.12.0")
+        assert version_key("openssl", "OpenSSL 1.1.1w  11 Sep 2023") < version_key("openssl", "1.1.1za")
+        assert version_key("openssl", "1.1.1") < version_key("openssl", "1.1.1a")
+        assert version_key("expat", "expat_2.5.0") == (2, 5, 0, 0)
+        assert version_key("openssl", "LibreSSL 3.3.6") is None
+
+    def test_interval_tree_matches_brute_force(self):
+        intervals = [((a,), (a + length,), inclusive, (a, length, inclusive))
+                     for a in range(0, 60, 3) for length in (1, 5, 20) for inclusive in (False, True)]
+        tree = IntervalTree(intervals)
+        for point in range(-2, 90):
+            expected = sorted(p for start, end, inclusive, p in intervals
+                              if start <= (point,) and ((point,) < end or (inclusive and (point,) == end)))
+            assert sorted(tree.stab((point,))) == expected
+
+    def test_bundled_table(self):
+        advisories = CPythonAdvisories.load()
+        old = cpython("/a", "3.11.3", openssl_version="OpenSSL 3.0.7 1 Nov 2022",
+                                 expat_version="expat_2.4.7", sqlite_version="3.31.1")
+        found = advisories.lookup(old)
+        assert {"CVE-2023-24329", "CVE-2023-40217", "CVE-2023-0286", "CVE-2022-40674",
+                "CVE-2020-11656"} <= set(ids(found))
+        assert "CVE-2022-3602" not in ids(found)  # fixed in OpenSSL 3.0.7
+        assert ids(advisories.lookup(cpython("/b", "3.12.2"))) == [
+            "CVE-2024-4032", "CVE-2024-6923", "CVE-2024-8088", "CVE-2025-4517"]
+        assert advisories.lookup(PythonInstallation(path="/c", version="3.10.1", implementation="PyPy")) == []
+
+        installs = [cpython(f"/py{i}", f"3.{8 + i % 5}.{i % 20}", expat_version="expat_2.5.0",
+                            sqlite_version="3.40.1") for i in range(1000)]
+        started = time.perf_counter()
+        assert len(advisories.lookup_many(installs)) == 1000
+        assert time.perf_counter() - started < 1.0  # well under a millisecond each
+
+    def test_newer_installed_table_wins(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        table = tmp_path / "table.json"
+        table.write_text(json.dumps({"updated": "2999-01-01", "advisories": [
+            {"id": "CVE-NEW", "component": "sqlite", "affected": [{"introduced": "3.40.0", "last_affected": "3.40.1"}]}]}))
+        CPythonAdvisories.install(str(table))
+        found = CPythonAdvisories.load().lookup(cpython("/a", "3.13.9", sqlite_version="3.40.1"))
+        assert ids(found) == ["CVE-NEW"]
+
+    def test_auditor_reports_each_interpreter(self):
+        auditor = SecurityAuditor(installations=[cpython("/old", "3.6.8"), cpython("/new", "3.13.9"),
+                                                 PythonInstallation(path="/conda", version="miniconda3-latest",
+                                                                    provider="pyenv", is_valid=False)])
+        results = auditor._check_vulnerabilities()
+        assert results["status"] == "fail"
+        assert [(v["interpreter"], v["status"]) for v in results["vulnerabilities"]] == [
+            ("/old", "vulnerable"), ("/new", "clean"), ("/conda", "unchecked")]
+
+    def test_only_probed_cpython_is_matched(self):
+        advisories = CPythonAdvisories.load()
+        assert advisories.lookup(PythonInstallation(path="/pypy", version="pypy3.9-7.3.11")) == []
+        assert advisories.lookup(PythonInstallation(path="/conda", version="anaconda3-2023.09", is_valid=False)) == []
+        pypy = PythonInstallation(path="/p", version="3.9.16", implementation="PyPy", probe={"version": "3.9.16"})
+        assert advisories.lookup(pypy) == []
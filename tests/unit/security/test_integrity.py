@@ -0,0 +1,64 @@
+import base64
+import hashlib
+import os
+
+from src.pyenvdoctor.scanner.inventory import read_site_packages
+from src.pyenvdoctor.security.integrity import IntegrityVerifier, record_digest
+
+def digest(data):
+    return base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+
+def install(site, name, files):
+    dist_info = site / f"{name}-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(f"Name: {name}\nVersion: 1.0\n")
+    rows = []
+    for relative, data in files.items():
+        (site / relative).parent.mkdir(parents=True, exist_ok=True)
+        (site / relative).write_bytes(data)
+        rows.append(f"{relative},sha256={digest(data)},{len(data)}")
+    rows += [f"{name}/__pycache__/x.pyc,,", f"{name}-1.0.dist-info/RECORD,,"]
+    (dist_info / "RECORD").write_text("\n".join(rows) + "\n")
+
+class TestIntegrityVerifier:
+    def test_record_digest_large_file(self, tmp_path):
+        data = bytes(range(256)) * 20000
+        (tmp_path / "big").write_bytes(data)
+        assert record_digest(str(tmp_path / "big"), "sha256", chunk_size=4096) == digest(data)
+
+    def test_finds_tampered_files_and_caches_good_ones(self, tmp_path):
+        site = tmp_path / "site-packages"
+        install(site, "good", {"good/__init__.py": b"x = 1\n", "good/data.bin": b"\0" * 100000})
+        install(site, "bad", {"bad/__init__.py": b"y = 2\n", "bad/gone.py": b"", "bad/sized.py": b"abc"})
+        (site / "bad" / "__init__.py").write_bytes(b"y = 3\n")
+        (site / "bad" / "gone.py").unlink()
+        (site / "bad" / "sized.py").write_bytes(b"abcd")
+        cache = tmp_path / "integrity.json"
+
+        verifier = IntegrityVerifier(cache_path=cache, max_workers=2)
+        findings = list(verifier.verify(read_site_packages(str(site))))
+        assert sorted((f["package"], f["path"].rsplit("/", 1)[1], f["kind"]) for f in findings) == [
+            ("bad", "__init__.py", "modified"), ("bad", "gone.py", "missing"), ("bad", "sized.py", "size_mismatch")]
+        assert verifier.stats["hashed"] == 3 and verifier.stats["files"] == 5
+
+        # Known-good files are not hashed again; the tampered one still is
+        verifier = IntegrityVerifier(cache_path=cache, max_workers=2)
+        assert len(list(verifier.verify(read_site_packages(str(site))))) == 3
+        assert verifier.stats["cached"] == 2 and verifier.stats["hashed"] == 1
+
+        (site / "good" / "__init__.py").write_bytes(b"x = 2\n")
+        verifier = IntegrityVerifier(cache_path=cache, max_workers=2)
+        assert {f["package"] for f in verifier.verify(read_site_packages(str(site)))} == {"good", "bad"}
+
+    def test_same_size_rewrite_with_restored_mtime_is_hashed(self, tmp_path):
+        site = tmp_path / "site-packages"
+        install(site, "good", {"good/__init__.py": b"x = 1\n"})
+        cache = tmp_path / "integrity.json"
+        assert list(IntegrityVerifier(cache_path=cache).verify(read_site_packages(str(site)))) == []
+
+        target = site / "good" / "__init__.py"
+        st = os.stat(target)
+        target.write_bytes(b"x = 6\n")
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        findings = list(IntegrityVerifier(cache_path=cache).verify(read_site_packages(str(site))))
+        assert [f["kind"] for f in findings] == ["modified"]
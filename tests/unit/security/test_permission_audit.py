@@ -0,0 +1,65 @@
+import os
+import stat
+
+from src.pyenvdoctor.core.models import PythonInstallation
+from src.pyenvdoctor.security.permission_audit import PermissionAuditor, audit_roots, file_findings
+
+def kinds(findings, root):
+    return sorted((os.path.relpath(f["path"], root), f["kind"]) for f in findings)
+
+class TestPermissionAuditor:
+    def test_finds_writable_files_and_uses_directory_cache(self, tmp_path, mocker):
+        tree = tmp_path / "versions" / "3.12.1" / "lib"
+        tree.mkdir(parents=True)
+        (tree / "ok.py").write_text("")
+        (tree / "open.py").write_text("")
+        (tree / "open.py").chmod(0o666)
+        (tree / "group").mkdir()
+        (tree / "group").chmod(0o775)
+        (tree / "tmp").mkdir(mode=0o1777)
+        (tree / "tmp").chmod(0o1777)  # sticky world-writable dirs are fine
+        root = str(tmp_path / "versions")
+        auditor = PermissionAuditor(cache_path=tmp_path / "cache.json", ttl=3600)
+
+        expected = [("3.12.1/lib/group", "group_writable"), ("3.12.1/lib/open.py", "world_writable")]
+        assert kinds(auditor.audit([root]), root) == expected
+
+        # Unchanged directories are answered from the cache without scandir
+        scandir = mocker.spy(os, "scandir")
+        assert kinds(PermissionAuditor(cache_path=tmp_path / "cache.json", ttl=3600).audit([root]), root) == expected
+        assert scandir.call_count == 0
+
+        # chmod leaves the directory alone, but entries are always lstat'ed again
+        (tree / "ok.py").chmod(0o646)
+        found = kinds(PermissionAuditor(cache_path=tmp_path / "cache.json", ttl=3600).audit([root]), root)
+        assert ("3.12.1/lib/ok.py", "world_writable") in found
+        assert scandir.call_count == 0
+        (tree / "ok.py").chmod(0o644)
+
+        (tree / "new.py").write_text("")
+        (tree / "new.py").chmod(0o646)
+        found = kinds(PermissionAuditor(cache_path=tmp_path / "cache.json", ttl=3600).audit([root]), root)
+        assert ("3.12.1/lib/new.py", "world_writable") in found
+        assert scandir.call_count == 1  # only the changed directory
+
+    def test_file_findings(self):
+        st = os.stat_result((stat.S_IFREG | 0o664, 1, 1, 1, 1001, 1001, 0, 0, 0, 0))
+        assert [(f["kind"], f["severity"], f["mode"]) for f in file_findings("/x", st, owner=1000)] == [
+            ("group_writable", "low", "0o664"), ("foreign_owner", "medium", "0o664")]
+        assert file_findings("/x", st, owner=1001)[0]["kind"] == "group_writable"
+        root_owned = os.stat_result((stat.S_IFREG | 0o644, 1, 1, 1, 0, 0, 0, 0, 0, 0))
+        assert file_findings("/x", root_owned, owner=1000) == []
+        link = os.stat_result((stat.S_IFLNK | 0o777, 1, 1, 1, 1001, 1001, 0, 0, 0, 0))
+        assert file_findings("/x", link, owner=1000) == []
+
+    def test_audit_roots_skip_nested(self, tmp_path):
+        venv = tmp_path / "versions" / "3.12.1" / "envs" / "app"
+        site = venv / "lib" / "python3.12" / "site-packages"
+        site.mkdir(parents=True)
+        other = tmp_path / "venv"
+        other.mkdir()
+        installs = [PythonInstallation(path=str(venv / "bin" / "python"), version="3.12.1", prefix=str(venv),
+                                       base_prefix=str(tmp_path / "versions" / "3.12.1"), site_packages=[str(site)]),
+                    PythonInstallation(path=str(other / "bin" / "python"), version="3.12.1", prefix=str(other),
+                                       base_prefix="/usr")]
+        assert audit_roots(tmp_path, installs) == [str(tmp_path / "venv"), str(tmp_path / "versions")]
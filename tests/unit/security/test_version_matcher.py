@@ -0,0 +1,45 @@
+from src.pyenvdoctor.security.version_matcher import VersionMatcher
+
+ADVISORIES = {
+    "django": [
+        {"id": "A", "summary": "a", "aliases": [], "versions": [],
+         "ranges": [{"introduced": "4.0", "fixed": "4.2.1", "last_affected": None},
+                    {"introduced": "5.0", "fixed": None, "last_affected": "5.0.3"}]},
+        {"id": "B", "summary": "b", "aliases": ["CVE-1"], "versions": ["3.2.0"],
+         "ranges": [{"introduced": None, "fixed": "2.0", "last_affected": None}]},
+    ],
+    "requests": [{"id": "C", "summary": "c", "aliases": [], "versions": [],
+                  "ranges": [{"introduced": "2.1", "fixed": None, "last_affected": None}]}],
+}
+
+class TestVersionMatcher:
+    def test_intervals_and_explicit_versions(self):
+        matcher = VersionMatcher()
+        compiled = matcher.compile("django", ADVISORIES["django"])
+        ids = lambda version: [compiled.advisories[i]["id"] for i in compiled.affected(matcher.version(version))]
+        assert ids("1.11") == ["B"]
+        assert ids("2.0") == []
+        assert ids("3.2") == ["B"]  # explicit versions compare as versions
+        assert ids("4.2.0") == ["A"]
+        assert ids("4.2.1") == []
+        assert ids("5.0.3") == ["A"]
+        assert ids("5.0.4") == []
+        assert ids("not-a-version") == []
+        assert compiled.advisories[0]["fixed_in"] == ["4.2.1"]
+
+    def test_batched_match_loads_each_package_once(self):
+        matcher = VersionMatcher()
+        loads = []
+
+        def load(packages):
+            loads.append(packages)
+            return {package: ADVISORIES.get(package, []) for package in packages}
+
+        pairs = [("Django", "4.1"), ("requests", "2.0"), ("requests", "2.31.0"), ("flask", "3.0")] * 50
+        results = matcher.match(pairs, load)
+        assert loads == [["django", "flask", "requests"]]
+        assert {key: [a["id"] for a in found] for key, found in results.items()} == {
+            ("django", "4.1"): ["A"], ("requests", "2.0"): [], ("requests", "2.31.0"): ["C"], ("flask", "3.0"): []}
+        matcher.match([("django", "5.0")], load)
+        assert len(loads) == 1
+        assert matcher.version("5.0") is matcher.version("5.0")
@@ -0,0 +1,25 @@
+import pytest
+from src.pyenvdoctor.utils.fswalk import ParallelWalker
+
+def test_walk_visits_every_directory_once(tmp_path):
+    for i in range(20):
+        (tmp_path / f"d{i}" / "sub").mkdir(parents=True)
+    walker = ParallelWalker(max_workers=4)
+
+    def visit(path, entries, depth):
+        return path, walker.subdirectories(entries)
+
+    visited = list(walker.walk([str(tmp_path), str(tmp_path / "d0")], visit))
+    assert len(visited) == 1 + 20 * 2 + 2
+
+def test_walk_propagates_visitor_errors(tmp_path):
+    (tmp_path / "sub").mkdir()
+
+    def visit(path, entries, depth):
+        raise ValueError(path)
+
+    with pytest.raises(ValueError):
+        list(ParallelWalker().walk([str(tmp_path)], visit))
+
+def test_walk_of_missing_root_is_empty(tmp_path):
+    assert list(ParallelWalker().walk([str(tmp_path / "missing")], lambda *a: (None, []))) == []